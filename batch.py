@@ -0,0 +1,169 @@
+import sys
+import json
+import time
+import random
+import argparse
+import multiprocessing
+from itertools import islice
+
+import rounds
+import handler
+import offline
+import retry_cache
+
+"""
+Bulk entry point for replay testing, synthetic load and offline QA.
+
+    for response in handle_many(events, workers=4, seed=1):
+        ...
+
+Events are handled in chunks, so the per-call overhead (process pool IPC, JSON parsing of raw lines, imports)
+is paid once per chunk instead of once per event. If "seed" is given, the random generator is reseeded from
+(seed, event number) before every event and the clock reads the time from the event number, so the output does not
+depend on the number of workers, on the order of handling or on the time of the run and can be diffed between runs.
+"""
+
+CHUNK_SIZE = 256
+# Wall-clock time of the first event of a seeded run and the seconds between the events
+SEEDED_EPOCH = 1500000000.0
+EVENT_INTERVAL = 3.0
+
+
+class BatchStats:
+    """ Aggregate throughput of a bulk run """
+    def __init__(self):
+        self.events = 0
+        self.errors = 0
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.events / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        return '%d events, %d errors in %.2f s, %.0f events/s' % (self.events, self.errors, self.elapsed, self.rate)
+
+
+def _seeded_clock(index):
+    # The events of a seeded run come every EVENT_INTERVAL seconds, the timings do not depend on the replay
+    now = SEEDED_EPOCH + index * EVENT_INTERVAL
+    return lambda: now
+
+
+def _handle_one(index, event, seed):
+    settings = []
+    if seed is not None:
+        random.seed((seed << 32) + index)
+        settings.append((rounds, 'clock', _seeded_clock(index)))
+    try:
+        # Raw JSON lines are parsed here, in the worker
+        if isinstance(event, (str, bytes)):
+            event = json.loads(event)
+        with offline.patched(settings):
+            return handler.handler(event, None)
+    except Exception as e:
+        return {'error': type(e).__name__ + ': ' + str(e)}
+
+
+def _settings(seed):
+    # A replayed event repeating a (session_id, message_id) is not a retry, it is handled again
+    settings = [(retry_cache.retries, 'enabled', False)]
+    if seed is not None:
+        # Timing-driven degradation and the limits would make the seeded output depend on the machine and on the speed
+        # of the replay
+        settings += offline.full_speed()
+    return settings
+
+
+def _init_worker(seed):
+    offline.install(_settings(seed))
+
+
+def _handle_chunk(args):
+    start, events, seed = args
+    return start, [_handle_one(start + i, event, seed) for i, event in enumerate(events)]
+
+
+def _handle_chunk_here(args):
+    # The settings of the caller are restored after every chunk, the caller may handle its own events between them
+    with offline.patched(_settings(args[2])):
+        return _handle_chunk(args)
+
+
+def _chunks(events, chunk_size, seed):
+    iterator = iter(events)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk, seed
+        start += len(chunk)
+
+
+def handle_many(events, workers=1, ordered=True, chunk_size=CHUNK_SIZE, seed=None, stats=None):
+    """
+    :param events: iterable of request payloads, either dicts or raw JSON strings. It is consumed lazily.
+    :param workers: number of processes, 1 handles the events in the current process.
+    :param ordered: if True responses are yielded in the order of the events, otherwise as soon as they are ready.
+    :param chunk_size: number of events sent to a worker at once.
+    :param seed: seed of the random generator or None to keep the replies random.
+    :param stats: BatchStats to be filled.
+    :return: generator of responses if "ordered", generator of (event number, response) otherwise.
+        A failed event gives {'error': description}.
+    """
+    if stats is None:
+        stats = BatchStats()
+    stats.started = time.perf_counter()
+    chunks = _chunks(events, chunk_size, seed)
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(seed,))
+        results = pool.imap(_handle_chunk, chunks) if ordered else pool.imap_unordered(_handle_chunk, chunks)
+    else:
+        results = map(_handle_chunk_here, chunks)
+    try:
+        for start, responses in results:
+            for i, response in enumerate(responses):
+                stats.events += 1
+                if 'error' in response:
+                    stats.errors += 1
+                yield response if ordered else (start + i, response)
+    finally:
+        stats.finished = time.perf_counter()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Handle recorded events, one JSON per line.')
+    parser.add_argument('events', nargs='?', default='-', help='file with events, "-" for stdin')
+    parser.add_argument('-w', '--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('-s', '--seed', type=int, default=None)
+    parser.add_argument('-c', '--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('-u', '--unordered', action='store_true', help='write responses as soon as they are ready')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.events == '-' else open(args.events, encoding='utf-8')
+    stats = BatchStats()
+    lines = (line for line in source if line.strip())
+    with source:
+        for result in handle_many(lines, args.workers, not args.unordered, args.chunk_size, args.seed, stats):
+            if args.unordered:
+                index, response = result
+                result = {'index': index, 'response': response}
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+    sys.stderr.write(str(stats) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import os
+import re
+import sys
+import json
+import uuid
+import hashlib
+import argparse
+import textwrap
+import urllib.request
+
+"""
+Images of the cards shown on the screen surfaces.
+
+Formulas and facts are rendered into images offline, uploaded to the skill in Yandex Dialogs and recorded in a
+content-addressed cache: the image of a source is stored as "<sha256>.png" and "index.json" maps the digest to the
+source and the id of the uploaded image. The index is read once per process, so a card costs a dict lookup:
+    images.get('√144 = ?')   # image id or None if the image is not uploaded yet
+The images are rendered with matplotlib, it is needed only by the offline tool:
+    python cards.py --token <OAuth token>
+A source without an image gets no card, the screen shows the text of the response as before.
+"""
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cards')
+SKILL_ID = '75986b16-ef4a-48ae-95ce-e95c020ae7a3'
+UPLOAD_URL = 'https://dialogs.yandex.net/api/v1/skills/{}/images'
+
+# Kinds of sources: a formula in the notation of the question texts and a plain text
+FORMULA = 'formula'
+TEXT = 'text'
+
+# Bumped when the images change, the sources are rendered and uploaded again
+RENDERER_VERSION = 1
+# Size recommended for the BigImage card
+IMAGE_SIZE = (776, 344)
+DPI = 100
+FORMULA_FONT_SIZE = 48
+TEXT_FONT_SIZE = 18
+TEXT_WIDTH = 60
+
+
+def digest(source, kind=FORMULA):
+    """
+    :return: content address of the image of the source.
+    """
+    return hashlib.sha256(('%d:%s:%s' % (RENDERER_VERSION, kind, source)).encode('utf-8')).hexdigest()
+
+
+class ImageCache:
+    """ Ids of the uploaded images by their sources """
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        # Digest to [kind, source, image id], as stored in the index
+        self._entries = {}
+        self._ids = {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        for key, (kind, source, image_id) in self._entries.items():
+            if key == digest(source, kind):
+                self._ids[source] = image_id
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.json')
+
+    def image_path(self, source, kind=FORMULA):
+        return os.path.join(self.directory, digest(source, kind) + '.png')
+
+    def get(self, source):
+        """
+        :return: id of the uploaded image of the source or None.
+        """
+        return self._ids.get(source)
+
+    def __contains__(self, source):
+        return source in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, source, image_id, kind=FORMULA):
+        self._entries[digest(source, kind)] = [kind, source, image_id]
+        self._ids[source] = image_id
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.index_path + '.tmp'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(path, self.index_path)
+
+
+_ROOT = re.compile(r'√(\d+)')
+_FRACTION = re.compile(r'(\\sqrt\{\d+\}|\d+)/(\\sqrt\{\d+\}|\d+)')
+_POWER = re.compile(r'(\d+)\^(\d+)')
+_FUNCTION = re.compile(r'\b(sin|cos|ctg|tg)')
+
+
+def mathtext(formula):
+    """
+    :param formula: formula in the notation of the question texts, e.g. "cos?° = √3/2".
+    :return: the formula in the TeX notation of matplotlib.
+    """
+    formula = formula.replace(' / ', r' \div ').replace(' * ', r' \times ')
+    formula = _ROOT.sub(r'\\sqrt{\1}', formula)
+    formula = _FRACTION.sub(r'\\frac{\1}{\2}', formula)
+    formula = _POWER.sub(r'{\1}^{\2}', formula)
+    formula = _FUNCTION.sub(r'\\mathrm{\1}\\,', formula)
+    return '$' + formula.replace('°', r'^{\circ}') + '$'
+
+
+def render(source, path, kind=FORMULA):
+    """ Renders the image of the source into a PNG file """
+    # Imported here, the skill itself does not depend on matplotlib
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(IMAGE_SIZE[0] / DPI, IMAGE_SIZE[1] / DPI), dpi=DPI)
+    if kind == FORMULA:
+        figure.text(0.5, 0.5, mathtext(source), ha='center', va='center', fontsize=FORMULA_FONT_SIZE)
+    else:
+        # Dollar signs would start a formula
+        text = textwrap.fill(source.replace('$', r'\$'), TEXT_WIDTH)
+        figure.text(0.5, 0.5, text, ha='center', va='center', fontsize=TEXT_FONT_SIZE, wrap=True)
+    figure.savefig(path, format='png', facecolor='white')
+
+
+def upload(path, token, skill_id=SKILL_ID, timeout=30):
+    """
+    Uploads an image to the skill.
+    :param token: OAuth token of the owner of the skill.
+    :return: id of the uploaded image.
+    """
+    boundary = uuid.uuid4().hex
+    with open(path, 'rb') as f:
+        data = f.read()
+    body = b''.join([
+        b'--', boundary.encode('ascii'), b'\r\n',
+        b'Content-Disposition: form-data; name="file"; filename="', os.path.basename(path).encode('ascii'), b'"\r\n',
+        b'Content-Type: image/png\r\n\r\n', data, b'\r\n',
+        b'--', boundary.encode('ascii'), b'--\r\n',
+    ])
+    request = urllib.request.Request(UPLOAD_URL.format(skill_id), data=body, method='POST', headers={
+        'Authorization': 'OAuth ' + token,
+        'Content-Type': 'multipart/form-data; boundary=' + boundary,
+    })
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)['image']['id']
+
+
+def build(cache, sources, token=None, skill_id=SKILL_ID, out=sys.stdout):
+    """
+    Renders the images missing from the cache and uploads them if a token is given.
+    :param sources: iterable of (source, kind).
+    :return: (number of rendered images, number of uploaded images).
+    """
+    os.makedirs(cache.directory, exist_ok=True)
+    rendered = uploaded = 0
+    try:
+        for source, kind in sources:
+            if source in cache:
+                continue
+            path = cache.image_path(source, kind)
+            if not os.path.exists(path):
+                render(source, path, kind)
+                rendered += 1
+            if token is not None:
+                cache.add(source, upload(path, token, skill_id), kind)
+                uploaded += 1
+                print('Uploaded %s' % source, file=out)
+    finally:
+        # The uploaded images are kept even if the upload fails halfway
+        if uploaded:
+            cache.save()
+    return rendered, uploaded
+
+
+images = ImageCache()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render and upload the images of the cards.')
+    parser.add_argument('-d', '--directory', default=DEFAULT_DIRECTORY)
+    parser.add_argument('--skill-id', default=SKILL_ID)
+    parser.add_argument('--token', default=os.environ.get('DIALOGS_OAUTH_TOKEN'),
+                        help='OAuth token, the images are only rendered without it')
+    args = parser.parse_args()
+    # The sources are defined next to the questions
+    from scenarios import card_sources
+    rendered, uploaded = build(ImageCache(args.directory), card_sources(), args.token, args.skill_id)
+    print('Rendered %d images, uploaded %d' % (rendered, uploaded))
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+from rounds import DEFAULT_MODE, SPEED_RUN
+
+"""
+Checkpoints of the unfinished quiz rounds kept by the platform between the sessions.
+
+Every question of a round is checkpointed into "state.user" of a logged-in user or into "state.application" of the
+device, so a round the user left by closing the skill is offered to be continued on the next visit. A checkpoint is
+one short string of the numbers in base 36 separated by dots, the version first:
+    encode(Checkpoint(task=2, seed=123456789, question_number=4, points=3, score=310, mode=0, saved_at=29000000,
+                      asked=()))         # '1.2.21i3v9.4.3.8m.0.h9kjk.'
+    decode('1.2.21i3v9.4.3.8m.0.h9kjk.')  # the same Checkpoint
+The questions of a checkpointed round are generated with the seed "seed * 1000 + question number", as the questions
+of a room, so the question the user left at is generated again without the ones before it. A checkpoint is about 30
+bytes, far below the limits of the platform on the state. It is decoded only when the skill is opened, the other turns
+outside the rounds only look its key up and write nothing.
+"""
+
+VERSION = 1
+# Key of the checkpoint in the persistent state
+KEY = 'resume'
+# Modes of the rounds by their index in the checkpoint
+MODES = (DEFAULT_MODE, SPEED_RUN)
+# Checkpoints older than it are not offered, in minutes
+MAX_AGE = 24 * 60
+
+# task: index of the task type, mode: index in MODES, saved_at: minutes since the epoch,
+# asked: the trigonometry variants asked before the current question
+Checkpoint = namedtuple('Checkpoint', 'task seed question_number points score mode saved_at asked')
+
+_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+_FIELDS = len(Checkpoint._fields)
+
+
+def _base36(number):
+    if number < 0:
+        raise ValueError('Only non-negative numbers are checkpointed, got %d' % number)
+    digits = ''
+    while True:
+        number, digit = divmod(number, 36)
+        digits = _DIGITS[digit] + digits
+        if number == 0:
+            return digits
+
+
+def encode(checkpoint):
+    """
+    :return: the checkpoint as a string, the asked variants are separated by "-".
+    """
+    fields = [_base36(VERSION)] + [_base36(value) for value in checkpoint[:-1]]
+    fields.append('-'.join(_base36(variant) for variant in checkpoint.asked))
+    return '.'.join(fields)
+
+
+def decode(value):
+    """
+    :param value: the checkpoint from the persistent state.
+    :return: Checkpoint or None if the value is not a checkpoint of this version.
+    """
+    if type(value) is not str:
+        return None
+    fields = value.split('.')
+    if len(fields) != _FIELDS + 1:
+        return None
+    try:
+        numbers = [int(field, 36) for field in fields[:-1]]
+        asked = tuple(int(variant, 36) for variant in fields[-1].split('-')) if fields[-1] else ()
+    except ValueError:
+        return None
+    if numbers[0] != VERSION or min(numbers) < 0 or numbers[6] >= len(MODES):
+        return None
+    return Checkpoint(*numbers[1:], asked)
+
+
+def load(value, now):
+    """
+    :param now: the current time in milliseconds.
+    :return: Checkpoint of the value if it is recent enough to be continued or None.
+    """
+    checkpoint = decode(value)
+    if checkpoint is None or now // 60000 - checkpoint.saved_at > MAX_AGE:
+        return None
+    return checkpoint
@@ -0,0 +1,267 @@
+import time
+import random
+import sqlite3
+from collections import OrderedDict
+
+"""
+Classroom mode: a teacher creates a room, students join it by its code and all of them get the same seeded
+question stream of the task chosen by the teacher. Scores are aggregated in a per-room leaderboard.
+
+Everything is kept in the process memory (rooms are found by code, the leaderboard is an indexable skip list with
+O(log n) updates and rank queries), SQLite persistence is optional:
+    classroom = Classroom(RoomStore('rooms.sqlite3'))
+"""
+
+ROOM_TTL = 3 * 60 * 60
+MAX_LEVELS = 16
+
+# Room codes and skip list levels must not depend on the seeded generator of the scenarios
+_random = random.Random()
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+# Sorts after every (-score, user) key
+_NIL = _Node((float('inf'),), 0)
+
+
+class Leaderboard:
+    """ Scores of the room sorted by decreasing score, an indexable skip list """
+    def __init__(self):
+        self._head = _Node(None, MAX_LEVELS)
+        self._head.next = [_NIL] * MAX_LEVELS
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, user):
+        return user in self._scores
+
+    def score(self, user):
+        return self._scores.get(user)
+
+    def update(self, user, score):
+        """ Sets the score of the user, O(log n) """
+        old = self._scores.get(user)
+        if old == score:
+            return
+        if old is not None:
+            self._remove((-old, user))
+        self._insert((-score, user))
+        self._scores[user] = score
+
+    def rank(self, user):
+        """
+        :return: 1-based place of the user or None if the user is not in the room, O(log n).
+        """
+        score = self._scores.get(user)
+        if score is None:
+            return None
+        key = (-score, user)
+        node = self._head
+        position = 0
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position + 1
+
+    def top(self, count):
+        """
+        :return: list of (user, score) of the best "count" users.
+        """
+        result = []
+        node = self._head.next[0]
+        while node is not _NIL and len(result) < count:
+            result.append((node.key[1], -node.key[0]))
+            node = node.next[0]
+        return result
+
+    def _insert(self, key):
+        chain = [None] * MAX_LEVELS
+        steps_at_level = [0] * MAX_LEVELS
+        node = self._head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        levels = 1
+        while levels < MAX_LEVELS and _random.random() < 0.5:
+            levels += 1
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+
+    def _remove(self, key):
+        chain = [None] * MAX_LEVELS
+        node = self._head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+        removed = chain[0].next[0]
+        for level in range(len(removed.next)):
+            previous = chain[level]
+            previous.width[level] += removed.width[level] - 1
+            previous.next[level] = removed.next[level]
+        for level in range(len(removed.next), MAX_LEVELS):
+            chain[level].width[level] -= 1
+
+
+def seeded_question(generate, seed, number):
+    """
+    Generates the question number "number" of a round with the seed, it is the same every time.
+    :param generate: question generator of the task.
+    """
+    state = random.getstate()
+    random.seed(seed * 1000 + number)
+    try:
+        return generate()
+    finally:
+        random.setstate(state)
+
+
+class Room:
+    """ Room of a class """
+    def __init__(self, code, teacher, seed, task=None, created=None):
+        self.code = code
+        self.teacher = teacher
+        self.seed = seed
+        # Id of the quiz scenario chosen by the teacher
+        self.task = task
+        self.created = time.time() if created is None else created
+        self.leaderboard = Leaderboard()
+
+    def question(self, generate, number):
+        """
+        Generates the question number "number" of the room, it is the same for every participant.
+        :param generate: question generator of the task.
+        """
+        return seeded_question(generate, self.seed, number)
+
+
+class RoomStore:
+    """ SQLite persistence of rooms and scores """
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS rooms (code INTEGER PRIMARY KEY, teacher TEXT, '
+                                 'seed INTEGER, task TEXT, created REAL)')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS scores (code INTEGER, user TEXT, score INTEGER, '
+                                 'PRIMARY KEY (code, user))')
+        self._connection.commit()
+
+    def save_room(self, room):
+        self._connection.execute('INSERT OR REPLACE INTO rooms VALUES (?, ?, ?, ?, ?)',
+                                 (room.code, room.teacher, room.seed, room.task, room.created))
+        self._connection.commit()
+
+    def save_score(self, room, user, score):
+        self._connection.execute('INSERT OR REPLACE INTO scores VALUES (?, ?, ?)', (room.code, user, score))
+        self._connection.commit()
+
+    def delete_room(self, room):
+        self._connection.execute('DELETE FROM rooms WHERE code = ?', (room.code,))
+        self._connection.execute('DELETE FROM scores WHERE code = ?', (room.code,))
+        self._connection.commit()
+
+    def load(self):
+        """
+        :return: list of the stored rooms in the order of creation.
+        """
+        rooms = {}
+        for code, teacher, seed, task, created in self._connection.execute('SELECT * FROM rooms ORDER BY created'):
+            rooms[code] = Room(code, teacher, seed, task, created)
+        for code, user, score in self._connection.execute('SELECT * FROM scores'):
+            if code in rooms:
+                rooms[code].leaderboard.update(user, score)
+        return list(rooms.values())
+
+
+class Classroom:
+    """ Registry of the rooms of the process """
+    def __init__(self, store=None, ttl=ROOM_TTL):
+        self._store = store
+        self._ttl = ttl
+        # Rooms in the order of creation, so expired rooms are found without scanning all of them
+        self._rooms = OrderedDict()
+        if store is not None:
+            for room in store.load():
+                self._rooms[room.code] = room
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def get(self, code):
+        """
+        :return: the room with the code or None if there is none or it expired.
+        """
+        self._expire()
+        return self._rooms.get(code)
+
+    def create(self, teacher):
+        """
+        :param teacher: user id of the teacher.
+        :return: new room with a unique 4-digit code.
+        """
+        self._expire()
+        code = _random.randint(1000, 9999)
+        while code in self._rooms:
+            code = _random.randint(1000, 9999)
+        room = Room(code, teacher, _random.getrandbits(31))
+        self._rooms[code] = room
+        if self._store is not None:
+            self._store.save_room(room)
+        return room
+
+    def set_task(self, room, task):
+        room.task = task
+        if self._store is not None:
+            self._store.save_room(room)
+
+    def record(self, room, user, score):
+        room.leaderboard.update(user, score)
+        if self._store is not None:
+            self._store.save_score(room, user, score)
+
+    def _expire(self):
+        deadline = time.time() - self._ttl
+        while self._rooms:
+            room = next(iter(self._rooms.values()))
+            if room.created > deadline:
+                break
+            del self._rooms[room.code]
+            if self._store is not None:
+                self._store.delete_room(room)
+
+
+def leaderboard_text(room, locale, count=5):
+    """
+    :param locale: locales.Locale the text is in.
+    :return: the best "count" participants of the room as text.
+    """
+    top = room.leaderboard.top(count)
+    if not top:
+        return locale.text(locale['leaderboard.empty'], room.code)
+    lines = [locale.text(locale['leaderboard.line'], place, user[-4:], score)
+             for place, (user, score) in enumerate(top, 1)]
+    return locale.text(locale['leaderboard.title'], room.code, len(room.leaderboard)) + '\n'.join(lines)
+
+
+classroom = Classroom()
@@ -0,0 +1,231 @@
+import sys
+import timeit
+from functools import lru_cache
+from collections import Counter
+
+import nlu
+
+"""
+Local matching of the commands when the platform recognized no intent.
+
+Noisy speech recognition breaks a word or two, e.g. "назат" or "павтари", and the turn falls through to the fallback.
+The commands of the grammars of "nlu.py" without slots are matched again here with typos tolerated:
+    matcher.match(['павтари'])      # ({'YANDEX.REPEAT': {'slots': {}}}, [])
+    matcher.match(['третье'])       # ({}, [{'type': 'YANDEX.NUMBER', 'value': 3, ...}]), the task number
+A token is looked up in a trie of the words of the commands with the rows of the Levenshtein distance computed along
+the branches, so the vocabulary is searched in one walk cut off as soon as the distance is too large. The unstressed
+vowels recognition confuses most, "о" and "а", are the same letter for the distance. The closest words are then
+walked through a trie of the commands: the utterance matches if all its words but the filler words spell a command.
+Both tries are built once at import, the words are memoized and a match takes microseconds.
+
+The matcher runs only for the requests without intents and without numbers, a number is an answer. The requests it
+found a command in are counted in "matcher.counters['rescued']", the ones without a command in
+"matcher.counters['missed']".
+"""
+
+# Words said around a command
+FILLERS = frozenset(('а', 'ну', 'ой', 'так', 'вот', 'же', 'пожалуйста', 'алиса', 'please', 'ok', 'окей'))
+# Ordinals of the options of the task choice, they are recognized as the numbers of the options
+ORDINALS = {stem + ending: number
+            for number, stem, endings in ((1, 'перв', ('ое', 'ый', 'ая', 'ой')), (2, 'втор', ('ое', 'ой', 'ая')),
+                                          (3, 'трет', ('ье', 'ий', 'ья')), (4, 'четверт', ('ое', 'ый', 'ая')),
+                                          (5, 'пят', ('ое', 'ый', 'ая')), (6, 'шест', ('ое', 'ой', 'ая')))
+            for ending in endings}
+# Words the scenarios look for among the tokens, they are known words and are not corrected into a command
+KNOWN = frozenset(('повторим', 'класс', 'комната', 'комнату', 'создай', 'создать', 'скорость', 'ошибки',
+                   'повторение', 'марафон'))
+CACHE_SIZE = 4096
+_END = ''
+# Letters recognition confuses, compared as one letter
+_FOLD = str.maketrans('оёэ', 'аее')
+
+
+def max_distance(word):
+    """
+    :return: edit distance tolerated for a word, short words must be exact.
+    """
+    return 0 if len(word) < 5 else 1 if len(word) < 9 else 2
+
+
+def expand(pattern):
+    """
+    :param pattern: pattern of "nlu.GRAMMARS" without "...".
+    :return: list of the phrases of the pattern as tuples of tokens, optional slots are left out and a pattern with a
+        required slot has no phrases.
+    """
+    tokens = nlu.pattern_tokens(pattern)
+    position = 0
+
+    def alternatives():
+        # Phrases of "a b|c" up to ")" or the end
+        nonlocal position
+        phrases = sequence()
+        while position < len(tokens) and tokens[position] == '|':
+            position += 1
+            phrases += sequence()
+        return phrases
+
+    def sequence():
+        nonlocal position
+        phrases = [()]
+        while position < len(tokens) and tokens[position] not in ('|', ')'):
+            token = tokens[position]
+            position += 1
+            if token == '(':
+                options = alternatives()
+                # ")"
+                position += 1
+            elif token[0] == '$':
+                options = []
+            else:
+                options = [tuple(nlu.tokenize(token))]
+            if position < len(tokens) and tokens[position] == '?':
+                position += 1
+                options = options + [()]
+            phrases = [phrase + option for phrase in phrases for option in options]
+        return phrases
+
+    return alternatives()
+
+
+class CommandMatcher:
+    """ Fuzzy matcher of the commands of the grammars """
+    def __init__(self, grammars):
+        """
+        :param grammars: dict of the intents to their patterns, the patterns with slots or "..." are skipped.
+        """
+        self.counters = Counter()
+        # Trie of the commands over the words, the intents are at the end of the commands
+        self._commands = {}
+        words = set(ORDINALS) | KNOWN
+        for intent, patterns in grammars.items():
+            for pattern in patterns:
+                if '...' in pattern:
+                    continue
+                for phrase in expand(pattern):
+                    if not phrase:
+                        continue
+                    node = self._commands
+                    for word in phrase:
+                        node = node.setdefault(word, {})
+                        words.add(word)
+                    node.setdefault(_END, []).append(intent)
+        # Trie of the vocabulary over the folded letters, the words are at the end of it
+        self._letters = {}
+        for word in words:
+            node = self._letters
+            for letter in word.translate(_FOLD):
+                node = node.setdefault(letter, {})
+            node.setdefault(_END, []).append(word)
+        self.normalize = lru_cache(maxsize=CACHE_SIZE)(self._normalize)
+
+    def _normalize(self, token):
+        """
+        :return: tuple of the words of the vocabulary closest to the token within the tolerated distance, the token
+            itself if it is a word of the vocabulary.
+        """
+        folded = token.translate(_FOLD)
+        node = self._letters
+        for letter in folded:
+            node = node.get(letter)
+            if node is None:
+                break
+        else:
+            if _END in node:
+                return (token,) if token in node[_END] else tuple(node[_END])
+        limit = max_distance(token)
+        if limit == 0:
+            return ()
+        # The closest words and their distance
+        best = [[], limit]
+        first = list(range(len(folded) + 1))
+        for letter, child in self._letters.items():
+            if letter != _END:
+                self._search(child, letter, folded, first, best)
+        return tuple(best[0])
+
+    def _search(self, node, letter, token, previous, best):
+        """ Levenshtein rows along a branch of the trie, the branch is left when the row exceeds the best distance """
+        row = [previous[0] + 1]
+        for i in range(1, len(token) + 1):
+            row.append(min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + (token[i - 1] != letter)))
+        distance = row[-1]
+        if _END in node and distance <= best[1]:
+            words = [word for word in node[_END] if max_distance(word) >= distance]
+            if words:
+                if distance < best[1]:
+                    best[0], best[1] = [], distance
+                best[0].extend(words)
+        if min(row) <= best[1]:
+            for next_letter, child in node.items():
+                if next_letter != _END:
+                    self._search(child, next_letter, token, row, best)
+
+    def match(self, tokens):
+        """
+        :param tokens: tokens of a request without intents.
+        :return: (intents, entities) of the command said, both are empty if there is none.
+        """
+        intents = {}
+        entities = []
+        # Nodes of the trie of the commands the words said so far lead to
+        nodes = [self._commands]
+        said = []
+        for i, token in enumerate(tokens):
+            if token in FILLERS:
+                continue
+            if token[-1].isdigit():
+                return intents, entities
+            if not nodes:
+                # No command, the words are only counted
+                said.append((i, ()))
+                continue
+            words = self.normalize(token)
+            said.append((i, words))
+            nodes = [node[word] for node in nodes for word in words if word in node]
+        for node in nodes if said else ():
+            for intent in node.get(_END, ()):
+                intents[intent] = {'slots': {}}
+        # The number of an option said alone
+        if len(said) == 1 and not intents:
+            i, words = said[0]
+            for word in words:
+                if word in ORDINALS:
+                    entities.append({'type': 'YANDEX.NUMBER', 'value': ORDINALS[word],
+                                     'tokens': {'start': i, 'end': i + 1}})
+                    break
+        self.counters['rescued' if intents or entities else 'missed'] += 1
+        return intents, entities
+
+    def rescue(self, request):
+        """
+        :param request: events.UserRequest.
+        :return: the request with the intents and the entities of the command said or the request as it is.
+        """
+        if request.intents or not request.tokens:
+            return request
+        intents, entities = self.match(request.tokens)
+        if not intents and not entities:
+            return request
+        return request._replace(intents=intents, entities=request.entities + tuple(entities))
+
+
+matcher = CommandMatcher(nlu.GRAMMARS)
+
+
+def benchmark(number=20000):
+    """
+    :return: microseconds per match over a sample of noisy commands.
+    """
+    samples = (['назат'], ['павтари'], ['давай', 'начнем'], ['третье'], ['что', 'ты', 'умееш'],
+               ['закончить'], ['абракадабра'], ['тригонометрия'])
+    seconds = min(timeit.repeat(lambda: [matcher.match(tokens) for tokens in samples],
+                                number=number // len(samples), repeat=5))
+    return seconds / (number // len(samples) * len(samples)) * 1e6
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        print(matcher.match(nlu.tokenize(' '.join(sys.argv[1:]))))
+    else:
+        print('%.2f us per match' % benchmark())
@@ -0,0 +1,285 @@
+import re
+import math
+from fractions import Fraction
+from functools import lru_cache
+from collections import namedtuple
+
+import numerals
+
+"""
+Equivalence of answers.
+
+The canonical forms of the correct answer of a question are computed once and kept in hashed sets, an answer is
+parsed from the tokens of the request into exact numbers and every number costs a set lookup:
+    forms = angle_forms((30, 150))
+    matches(request, forms)     # "150", "пи на шесть", "5π/6", "0.52" (radians)
+    forms = number_forms((Fraction(5, 3),))
+    matches(request, forms)     # "5/3", "10/6", "1 целая 2/3", "одна целая две третьих", "1.67"
+Numbers are Fractions, so unreduced fractions, mixed numbers and finite decimals are equal to the answer as they
+are. An answer without a finite decimal form, like 1/3 or π/6 radians, is also accepted as a decimal rounded or
+truncated to one of DECIMAL_PLACES.
+"""
+
+# Digits after the point of the accepted decimal approximations
+DECIMAL_PLACES = (2, 3)
+CACHE_SIZE = 4096
+
+# Canonical forms of an answer: exact numbers and angles in degrees in [0, 360)
+Forms = namedtuple('Forms', 'values angles')
+
+_TOKEN = re.compile(r'-?\d+(?:[.,]\d+)?|[^\W\d_]+|[π/]|^-$')
+_MINUS = frozenset(('минус', 'minus', '-'))
+_PI = frozenset(('пи', 'pi', 'π'))
+# Words between the whole part and the fraction of a mixed number
+_WHOLE = frozenset(('целая', 'целых', 'целую', 'и', 'and'))
+_DIVIDE = frozenset(('/', 'на', 'делить', 'дробь', 'over'))
+_HALF = frozenset(('пополам', 'half'))
+
+
+def _number_words():
+    """
+    :return: dict of the words of the numbers to their values, built from the verbalization of "numerals.py".
+    """
+    words = {}
+    for language in (numerals.RUSSIAN, numerals.ENGLISH):
+        for n in list(range(20)) + list(range(20, 100, 10)) + list(range(100, 1000, 100)):
+            for case in numerals.CASES:
+                for gender in ('m', 'f', 'n'):
+                    spoken = language.cardinal(n, case, gender)
+                    # Compound numbers are summed up from their words
+                    if ' ' not in spoken and '-' not in spoken:
+                        words[spoken] = n
+    return words
+
+
+def _denominator_words():
+    """
+    :return: dict of the words of the denominators, e.g. "шестых", to their values.
+    """
+    words = {}
+    for language in (numerals.RUSSIAN, numerals.ENGLISH):
+        for denominator in list(range(2, 20)) + list(range(20, 110, 10)):
+            for case in numerals.CASES:
+                for numerator in (1, 2, 5):
+                    last = language.fraction(numerator, denominator, case).rsplit(' ', 1)[-1]
+                    words.setdefault(last, denominator)
+    return words
+
+
+def _scale_words(numbers):
+    """
+    :return: dict of the words of the scales, e.g. "тысячи" or "hundred", to their values.
+    """
+    words = {}
+    for language in (numerals.RUSSIAN, numerals.ENGLISH):
+        for scale in (100, 1000, 10 ** 6):
+            for case in numerals.CASES:
+                for count in (1, 2, 5):
+                    last = language.cardinal(count * scale, case).rsplit(' ', 1)[-1]
+                    # "сто" is a number on its own, "hundred" is said after the count
+                    if last not in numbers:
+                        words.setdefault(last, scale)
+    return words
+
+
+_NUMBERS = _number_words()
+_SCALES = _scale_words(_NUMBERS)
+_DENOMINATORS = _denominator_words()
+
+
+def tokenize(tokens):
+    """
+    :param tokens: tokens of the request.
+    :return: list of the tokens split into numbers, words and signs, e.g. ["5", "π", "/", "6"] for "5π/6".
+    """
+    result = []
+    for token in tokens:
+        result.extend(_TOKEN.findall(token.lower()))
+    return result
+
+
+def read_number(tokens, i):
+    """
+    :return: (value, index after it) of the number at the index or None. Compound numbers in words are summed up.
+    """
+    token = tokens[i]
+    if token[-1].isdigit():
+        return Fraction(token.replace(',', '.')), i + 1
+    value = _NUMBERS.get(token)
+    if value is None:
+        if token not in _SCALES:
+            return None
+        # "тысяча двести"
+        value = 1
+    else:
+        i += 1
+    total = 0
+    last = value
+    # "две тысячи двести тридцать пять": every next word is smaller than the previous one or is a scale
+    while i < len(tokens):
+        word = tokens[i]
+        scale = _SCALES.get(word)
+        if scale is not None and scale > value:
+            if scale == 100:
+                value *= scale
+            else:
+                total += value * scale
+                value = 0
+            last = scale
+        elif _NUMBERS.get(word, last) < last:
+            last = _NUMBERS[word]
+            value += last
+        else:
+            break
+        i += 1
+    return Fraction(total + value), i
+
+
+def _fraction(tokens, i):
+    """
+    :return: (value, index after it) of a numerator with a denominator at the index or None.
+    """
+    parsed = read_number(tokens, i)
+    if parsed is None or parsed[1] >= len(tokens):
+        return None
+    numerator, i = parsed
+    if tokens[i] in _DENOMINATORS:
+        return numerator / _DENOMINATORS[tokens[i]], i + 1
+    if tokens[i] in _DIVIDE and i + 1 < len(tokens):
+        i += 1
+    parsed = read_number(tokens, i)
+    if parsed is None or parsed[0] == 0:
+        return None
+    return numerator / parsed[0], parsed[1]
+
+
+def _expression(tokens, i):
+    """
+    :return: (value, True if the value is a multiple of π, index after it) of the answer at the index or None.
+    """
+    n = len(tokens)
+    negative = tokens[i] in _MINUS
+    if negative:
+        i += 1
+        if i == n:
+            return None
+    start = i
+    parsed = read_number(tokens, i)
+    if parsed is not None:
+        value, i = parsed
+        if i < n and tokens[i] in _WHOLE:
+            fraction = _fraction(tokens, i + 1) if i + 1 < n else None
+            if fraction is not None:
+                value, i = value + fraction[0], fraction[1]
+        elif value.denominator == 1:
+            # "3/5", "три пятых" and two numbers in a row, the way Alice recognizes "три пятых"
+            fraction = _fraction(tokens, start)
+            if fraction is not None:
+                value, i = fraction
+    elif tokens[i] in _PI:
+        value = Fraction(1)
+    else:
+        return None
+    pi = i < n and tokens[i] in _PI
+    if pi:
+        i += 1
+    if i < n and tokens[i] in _HALF:
+        value, i = value / 2, i + 1
+    elif i + 1 < n and tokens[i] in _DIVIDE:
+        divisor = read_number(tokens, i + 1)
+        if divisor is not None and divisor[0] != 0:
+            value, i = value / divisor[0], divisor[1]
+    return (-value if negative else value), pi, i
+
+
+def parse(tokens):
+    """
+    :param tokens: tokens of the request.
+    :return: list of (value, True if the value is a multiple of π) of the numbers said, every number is read as long
+        as it goes on: "три пятых" is 3/5, not 3 and 5.
+    """
+    tokens = tokenize(tokens)
+    values = []
+    i = 0
+    while i < len(tokens):
+        parsed = _expression(tokens, i)
+        if parsed is None:
+            i += 1
+            continue
+        value, pi, i = parsed
+        values.append((value, pi))
+    return values
+
+
+def _decimals(value):
+    """
+    :return: the decimal approximations of the value accepted as the answer.
+    """
+    result = set()
+    for places in DECIMAL_PLACES:
+        scale = 10 ** places
+        result.add(Fraction(round(value * scale), scale))
+        result.add(Fraction(math.trunc(value * scale), scale))
+    return result
+
+
+def _finite(value):
+    """
+    :return: True if the fraction has a finite decimal form.
+    """
+    denominator = value.denominator
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+    return denominator == 1
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def number_forms(values):
+    """
+    :param values: tuple of the correct numbers, integers or Fractions.
+    :return: Forms of the numbers.
+    """
+    forms = set()
+    for value in values:
+        value = Fraction(value)
+        forms.add(value)
+        if not _finite(value):
+            forms.update(_decimals(value))
+    return Forms(frozenset(forms), frozenset())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def angle_forms(angles):
+    """
+    :param angles: tuple of the correct angles in degrees.
+    :return: Forms of the angles, in degrees and in radians.
+    """
+    radians = set()
+    for angle in angles:
+        radians.update(_decimals(math.radians(angle)))
+    return Forms(frozenset(radians), frozenset(Fraction(angle % 360) for angle in angles))
+
+
+def matches(request, forms, loose=False):
+    """
+    :param forms: Forms of the correct answer.
+    :param loose: if True every integer among the tokens and the value of the "answer" intent are also read as an
+        answer on their own, voice recognition sometimes breaks the answer apart or the user says a whole sentence.
+    :return: True if one of the numbers said is the correct answer.
+    """
+    values, angles = forms
+    candidates = parse(request.tokens)
+    if loose:
+        candidates.extend((Fraction(token), False) for token in request.tokens if token.isdigit())
+        if 'answer' in request.intents:
+            value = request.intents['answer']['slots']['Answer']['value']
+            if isinstance(value, (int, float)):
+                candidates.append((Fraction(str(value)), False))
+    for value, pi in candidates:
+        if pi:
+            if value * 180 % 360 in angles:
+                return True
+        elif value in values or (value.denominator == 1 and value % 360 in angles):
+            return True
+    return False
@@ -0,0 +1,303 @@
+import sys
+import timeit
+from typing import NamedTuple, Optional
+
+"""
+Typed Alice events (see the sample in "handler.py").
+
+An event is decoded once per request, in a single pass over the payload:
+    event = decode(payload)
+    event.state.session.get('points')
+    event.request.intents
+Required fields are validated on the way and a malformed event is rejected with EventError naming the field, before
+any scenario code runs. The decoded objects are named tuples: immutable, without an instance dict and built in C, a
+frozen dataclass sets every field through object.__setattr__ and costs more than the chains of .get it replaces.
+The state dicts are not copied, their content is defined by the scenarios.
+"""
+
+
+class EventError(ValueError):
+    """ The event does not match the schema of Alice events """
+
+
+class Meta(NamedTuple):
+    locale: str = 'ru-RU'
+    timezone: str = 'UTC'
+    client_id: str = ''
+    # Names of the interfaces of the device, e.g. "screen"
+    interfaces: frozenset = frozenset()
+
+    @property
+    def screen(self):
+        return 'screen' in self.interfaces
+
+
+class UserRequest(NamedTuple):
+    type: str = 'SimpleUtterance'
+    command: str = ''
+    original_utterance: str = ''
+    # Recognized by Alice, see "request.nlu" of the event
+    tokens: tuple = ()
+    entities: tuple = ()
+    intents: dict = {}
+    # Payload of a pressed button
+    payload: object = None
+
+
+class Session(NamedTuple):
+    session_id: str = ''
+    message_id: int = 0
+    new: bool = True
+    skill_id: str = ''
+    user_id: Optional[str] = None
+    application_id: Optional[str] = None
+
+
+class State(NamedTuple):
+    session: dict = {}
+    user: dict = {}
+    application: dict = {}
+
+
+class Event(NamedTuple):
+    meta: Meta = Meta()
+    request: UserRequest = UserRequest()
+    session: Session = Session()
+    state: State = State()
+    version: str = '1.0'
+
+
+# The generated __new__ of a named tuple is a Python function, the decoder builds the tuples directly
+_tuple = tuple.__new__
+
+_EMPTY = {}
+# Meta is the same for all requests from one kind of device, so it is shared
+_metas = {}
+MAX_METAS = 1024
+
+
+def _fail(value, path, expected):
+    """ Raises the EventError of a field that is missing or has a wrong type """
+    if value is None:
+        raise EventError(path + ' is required')
+    raise EventError(path + ' must be ' + expected + ', got ' + type(value).__name__)
+
+
+def _object(value, path):
+    """
+    :return: the optional object or an empty dict if it is missing.
+    """
+    if type(value) is dict:
+        return value
+    if value is None:
+        return _EMPTY
+    _fail(value, path, 'an object')
+
+
+def _string(value, path, default):
+    if type(value) is str:
+        return value
+    if value is None:
+        return default
+    _fail(value, path, 'a string')
+
+
+def _meta(meta):
+    if type(meta) is not dict:
+        meta = _object(meta, 'meta')
+    interfaces = meta.get('interfaces', _EMPTY)
+    if type(interfaces) is not dict:
+        interfaces = _object(interfaces, 'meta.interfaces')
+    # Validated before the lookup, a value of a wrong type may be unhashable
+    key = (_string(meta.get('locale'), 'meta.locale', 'ru-RU'), _string(meta.get('timezone'), 'meta.timezone', 'UTC'),
+           _string(meta.get('client_id'), 'meta.client_id', ''), *interfaces)
+    result = _metas.get(key)
+    if result is None:
+        result = Meta(*key[:3], frozenset(interfaces))
+        if len(_metas) < MAX_METAS:
+            _metas[key] = result
+    return result
+
+
+def _array(value, path):
+    if type(value) is tuple:
+        return value
+    if type(value) is list:
+        return tuple(value)
+    if value is None:
+        return ()
+    _fail(value, path, 'an array')
+
+
+def decode(payload):
+    """
+    :param payload: event sent by Alice, parsed from JSON.
+    :return: Event.
+    :raises EventError: if a required field is missing or a field has a wrong type.
+    """
+    # The checks are inlined for the fields that are present and well-typed, the helpers above handle the rest
+    if type(payload) is not dict:
+        if isinstance(payload, Event):
+            return payload
+        _fail(payload, 'event', 'an object')
+
+    request = payload.get('request')
+    if type(request) is not dict:
+        _fail(request, 'request', 'an object')
+    request_type = request.get('type')
+    if type(request_type) is not str:
+        _fail(request_type, 'request.type', 'a string')
+    command = request.get('command', '')
+    if type(command) is not str:
+        command = _string(command, 'request.command', '')
+    utterance = request.get('original_utterance', '')
+    if type(utterance) is not str:
+        utterance = _string(utterance, 'request.original_utterance', '')
+    nlu = request.get('nlu', _EMPTY)
+    if type(nlu) is not dict:
+        nlu = _object(nlu, 'request.nlu')
+    tokens = nlu.get('tokens', ())
+    tokens = tuple(tokens) if type(tokens) is list else _array(tokens, 'request.nlu.tokens')
+    entities = nlu.get('entities', ())
+    entities = tuple(entities) if type(entities) is list else _array(entities, 'request.nlu.entities')
+    intents = nlu.get('intents', _EMPTY)
+    if type(intents) is not dict:
+        intents = _object(intents, 'request.nlu.intents')
+
+    session = payload.get('session')
+    if type(session) is not dict:
+        _fail(session, 'session', 'an object')
+    session_id = session.get('session_id')
+    if type(session_id) is not str:
+        _fail(session_id, 'session.session_id', 'a string')
+    message_id = session.get('message_id')
+    if type(message_id) is not int:
+        _fail(message_id, 'session.message_id', 'an integer')
+    new = session.get('new', False)
+    if type(new) is not bool:
+        _fail(new, 'session.new', 'a boolean')
+    skill_id = session.get('skill_id', '')
+    if type(skill_id) is not str:
+        skill_id = _string(skill_id, 'session.skill_id', '')
+    user = session.get('user', _EMPTY)
+    if type(user) is not dict:
+        user = _object(user, 'session.user')
+    user_id = user.get('user_id')
+    if user_id is not None and type(user_id) is not str:
+        _fail(user_id, 'session.user.user_id', 'a string')
+    application = session.get('application', _EMPTY)
+    if type(application) is not dict:
+        application = _object(application, 'session.application')
+    application_id = application.get('application_id')
+    if application_id is not None and type(application_id) is not str:
+        _fail(application_id, 'session.application.application_id', 'a string')
+
+    version = payload.get('version')
+    if type(version) is not str:
+        _fail(version, 'version', 'a string')
+
+    state = payload.get('state', _EMPTY)
+    if type(state) is not dict:
+        state = _object(state, 'state')
+    session_state = state.get('session')
+    if type(session_state) is not dict:
+        session_state = _object(session_state, 'state.session').copy()
+    user_state = state.get('user')
+    if type(user_state) is not dict:
+        user_state = _object(user_state, 'state.user').copy()
+    application_state = state.get('application')
+    if type(application_state) is not dict:
+        application_state = _object(application_state, 'state.application').copy()
+
+    return _tuple(Event, (
+        _meta(payload.get('meta', _EMPTY)),
+        _tuple(UserRequest, (request_type, command, utterance, tokens, entities, intents, request.get('payload'))),
+        _tuple(Session, (session_id, message_id, new, skill_id, user_id, application_id)),
+        _tuple(State, (session_state, user_state, application_state)),
+        version))
+
+
+def _sample_event():
+    return {
+        'meta': {'locale': 'ru-RU', 'timezone': 'UTC', 'client_id': 'ru.yandex.searchplugin/7.16',
+                 'interfaces': {'screen': {}, 'payments': {}, 'account_linking': {}}},
+        'request': {'command': 'пять', 'original_utterance': 'пять', 'type': 'SimpleUtterance',
+                    'nlu': {'tokens': ['пять'], 'entities': [{'type': 'YANDEX.NUMBER', 'value': 5,
+                                                              'tokens': {'start': 0, 'end': 1}}],
+                            'intents': {}}},
+        'session': {'message_id': 3, 'new': False, 'session_id': 'benchmark', 'skill_id': 'skill',
+                    'user': {'user_id': 'user'}, 'application': {'application_id': 'application'}},
+        'state': {'session': {'scenario': 'AdditionSubtraction', 'points': 2, 'question_number': 3, 'answer': 5,
+                              'asked_at': 1000, 'times': [2000, 3000, 4000], 'score': 300, 'showed': [-1]},
+                  'user': {}, 'application': {}},
+        'version': '1.0'
+    }
+
+
+_SESSION_KEYS = ('points', 'question_number', 'answer', 'answer_den', 'asked', 'showed', 'mode', 'asked_at', 'times',
+                 'score', 'question', 'review', 'room', 'scenario', 'answer')
+
+
+class _ChainedRequest:
+    """ The request before the decoder: every read walks the chain """
+    def __init__(self, event):
+        self.event = event
+
+    @property
+    def intents(self):
+        return self.event['request'].get('nlu', {}).get('intents', {})
+
+    @property
+    def tokens(self):
+        return self.event['request'].get('nlu', {}).get('tokens', {})
+
+    @property
+    def entities(self):
+        return self.event['request'].get('nlu', {}).get('entities', {})
+
+
+def _chained_reads(event):
+    """ Reads of one request the way they were done before the decoder: a chain of .get per field """
+    values = [event.get('state', {}).get('session', {}).get(key) for key in _SESSION_KEYS]
+    values.append(event.get('session', {}).get('user', {}).get('user_id'))
+    values.append(event.get('meta', {}).get('locale'))
+    request = _ChainedRequest(event)
+    # The handler and the scenarios read the intents about eight times, the tokens and the entities once
+    for _ in range(8):
+        values.append(request.intents)
+    values.append(request.tokens)
+    values.append(request.entities)
+    return values
+
+
+def _decoded_reads(event):
+    event = decode(event)
+    session = event.state.session
+    values = [session.get(key) for key in _SESSION_KEYS]
+    values.append(event.session.user_id)
+    values.append(event.meta.locale)
+    request = event.request
+    for _ in range(8):
+        values.append(request.intents)
+    values.append(request.tokens)
+    values.append(request.entities)
+    return values
+
+
+def benchmark(number=10000, repeat=50):
+    """
+    Compares the reads of a request with the decoder against the chains of .get. The two are timed alternately and
+    the best time of each is taken, so a load spike on the machine does not favour one of them.
+    :return: (microseconds per event with the chains, with the decoder).
+    """
+    event = _sample_event()
+    chained = decoded = float('inf')
+    for _ in range(repeat):
+        chained = min(chained, timeit.timeit(lambda: _chained_reads(event), number=number))
+        decoded = min(decoded, timeit.timeit(lambda: _decoded_reads(event), number=number))
+    return chained / number * 1e6, decoded / number * 1e6
+
+
+if __name__ == '__main__':
+    chained, decoded = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
+    print('chained .get: %.2f us/event, decoder: %.2f us/event' % (chained, decoded))
@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import random
+import difflib
+import hashlib
+import argparse
+import multiprocessing
+
+import rounds
+import handler
+import offline
+import retry_cache
+
+"""
+Golden-output regression harness.
+
+A corpus of scripted dialogs is generated from the dialog number, so it is the same on every run. Each dialog is
+played through "handler.handler" like the platform does (the "session_state" of a response is sent back in the
+next event) with the random generator seeded by the dialog number. The "response" and "session_state" of every
+turn are snapshotted and hashed.
+
+    python golden.py record -n 100000     # store the goldens
+    python golden.py check -n 100000      # compare against the goldens
+
+Goldens are two files: "index.json" maps the dialog number to its hash and to the offset of its snapshot in
+"snapshots.jsonl". Checking compares the hashes only and reads the snapshots of the changed dialogs to print
+readable diffs. The test suite checks the first dialogs against the hashes kept in "tests/goldens", the snapshots
+are not kept in the repository. A deliberate change of the answers records them again:
+    python golden.py record -n 200 -d tests/goldens
+"""
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'goldens')
+
+TASK_INTENTS = ['addition_subtraction', 'multiplication_division', 'fractions', 'exponentiation', 'square_root',
+                'trigonometry']
+
+
+def _intent(name, slots=None):
+    return {name: {'slots': slots or {}}}
+
+
+def _answer(state, correct):
+    """
+    Builds the "nlu" of an answer to the current question.
+    :param state: session state of the previous response.
+    :param correct: whether the answer is correct.
+    """
+    answer = state.get('answer', 0)
+    if isinstance(answer, (list, tuple)):
+        value = answer[0] if correct else answer[0] + 1
+        tokens = [str(value)]
+    elif 'answer_den' in state:
+        value = answer if correct else answer + 1
+        tokens = [str(value), str(state['answer_den'])]
+    else:
+        value = answer if correct else answer + 1
+        tokens = [str(value)]
+    slot = {'Answer': {'type': 'YANDEX.NUMBER', 'value': value, 'tokens': {'start': 0, 'end': len(tokens)}}}
+    return {'intents': _intent('answer', slot), 'tokens': tokens, 'entities': []}
+
+
+def script(number):
+    """
+    :param number: dialog number.
+    :return: list of steps of the dialog. A step is a tuple (kind, argument).
+    """
+    rng = random.Random(number)
+    steps = [('intent', None)]
+    if rng.random() < 0.2:
+        steps.append(('intent', 'help'))
+    steps.append(('intent', rng.choice(['start_confirm', 'YANDEX.CONFIRM'])))
+    if rng.random() < 0.2:
+        steps.append(('variant', rng.randint(0, 7)))
+    task = rng.randrange(len(TASK_INTENTS))
+    if rng.random() < 0.5:
+        steps.append(('intent', TASK_INTENTS[task]))
+    else:
+        steps.append(('entity', task + 1))
+    accuracy = rng.random()
+    for _ in range(10):
+        roll = rng.random()
+        if roll < 0.03:
+            steps.append(('intent', 'YANDEX.HELP'))
+            steps.append(('intent', 'back'))
+            break
+        elif roll < 0.08:
+            steps.append(('intent', 'YANDEX.REPEAT'))
+        steps.append(('answer', rng.random() < accuracy))
+    steps.append(('intent', rng.choice(['interesting_facts', 'start_confirm', 'start_reject'])))
+    return steps
+
+
+def step_nlu(step, state):
+    """
+    :param state: session state of the previous response.
+    :return: the "nlu" of the event of the step.
+    """
+    kind, argument = step
+    nlu = {'intents': {}, 'tokens': [], 'entities': []}
+    if kind == 'intent' and argument is not None:
+        nlu['intents'] = _intent(argument)
+    elif kind == 'variant':
+        nlu['intents'] = _intent('repeat_variant', {'Variant': {'type': 'YANDEX.NUMBER', 'value': argument}})
+    elif kind == 'entity':
+        nlu['tokens'] = [str(argument)]
+        nlu['entities'] = [{'type': 'YANDEX.NUMBER', 'value': argument, 'tokens': {'start': 0, 'end': 1}}]
+    elif kind == 'answer':
+        nlu = _answer(state, argument)
+    return nlu
+
+
+def _event(step, number, message_id, state):
+    nlu = step_nlu(step, state)
+    return {
+        'meta': {'locale': 'ru-RU', 'timezone': 'UTC', 'interfaces': {}},
+        'request': {'command': '', 'original_utterance': '', 'nlu': nlu, 'type': 'SimpleUtterance'},
+        'session': {'message_id': message_id, 'new': message_id == 0, 'session_id': 'golden-' + str(number)},
+        'state': {'session': state, 'user': {}, 'application': {}},
+        'version': '1.0'
+    }
+
+
+class _Clock:
+    """ Clock of a played dialog: every reading is 3 seconds later than the previous one """
+    def __init__(self):
+        self._time = 0.0
+
+    def __call__(self):
+        self._time += 3.0
+        return self._time
+
+
+def play(number):
+    """
+    Plays the dialog through the handler.
+    :param number: dialog number.
+    :return: list of turn snapshots.
+    """
+    random.seed(number)
+    # A dialog played again is handled again, not replayed from the responses of the previous play, the repeats
+    # within the dialog still replay its responses
+    settings = [(rounds, 'clock', _Clock()), (handler, 'retries', retry_cache.RetryCache())]
+    state = {}
+    turns = []
+    with offline.patched(settings):
+        for message_id, step in enumerate(script(number)):
+            response = handler.handler(_event(step, number, message_id, state), None)
+            state = response.get('session_state', {})
+            turns.append({'step': list(step), 'response': response.get('response'), 'session_state': state})
+            if response.get('end_session'):
+                break
+    return turns
+
+
+def _dump(turns):
+    return json.dumps(turns, ensure_ascii=False, sort_keys=True)
+
+
+def _digest(number):
+    snapshot = _dump(play(number))
+    return number, hashlib.sha1(snapshot.encode('utf-8')).hexdigest(), snapshot
+
+
+def _init_worker():
+    # Timing-driven degradation would make the output depend on the machine load, the dialogs are played at full speed
+    offline.install(offline.full_speed())
+
+
+def _digest_here(number):
+    with offline.patched(offline.full_speed()):
+        return _digest(number)
+
+
+def _run(count, workers):
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            yield from pool.imap(_digest, range(count), chunksize=256)
+    else:
+        yield from map(_digest_here, range(count))
+
+
+def record(count, directory=DEFAULT_DIR, workers=1):
+    """ Stores the goldens of the first "count" dialogs """
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    with open(os.path.join(directory, 'snapshots.jsonl'), 'wb') as f:
+        for number, digest, snapshot in _run(count, workers):
+            index[str(number)] = [digest, f.tell()]
+            f.write(snapshot.encode('utf-8') + b'\n')
+    with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    return len(index)
+
+
+def _pretty(snapshot):
+    return json.dumps(json.loads(snapshot), ensure_ascii=False, sort_keys=True, indent=1).splitlines()
+
+
+def check(count, directory=DEFAULT_DIR, workers=1, out=sys.stdout, max_diffs=20):
+    """
+    Compares the first "count" dialogs with the goldens.
+    :return: list of numbers of the changed dialogs.
+    """
+    with open(os.path.join(directory, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+    changed = []
+    path = os.path.join(directory, 'snapshots.jsonl')
+    # The snapshots are optional, without them a changed dialog is printed in full
+    snapshots = open(path, 'rb') if os.path.exists(path) else None
+    try:
+        for number, digest, snapshot in _run(count, workers):
+            golden = index.get(str(number))
+            if golden is not None and golden[0] == digest:
+                continue
+            changed.append(number)
+            if len(changed) > max_diffs:
+                continue
+            expected = []
+            if golden is not None and snapshots is not None:
+                snapshots.seek(golden[1])
+                expected = _pretty(snapshots.readline().decode('utf-8'))
+            diff = difflib.unified_diff(expected, _pretty(snapshot), 'golden/' + str(number), 'actual/' + str(number),
+                                        lineterm='')
+            out.write('\n'.join(diff) + '\n')
+    finally:
+        if snapshots is not None:
+            snapshots.close()
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Golden-output regression harness.')
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('-n', '--dialogs', type=int, default=10000)
+    parser.add_argument('-d', '--dir', default=DEFAULT_DIR)
+    parser.add_argument('-w', '--workers', type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        print('Recorded %d dialogs' % record(args.dialogs, args.dir, args.workers))
+        return 0
+    changed = check(args.dialogs, args.dir, args.workers)
+    print('%d of %d dialogs changed' % (len(changed), args.dialogs))
+    return 1 if changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,9 @@
-from request import Request
+from events import decode
 from scenarios import SCENARIOS, DEFAULT_SCENARIO, Parting, Help, init_helper
+from load_shedding import monitor, shed_response
+from retry_cache import retries
+from rate_limit import limiter, client_id, limited_response
+from commands import matcher
 
 """
 Sample request sent by Alice:
@@ -57,12 +61,69 @@ def handler(event, context):
     :param event: request payload.
     :param context: information about current execution context.
     :return: response to be serialized as JSON.
+    :raises events.EventError: if the event is malformed.
     """
+    budget = monitor.start()
+    try:
+        return handle(event, budget)
+    finally:
+        monitor.finish(budget)
 
-    request = Request(event)
 
-    # Helper initialization in "scenarios.py"
-    init_helper(event)
+def handle(event, budget):
+    """
+    Handles the event within a budget started when the event arrived, e.g. by a server queueing the events before
+    the handler, so the queue depth and the deadline count the wait in the queue:
+        budget = monitor.start()
+        try:
+            ...    # waits for the handler
+            return handle(event, budget)
+        finally:
+            monitor.finish(budget)
+    :param budget: load_shedding.Budget of the request.
+    :return: response to be serialized as JSON.
+    :raises events.EventError: if the event is malformed.
+    """
+    # Validated before any scenario code runs
+    event = decode(event)
+    # A retry of a late answer gets the response of the first request, the scenario is not played again
+    session = event.session
+    if not session.session_id:
+        return _respond(event, budget) if limiter.allow(client_id(event)) else limited_response(event)
+    key = (session.session_id, session.message_id)
+    response = retries.claim(key, budget.remaining)
+    if response is not None:
+        return response
+    # A client flooding the skill gets a pre-rendered answer, nothing is played. Only the new requests take a token,
+    # the limited answer is not kept and a retry of it is checked again
+    if not limiter.allow(client_id(event)):
+        retries.release(key)
+        return limited_response(event)
+    try:
+        response = _respond(event, budget)
+    except BaseException:
+        retries.release(key)
+        raise
+    retries.put(key, response)
+    return response
+
+
+def _last_response(event):
+    """
+    :return: the previous response in the session if this instance answered it or None.
+    """
+    session = event.session
+    if not session.session_id or session.message_id == 0:
+        return None
+    return retries.get((session.session_id, session.message_id - 1))
+
+
+def _respond(event, budget):
+    # If the platform recognized no intent, e.g. a command is misheard, the commands are matched locally
+    request = matcher.rescue(event.request)
+
+    # Helper initialization in "scenarios.py". Under overload the scenarios skip nonessential work
+    init_helper(event, degraded=budget.check())
 
     """
     * An intent is a task that the user formulates in a specific replica. Each intent corresponds to one form.
@@ -81,20 +142,32 @@ def handler(event, context):
         return Parting().reply(request)
 
     # Computing the current scene by getting the data from the "state" that saves the data during the session.
-    current_scenario_id = event.get('state', {}).get('session', {}).get('scenario')
+    current_scenario_id = event.state.session.get('scenario')
     if current_scenario_id is None:
         return DEFAULT_SCENARIO().reply(request)
     current_scenario = SCENARIOS.get(current_scenario_id, DEFAULT_SCENARIO)()
 
-    # If the user wants the skill to repeat
+    # If the user wants the skill to repeat, the last response is replayed as it was and the state is not changed
     if ('YANDEX.REPEAT' in request.intents or 'say_again' in request.intents) and \
-            'answer' not in event.get('state', {}).get('session', {}) and 'повторим' not in request.tokens:
-        return current_scenario.reply(request)
+            'повторим' not in request.tokens:
+        response = _last_response(event)
+        if response is None:
+            response = current_scenario.repeat(event.state.session)
+        if response is not None:
+            return response
+        # The previous response was given by another instance, outside of a question the scenario replies again. A
+        # question that can not be rebuilt is not answered by the repeat, the user is asked to answer it again
+        if 'answer' not in event.state.session:
+            return current_scenario.reply(request)
+        return current_scenario.fallback(request, current_scenario.buttons, dict(event.state.session))
+
     # If the user wants to go back to the beginning
-    elif 'to_start' in request.intents:
+    if 'to_start' in request.intents:
         return DEFAULT_SCENARIO().reply(request)
     # If the user wants to know what a skill is capable of
     elif 'help' in request.intents:
+        if budget.should_shed(Help.id()):
+            return shed_response(event)
         return Help().reply(request)
     # If the user needs help
     elif 'YANDEX.HELP' in request.intents:
@@ -106,6 +179,8 @@ def handler(event, context):
         return next_scenario
     # If the skill understood the user's intent
     elif next_scenario is not None:
+        if budget.should_shed(next_scenario.id()):
+            return shed_response(event)
         return next_scenario.reply(request)
     # If the skill didn't understand the user's intent
     else:
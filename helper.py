@@ -48,35 +48,117 @@ Sample request sent by Alice:
 """
 
 
+from rounds import DEFAULT_MODE, now_ms
+from locales import get_locale
+from checkpoint import KEY
+
+
 class Helper:
     """ Class for more convenient work with user data """
-    def __init__(self, event):
-        self._points = event.get('state', {}).get('session', {}).get('points')
+    __slots__ = ('_points', '_question_number', '_answer', '_answer_den', '_asked', '_showed', '_mode', '_asked_at',
+                 '_times', '_score', '_user_id', '_question', '_review', '_locale', '_screen', '_room', '_now',
+                 '_correct', '_late', '_degraded', '_streak', '_task', '_accuracy', '_seed', '_authorized', '_saved',
+                 '_resumed', '_angle')
+
+    def __init__(self, event, degraded=False):
+        """
+        :param event: events.Event of the request.
+        """
+        # Walked once, the state is read field by field below
+        session = event.state.session
+
+        self._points = session.get('points')
         if self._points is None:
             self._points = 0
 
-        self._question_number = event.get('state', {}).get('session', {}).get('question_number')
+        self._question_number = session.get('question_number')
         if self._question_number is None:
             self._question_number = 0
 
-        self._answer = event.get('state', {}).get('session', {}).get('answer')
+        self._answer = session.get('answer')
         if self._answer is None:
             self._answer = 2001
 
-        self._answer_den = event.get('state', {}).get('session', {}).get('answer_den')
+        self._answer_den = session.get('answer_den')
         if self._answer_den is None:
             self._answer_den = 1
 
-        self._asked = event.get('state', {}).get('session', {}).get('asked')
+        self._asked = session.get('asked')
         if self._asked is None:
             self._asked = []
 
-        self._showed = event.get('state', {}).get('session', {}).get('showed')
+        self._showed = session.get('showed')
         if self._showed is None:
             self._showed = [-1]
 
+        self._mode = session.get('mode')
+        if self._mode is None:
+            self._mode = DEFAULT_MODE
+
+        # Time the current question was asked at, in milliseconds
+        self._asked_at = session.get('asked_at')
+
+        # Milliseconds the user took to answer every question of the round
+        # Copied, the list is appended to and the event must stay untouched
+        self._times = list(session.get('times', []))
+
+        self._score = session.get('score')
+        if self._score is None:
+            self._score = 0
+
+        self._user_id = event.session.user_id
+        if self._user_id is None:
+            self._user_id = event.session.application_id
+
+        # Text and tts of the current quiz question
+        self._question = session.get('question')
+
+        # If the current trigonometry review question asks for an angle, the review questions are kept without the text
+        self._angle = session.get('angle')
+
+        # Id and task of the current review question
+        self._review = session.get('review')
+
+        # Messages and number verbalization of the language of the user
+        self._locale = get_locale(event.meta.locale)
+
+        # If the device has a screen, the responses get cards
+        self._screen = event.meta.screen
+
+        # Code of the classroom the user is in
+        self._room = session.get('room')
+
+        # The clock is read at most once per request
+        self._now = None
+
         # If the user answered the question correctly, the variable _correct will be True
         self._correct = False
+        # If the answer was correct but given after the time limit, the variable _late will be True
+        self._late = False
+
+        # If the server is overloaded, the answer is built without nonessential work
+        self._degraded = degraded
+
+        # Correct answers in a row in the marathon
+        self._streak = session.get('streak')
+        if self._streak is None:
+            self._streak = 0
+
+        # Task type of the current marathon question
+        self._task = session.get('task')
+
+        # Recent accuracy of every task type in the marathon, see "marathon.py"
+        self._accuracy = session.get('accuracy')
+
+        # Seed of the questions of a checkpointed round, see "checkpoint.py"
+        self._seed = session.get('seed')
+
+        # The user is logged in, the checkpoint is kept in "state.user", else in "state.application"
+        self._authorized = event.session.user_id is not None
+        # Encoded checkpoint of an unfinished round, it is decoded only by the scenarios offering to continue it
+        self._saved = (event.state.user if self._authorized else event.state.application).get(KEY)
+        # If the round is continued from a checkpoint, the variable _resumed will be True
+        self._resumed = False
 
     def set_points(self, points):
         self._points = points
@@ -96,6 +178,108 @@ class Helper:
     def get_correct(self):
         return self._correct
 
+    def set_late(self, late):
+        self._late = late
+
+    def get_late(self):
+        return self._late
+
+    def set_mode(self, mode):
+        self._mode = mode
+
+    def get_mode(self):
+        return self._mode
+
+    def set_score(self, score):
+        self._score = score
+
+    def get_score(self):
+        return self._score
+
+    def set_room(self, room):
+        self._room = room
+
+    def get_room(self):
+        return self._room
+
+    def set_streak(self, streak):
+        self._streak = streak
+
+    def get_streak(self):
+        return self._streak
+
+    def set_seed(self, seed):
+        self._seed = seed
+
+    def get_seed(self):
+        return self._seed
+
+    def set_asked(self, asked):
+        self._asked = asked
+
+    def get_asked(self):
+        return self._asked
+
+    def set_saved(self, saved):
+        self._saved = saved
+
+    def get_saved(self):
+        return self._saved
+
+    def set_resumed(self, resumed):
+        self._resumed = resumed
+
+    def get_resumed(self):
+        return self._resumed
+
+    def set_accuracy(self, accuracy):
+        self._accuracy = accuracy
+
+    def get_accuracy(self):
+        return self._accuracy
+
+    @property
+    def question(self):
+        return self._question
+
+    @property
+    def review(self):
+        return self._review
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @property
+    def task(self):
+        return self._task
+
+    @property
+    def locale(self):
+        return self._locale
+
+    @property
+    def screen(self):
+        return self._screen
+
+    @property
+    def user_id(self):
+        return self._user_id
+
+    @property
+    def now(self):
+        if self._now is None:
+            self._now = now_ms()
+        return self._now
+
+    @property
+    def asked_at(self):
+        return self._asked_at
+
+    @property
+    def times(self):
+        return self._times
+
     @property
     def answer(self):
         return self._answer
@@ -104,14 +288,28 @@ class Helper:
     def answer_den(self):
         return self._answer_den
 
-    @property
-    def asked(self):
-        return self._asked
-
     @property
     def showed(self):
         return self._showed
 
+    @property
+    def degraded(self):
+        return self._degraded
+
+    @property
+    def authorized(self):
+        return self._authorized
+
     points = property(get_points, set_points)
     question_number = property(get_question_number, set_question_number)
     correct = property(get_correct, set_correct)
+    late = property(get_late, set_late)
+    mode = property(get_mode, set_mode)
+    score = property(get_score, set_score)
+    room = property(get_room, set_room)
+    streak = property(get_streak, set_streak)
+    accuracy = property(get_accuracy, set_accuracy)
+    seed = property(get_seed, set_seed)
+    asked = property(get_asked, set_asked)
+    saved = property(get_saved, set_saved)
+    resumed = property(get_resumed, set_resumed)
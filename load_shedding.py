@@ -0,0 +1,167 @@
+import time
+import threading
+from collections import Counter, deque
+
+from locales import get_locale
+
+"""
+Deadline-aware degradation for "handler.handler".
+
+Alice waits for the answer for a limited time, a late answer is worse than a simple one. The monitor tracks the
+number of requests in flight and the recent p99 latency:
+    * over the "degrade" thresholds the skill answers without sounds and randomized extras;
+    * over the "shed" thresholds low-priority scenarios (interesting facts, help) get a pre-rendered answer.
+Every decision is counted in "monitor.counters".
+"""
+
+# Alice drops the answer after 3 seconds
+ALICE_DEADLINE = 3.0
+
+
+class Thresholds:
+    """ Configurable thresholds of the degradation decisions """
+    def __init__(self, budget=ALICE_DEADLINE, reserve=0.5, degrade_queue_depth=4, shed_queue_depth=8,
+                 degrade_p99=1.0, shed_p99=2.0, shed_scenarios=('InterestingFact', 'Help'), window=256):
+        """
+        :param budget: seconds the platform waits for the answer.
+        :param reserve: if less than "reserve" seconds of the budget is left, the request is degraded.
+        :param degrade_queue_depth: requests in flight to start degrading.
+        :param shed_queue_depth: requests in flight to start shedding low-priority scenarios.
+        :param degrade_p99: p99 latency in seconds to start degrading.
+        :param shed_p99: p99 latency in seconds to start shedding low-priority scenarios.
+        :param shed_scenarios: ids of low-priority scenarios, all of them are shed once a shed threshold is crossed.
+        :param window: number of the latest requests the p99 is computed over.
+        """
+        self.budget = budget
+        self.reserve = reserve
+        self.degrade_queue_depth = degrade_queue_depth
+        self.shed_queue_depth = shed_queue_depth
+        self.degrade_p99 = degrade_p99
+        self.shed_p99 = shed_p99
+        self.shed_scenarios = tuple(shed_scenarios)
+        self.window = window
+
+    @classmethod
+    def never(cls):
+        """ Thresholds that are never crossed, for deterministic offline runs """
+        return cls(budget=float('inf'), reserve=float('-inf'), degrade_queue_depth=float('inf'),
+                   shed_queue_depth=float('inf'), degrade_p99=float('inf'), shed_p99=float('inf'))
+
+
+class Budget:
+    """ Time budget of a single request """
+    def __init__(self, monitor, started, depth):
+        self._monitor = monitor
+        self.started = started
+        self.depth = depth
+        self.degraded = False
+        self.shedding = False
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def remaining(self):
+        return self._monitor.thresholds.budget - self.elapsed
+
+    def check(self):
+        """
+        Re-evaluates the budget before the expensive part of the request.
+        :return: True if the request must be degraded.
+        """
+        if not self.degraded and self.remaining < self._monitor.thresholds.reserve:
+            self.degraded = True
+            self._monitor.count('degraded.deadline')
+        return self.degraded
+
+    def should_shed(self, scenario_id):
+        """
+        :param scenario_id: the scenario the request is going to.
+        :return: True if the scenario is low-priority and must not be run now.
+        """
+        if self.shedding and scenario_id in self._monitor.thresholds.shed_scenarios:
+            self._monitor.count('shed.' + scenario_id)
+            return True
+        return False
+
+
+class LoadMonitor:
+    """ Tracks queue depth and latency of the handler and takes degradation decisions """
+    def __init__(self, thresholds=None):
+        self.thresholds = thresholds or Thresholds()
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies = deque(maxlen=self.thresholds.window)
+        self._p99 = 0.0
+
+    @property
+    def p99(self):
+        return self._p99
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def start(self, started=None):
+        """
+        :param started: monotonic time the request arrived at, if it was queued before the handler.
+        :return: the budget of the request.
+        """
+        thresholds = self.thresholds
+        with self._lock:
+            self._in_flight += 1
+            depth = self._in_flight
+            p99 = self._p99
+            self.counters['requests'] += 1
+        budget = Budget(self, time.monotonic() if started is None else started, depth)
+        if depth > thresholds.shed_queue_depth or p99 > thresholds.shed_p99:
+            budget.shedding = True
+        if depth > thresholds.degrade_queue_depth:
+            budget.degraded = True
+            self.count('degraded.queue_depth')
+        elif p99 > thresholds.degrade_p99:
+            budget.degraded = True
+            self.count('degraded.p99')
+        budget.check()
+        return budget
+
+    def finish(self, budget):
+        latency = budget.elapsed
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if latency > self.thresholds.budget:
+                self.counters['deadline_exceeded'] += 1
+            # Sorting the window on every request is wasteful, the p99 moves slowly
+            if self.counters['requests'] % 32 == 0:
+                latencies = sorted(self._latencies)
+                self._p99 = latencies[int(len(latencies) * 0.99)]
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self._latencies.clear()
+            self._p99 = 0.0
+
+
+def shed_response(event):
+    """
+    Pre-rendered answer for a shed request in the language of the request, the user stays in the current scenario.
+    :param event: events.Event of the request.
+    :return: response to be serialized as JSON.
+    """
+    text = get_locale(event.meta.locale)['shed.reply']
+    return {
+        'response': {'text': text, 'tts': text},
+        'version': '1.0',
+        'session_state': dict(event.state.session),
+    }
+
+
+monitor = LoadMonitor()
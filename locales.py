@@ -0,0 +1,122 @@
+from random import choice
+
+import numerals
+import messages_ru
+import messages_en
+
+"""
+Locales of the skill: a message catalog and the number verbalization of a language.
+
+Scenarios take every text from the catalog of the locale of the request ("meta.locale"), so a language is added
+with a new catalog module and an entry in LOCALES. Templates are formatted with "str.format", values substituted
+into them are written with digits in the text and verbalized in the TTS:
+    locale.text('Сумма {0} и {1}', 2, 3)            # 'Сумма 2 и 3'
+    locale.speech('Сумма {0:gen} и {1:gen}', 2, 3)   # 'Сумма двух и трёх'
+The format spec is the grammatical case of the value, see "numerals.py".
+"""
+
+
+class _Written:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __format__(self, spec):
+        return numerals.written(self.value)
+
+
+class _Spoken:
+    __slots__ = ('value', 'numerals')
+
+    def __init__(self, value, numerals):
+        self.value = value
+        self.numerals = numerals
+
+    def __format__(self, spec):
+        return self.numerals.spoken(self.value, spec or 'nom')
+
+
+class Locale:
+    """ Message catalog and number verbalization of a language """
+    def __init__(self, code, messages, numerals, fallback=None):
+        """
+        :param messages: dict of message key to a string or a tuple of variants.
+        :param numerals: numerals.Numerals of the language.
+        :param fallback: locale the missing messages are taken from.
+        """
+        self.code = code
+        self.messages = messages
+        self.numerals = numerals
+        self.fallback = fallback
+
+    def __getitem__(self, key):
+        value = self.messages.get(key)
+        if value is None:
+            if self.fallback is None:
+                raise KeyError(key)
+            return self.fallback[key]
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def choice(self, key):
+        """
+        :return: a random variant of the message.
+        """
+        return choice(self[key])
+
+    def plural(self, n, key):
+        """
+        :param key: message with the forms of a noun, see "numerals.russian_plural" for their order.
+        :return: the form of the noun agreeing with n.
+        """
+        return self[key][self.numerals.plural(n)]
+
+    def text(self, template, *args):
+        """
+        :return: the template with the values written as they are shown.
+        """
+        return template.format(*[_Written(arg) for arg in args])
+
+    def speech(self, template, *args):
+        """
+        :return: the template with the values in words.
+        """
+        return template.format(*[_Spoken(arg, self.numerals) for arg in args])
+
+    def render(self, template, *args):
+        """
+        :return: (text, tts) of the template.
+        """
+        return self.text(template, *args), self.speech(template, *args)
+
+    def spoken(self, value, case='nom'):
+        return self.numerals.spoken(value, case)
+
+
+DEFAULT_LOCALE = 'ru'
+
+RUSSIAN = Locale('ru', messages_ru.MESSAGES, numerals.RUSSIAN)
+ENGLISH = Locale('en', messages_en.MESSAGES, numerals.ENGLISH, fallback=RUSSIAN)
+
+LOCALES = {
+    'ru': RUSSIAN,
+    'en': ENGLISH,
+}
+
+
+def get_locale(code):
+    """
+    :param code: locale of the request, e.g. "ru-RU".
+    :return: the Locale of the language or the default one.
+    """
+    if code:
+        locale = LOCALES.get(code.split('-')[0].lower())
+        if locale is not None:
+            return locale
+    return LOCALES[DEFAULT_LOCALE]
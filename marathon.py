@@ -0,0 +1,67 @@
+from sampling import AliasSampler
+
+"""
+Marathon: an endless round mixing the questions of all the task types.
+
+The questions come from a lazy pipeline, an endless stream of task types drawn by their weights mapped to the
+questions they generate:
+    questions = stream(tasks, accuracy, previous)
+    task, question = next(questions)
+Nothing is materialized, a turn draws one question however long the session is. The session state keeps an O(1)
+cursor instead of the history: the number of the question, the score, the streak, the task type of the current
+question and the recent accuracy of every task type. The accuracy is an exponential moving average in percent, the
+lower it is the more often the task type is drawn, so the user practices the weak tasks more but every task keeps
+its share.
+"""
+
+INITIAL_ACCURACY = 50
+# Share of the last answer in the recent accuracy
+SMOOTHING = 0.3
+# Weight of a task type answered always correctly, the weight of a task type is MIN_WEIGHT + 100 - accuracy
+MIN_WEIGHT = 20
+# Questions of a task type remembered not to be asked again, e.g. the trigonometry table variants
+RECENT = 10
+
+
+def accuracy(value, tasks):
+    """
+    :param value: recent accuracy from the session state or None.
+    :return: list of the recent accuracy of the task types in percent, a new one if the state has none.
+    """
+    if value is None or len(value) != len(tasks):
+        return [INITIAL_ACCURACY] * len(tasks)
+    return list(value)
+
+
+def update(value, correct):
+    """
+    :return: the recent accuracy after an answer.
+    """
+    return round(value + ((100 if correct else 0) - value) * SMOOTHING)
+
+
+def weights(accuracy):
+    return {i: MIN_WEIGHT + 100 - value for i, value in enumerate(accuracy)}
+
+
+def draws(accuracy, previous=None, rng=None):
+    """
+    :param previous: index of the task type of the previous question, the task types are interleaved.
+    :return: endless iterator of the indices of the drawn task types.
+    """
+    sampler = AliasSampler(weights(accuracy))
+    while True:
+        index = sampler.sample(rng)
+        # Rejected with the probability of one task type at most, a draw takes O(1) expected time
+        if index != previous or len(sampler) == 1:
+            previous = index
+            yield index
+
+
+def stream(tasks, accuracy, previous=None, rng=None):
+    """
+    :param tasks: task types, QuizScenario classes.
+    :return: endless iterator of (task index, Question), a question is generated when it is taken.
+    """
+    for index in draws(accuracy, previous, rng):
+        yield index, tasks[index]().generate()
@@ -0,0 +1,141 @@
+import os
+import gc
+import sys
+import random
+import argparse
+import importlib
+import tracemalloc
+
+"""
+Memory audit of a worker process.
+
+The resident memory of a function instance is what it is billed for. The audit imports the skill, plays simulated
+dialogs through "handler.handler" and reports the memory by module:
+    python memory.py --trace                # tracemalloc snapshots after the import, the warm-up and the turns
+    python memory.py -n 12000 --budget 64   # exits with 1 if the steady-state RSS is over 64 MiB
+The steady state is measured after a warm-up of the same number of turns, so the caches are filled and the growth
+between the two measurements is what the requests leave behind. The turns are played at full speed, so the retry
+cache keeps the response of every turn up to its bounds: FULL_TURNS fill it and the test suite checks the RSS of
+the full caches against BUDGET.
+"""
+
+MIB = 1024 * 1024
+DEFAULT_TURNS = 2000
+# Distinct users of the simulated dialogs, their review decks are kept by the process
+DEFAULT_USERS = 100
+# Turns filling the bounded caches and the steady-state RSS budget of a worker with the full caches, in MiB
+FULL_TURNS = 12000
+BUDGET = 64
+
+
+def rss():
+    """
+    :return: resident set size of the process in bytes.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak, not current, where /proc is not available
+        import resource
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def simulate(turns, users=DEFAULT_USERS, first_dialog=0):
+    """
+    Plays the scripted dialogs of "golden.py" through the handler, every dialog as one of the users.
+    :return: number of the dialog after the last played one.
+    """
+    import golden
+    import handler
+    number = first_dialog
+    played = 0
+    while played < turns:
+        random.seed(number)
+        state = {}
+        for message_id, step in enumerate(golden.script(number)):
+            event = golden._event(step, number, message_id, state)
+            event['session']['user'] = {'user_id': 'user-%d' % (number % users)}
+            state = handler.handler(event, None).get('session_state', {})
+            played += 1
+        number += 1
+    return number
+
+
+def _module(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def by_module(snapshot, directory=os.path.dirname(os.path.abspath(__file__))):
+    """
+    :return: dict of module name to (bytes, blocks) allocated by its code. The modules of the skill are named by
+        file, the standard library and the other packages are summed up as "<other>".
+    """
+    modules = {}
+    for stat in snapshot.statistics('filename'):
+        filename = stat.traceback[0].filename
+        # Frozen modules are named "<frozen ...>", they are not files of the skill
+        skill = not filename.startswith('<') and os.path.dirname(os.path.abspath(filename)) == directory
+        name = _module(filename) if skill else '<other>'
+        size, count = modules.get(name, (0, 0))
+        modules[name] = (size + stat.size, count + stat.count)
+    return modules
+
+
+def report(imported, warm, steady, out=sys.stdout, limit=15):
+    """ Prints the memory by module after the import and the warm-up and its growth after the turns """
+    start, before, after = by_module(imported), by_module(warm), by_module(steady)
+    rows = sorted(after.items(), key=lambda row: -row[1][0])
+    print('%-20s %12s %12s %12s %10s' % ('module', 'import KiB', 'warm KiB', 'steady KiB', 'growth KiB'), file=out)
+    for name, (size, _) in rows[:limit]:
+        loaded = start.get(name, (0, 0))[0]
+        warmed = before.get(name, (0, 0))[0]
+        print('%-20s %12.1f %12.1f %12.1f %10.1f' % (name, loaded / 1024, warmed / 1024, size / 1024,
+                                                     (size - warmed) / 1024), file=out)
+
+
+def audit(turns=DEFAULT_TURNS, users=DEFAULT_USERS, trace=False, out=sys.stdout):
+    """
+    :return: (RSS after the import, RSS after the warm-up, RSS after the turns) in bytes.
+    """
+    if trace:
+        tracemalloc.start()
+    # The import is what is measured first, the allocations of the modules at import are in the first snapshot
+    importlib.import_module('handler')
+    loaded = tracemalloc.take_snapshot() if trace else None
+    import offline
+    # Timing-driven degradation would change what the turns do, the simulated users answer at full speed and the
+    # limited turns would be the pre-rendered answer
+    with offline.patched(offline.full_speed()):
+        gc.collect()
+        imported = rss()
+
+        number = simulate(turns, users)
+        gc.collect()
+        warm = rss()
+        # The growth after the warm-up is what every further request leaves behind
+        snapshot = tracemalloc.take_snapshot() if trace else None
+        simulate(turns, users, number)
+        gc.collect()
+        steady = rss()
+        if trace:
+            print('Memory by module after %d turns:' % turns, file=out)
+            report(loaded, snapshot, tracemalloc.take_snapshot(), out)
+            tracemalloc.stop()
+    return imported, warm, steady
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Memory audit of a worker process.')
+    parser.add_argument('-n', '--turns', type=int, default=DEFAULT_TURNS)
+    parser.add_argument('-u', '--users', type=int, default=DEFAULT_USERS)
+    parser.add_argument('--trace', action='store_true', help='report the allocations by module with tracemalloc')
+    parser.add_argument('--budget', type=float, help='steady-state RSS budget in MiB')
+    args = parser.parse_args()
+    imported, warm, steady = audit(args.turns, args.users, args.trace)
+    print('RSS: %.1f MiB after import, %.1f MiB after warm-up, %.1f MiB steady' %
+          (imported / MIB, warm / MIB, steady / MIB))
+    if args.budget is not None and steady > args.budget * MIB:
+        print('Over the budget of %.1f MiB' % args.budget)
+        sys.exit(1)
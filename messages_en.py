@@ -0,0 +1,211 @@
+"""
+English message catalog, see "locales.py".
+
+Noun forms are tuples of the singular and the plural. The question tables and the facts are Russian content, they
+are not translated here.
+"""
+
+NAME = "\"Mental Math Trainer\""
+
+MESSAGES = {
+    'button.repeat': 'Repeat',
+    'button.back': 'Back',
+    'button.results': 'Results',
+
+    'decimal_separator': '.',
+    'noun.seconds': ('second', 'seconds'),
+    'noun.questions': ('question', 'questions'),
+    'noun.questions_gen': ('question', 'questions'),
+
+    'fallback.excuses': ('Sorry. ', 'Excuse me. ', 'My apologies. ', ''),
+    'fallback.incomprehension': ('I did not understand you.', 'Please say it again.',
+                                 'Please try to put it another way.'),
+    'fallback.repeat': ' Say \"Repeat\" and I will repeat.',
+    'fallback.buttons': ('Repeat', 'Start over', 'Help', 'What can you do?'),
+
+    'welcome.reply': (
+        'Welcome to ' + NAME + '. It helps children and students master both basic and advanced arithmetic '
+        'through mental calculation: addition, subtraction, multiplication and more. Say \"Start\" to begin or '
+        '\"What can you do?\" to learn what the skill can do.',
+        'Hi, this is ' + NAME + ', shall we count? Say \"Start\" to begin or \"What can you do?\" to learn what '
+        'the skill can do.',
+        'Hi! You are in ' + NAME + '. Let\'s check your skills! If you want to know what I can do, just ask. If you '
+        'want to stop, say \"Enough\". Are you ready?'),
+    'welcome.help': (
+        'You are in ' + NAME + '! Ask \"What can you do?\" to learn what the skill can do, or say \"Start\" to '
+        'begin the game.',
+        'This is ' + NAME + '. To learn what the skill can do, say \"What can you do\". To go back, just say so. Or '
+        'shall we simply start?'),
+    'welcome.agreements': ('Yes', 'Sure', 'With pleasure'),
+    'welcome.failures': ('No', 'Another time', 'Not now', 'Maybe later'),
+    'welcome.helps': ('What can you do?',),
+    # Task, question number, questions in the round
+    'resume.offer': 'You have an unfinished task from last time: {0}, question {1} of {2}. Shall we go on? Say '
+                    '\"Yes\" to continue or \"No\" to choose a task again.',
+    'resume.continue': 'Let\'s go on from where you stopped. Question {0} of {1}.\n',
+
+    'parting.reply': ('Okay, see you soon!', 'Pity, I wanted to see you in action.', 'Never mind, next time.',
+                      'Never mind. Come back when you are bored.'),
+
+    'help.reply': (
+        NAME + ' offers you calculations to do in your head with simple arithmetic operations and can also tell '
+        'you something interesting. Say \"Start over\" to return to the beginning. You can ask me to repeat the '
+        'last message by saying \"Repeat\". Say \"Stop\" to leave the skill.',
+        'In this skill you calculate without pen and paper. Your goal is to answer all questions using mental '
+        'calculation only. The skill points out your mistakes and rates your skills. Say \"Start over\" to return '
+        'to the beginning. You can ask me to repeat the last message by saying \"Repeat\". Say \"Stop\" to leave '
+        'the skill.'),
+    'help.start': ' Shall we start?',
+    'help.help': ('If you want to go back, just say \"Back\".', 'Now you know what the skill can do, shall we go '
+                  'back?', 'Don\'t worry, you will get it, shall we go back?'),
+    'help.confirms': ('Let\'s start', 'Let\'s go', 'Go ahead'),
+
+    'room.code': 'Say the four-digit code of the class, for example: \"join class 1234\".',
+    'room.not_found': 'The class with code {0} is not found or the teacher has not chosen a task yet. Check the '
+                      'code and try again.',
+
+    'start.options_text': ('1) addition, subtraction',
+                           '2) multiplication, division',
+                           '3) operations with fractions',
+                           '4) exponentiation',
+                           '5) square roots',
+                           '6) trigonometric table values'),
+    'start.options_tts': ('first. addition, subtraction',
+                          'second. multiplication, division',
+                          'third. operations with fractions',
+                          'fourth. exponentiation',
+                          'fifth. square roots',
+                          'sixth. trigonometric table values'),
+    'start.reply': ('What kind of tasks would you like to practice?', 'Choose a kind of task.',
+                    'Which task do you like?'),
+    'start.speed_run': 'Speed run. ',
+    'start.choose': 'Say the number of the task.',
+    'start.help': ('Now choose one of the kinds of tasks. Say \"Repeat\" to hear the options again or just choose '
+                   'a task.',
+                   'The skill has 6 kinds of tasks, choose one of them. Say \"Repeat\" to hear the options.'),
+    'start.speed_run_button': 'Speed run',
+    'start.review_button': 'Review mistakes',
+    'start.marathon_button': 'Marathon',
+
+    # Seconds for an answer
+    'marathon.intro': 'Marathon: tasks of all kinds mixed until you say \"Back\". The tasks you get wrong will come '
+                      'up more often. You have {0} {1} for each answer. Good luck!\n',
+    # Score, correct answers in a row
+    'marathon.score': 'Score {0}, correct answers in a row: {1}.\n',
+    # Correct answers, questions, score
+    'marathon.help': 'This is a marathon: questions of all kinds come one after another without end. You answered '
+                     '{0} of {1} {2} correctly, your score is {3}. Say \"Back\" to finish. Let\'s go on.\n',
+
+    'quiz.correct': ('Correct.\n', 'Your answer is right.\n', 'Bravo, you are right!\n',
+                     'Congratulations, that is the right answer!\n'),
+    'quiz.incorrect': ('The right answer is {0}.\n', 'Your answer is wrong, the right answer is {0}.\n',
+                       'Unfortunately that is wrong, the answer was {0}.\n'),
+    'quiz.late': ('Time is up, I cannot count this answer.\n', 'The answer is right, but you ran out of time.\n',
+                  'Right, but too slow, try to answer faster.\n'),
+    'quiz.intro': 'You will get {0} {1}, one by one. You have {2} {3} for each of them. {4}Good luck!\n',
+    'quiz.help': 'You asked for help during the task, you cannot continue it.',
+    'quiz.help_intro': ' You get {0} {1}, one by one. You have {2} {3} for each of them. Don\'t hurry, you have '
+                       'enough time.',
+    'quiz.help_no_points': ' You have not answered any question correctly. ',
+    'quiz.help_points': ' You answered {0} of {1} {2} correctly, the answer to the example is {3}.',
+    'quiz.help_back': ' Going back.',
+
+    'AdditionSubtraction.description': 'timed addition and subtraction examples',
+    'AdditionSubtraction.help_tips': (
+        'To add numbers with different signs, subtract the smaller absolute value from the larger one and give the '
+        'result the sign of the number with the larger absolute value.',),
+    'AdditionSubtraction.addition': ('what is {0} plus {1}', 'solve {0} plus {1}', '{0} plus {1} is'),
+    'AdditionSubtraction.subtraction': ('what is {0} minus {1}', 'solve {0} minus {1}', '{0} minus {1} is'),
+
+    'MultiplicationDivision.description': 'timed multiplication and division examples',
+    'MultiplicationDivision.help_tips': (
+        'Try to split numbers into sums or differences of round numbers: multiplying by 10, 20, 100 or 1000 is '
+        'faster.',),
+    'MultiplicationDivision.multiplication': ('what is {0} times {1}', 'solve {0} times {1}', '{0} times {1} is'),
+    'MultiplicationDivision.division': ('what is {0} divided by {1}', 'solve {0} divided by {1}',
+                                        '{0} divided by {1} is'),
+
+    'Fractions.description': 'timed examples with addition, subtraction, multiplication and division of fractions',
+    'Fractions.help_tips': ('To add two fractions, bring them to a common denominator first.',
+                            'To subtract a fraction, bring both fractions to a common denominator first.',
+                            'To multiply two fractions, multiply their numerators and their denominators.',
+                            'To divide by a fraction, multiply by its reciprocal.'),
+    'Fractions.addition': ('what is {0} plus {1}', 'solve {0} plus {1}', '{0} plus {1} is'),
+    'Fractions.subtraction': ('what is {0} minus {1}', 'solve {0} minus {1}', '{0} minus {1} is'),
+    'Fractions.multiplication': ('what is {0} times {1}', 'solve {0} times {1}', '{0} times {1} is'),
+    'Fractions.division': ('what is {0} divided by {1}', 'solve {0} divided by {1}', '{0} divided by {1} is'),
+
+    'Exponentiation.description': 'timed exponentiation examples',
+    'Exponentiation.help_tips': ('Focus on the solution and don\'t worry, nobody but you sees the results.',),
+    'Exponentiation.variants': ('what is {0} to the power of {1}', 'solve {0} to the power of {1}',
+                                '{0} to the power of {1} is'),
+
+    'SquareRoot.description': 'timed square root examples',
+    'SquareRoot.help_tips': ('The square root of a non-negative number a is the non-negative number whose square '
+                             'is a.',),
+    'SquareRoot.variants': ('what is the square root of {0}', 'the square root of {0} is'),
+
+    'Trigonometry.description': 'questions about table values of trigonometric functions',
+    'Trigonometry.rules': 'Give angles in degrees. ',
+    'Trigonometry.help_tips': ('These values are best memorized on the unit circle.',),
+    'Trigonometry.prompts': ('so your answer is?', 'the answer is?', 'your answer?', 'answer now'),
+    # Names of the functions in the order of "trigonometry.FUNCTIONS"
+    'Trigonometry.names': ('sine', 'cosine', 'tangent', 'cotangent'),
+    # Function, angle
+    'Trigonometry.value_question': 'what is the {0} of {1}',
+    # Function, value
+    'Trigonometry.angle_question': 'the {0} of which angle is {1}',
+    # Angle of a question in degrees or in radians
+    'Trigonometry.angle': '{0}',
+    'Trigonometry.pi': 'pi',
+    'Trigonometry.pi_times': '{0} pi',
+    'Trigonometry.pi_over': '{0} over {1}',
+    # Value of a question about the angle: a fraction, √a, 1/√a or √a/b
+    'Trigonometry.minus': 'minus ',
+    'Trigonometry.rational': '{0}',
+    'Trigonometry.root': 'the square root of {0}',
+    'Trigonometry.reciprocal_root': 'one over the square root of {0}',
+    'Trigonometry.root_fraction': 'the square root of {0} over {1}',
+
+    'results.rank': 'You are number {0} of {1} in the class. ',
+    'results.average_time': ', the average answer time is {0} seconds',
+    'results.facts': ('I know some interesting facts and can tell you one. ', 'Want to learn something new? '),
+    'results.play_again': ('Or do you want to play again? ', 'Or shall we play once more? ',
+                           'There are other modes too. Want to try? '),
+    'results.help': ('If you want to play again, just say so and we go back to the choice of the task. Say '
+                     '\"Facts\" and I will tell you an interesting fact. If you need to go, say \"Finish\"',),
+    'results.buttons': ('Play again', 'Tell me interesting facts', 'Finish'),
+
+    'congratulations.delights': ('Wow! ', 'A born mathematician! ', 'You are brilliant! ', ''),
+    'congratulations.reply': 'You answered all questions correctly, that is a solid \"A\". Your score: {0}. ',
+
+    'end.delights': ('Nobody is perfect! ', 'There are some mistakes, but it\'s fine. ',
+                     'Mistakes make us stronger. ', ''),
+    'end.reply': 'You answered {0} {1} of {2} correctly, your mark is \"{3}\". Your score: {4}{5}. ',
+
+    'teacher.closed': 'This class is closed. Say \"Back\" to choose a task.',
+    'teacher.created': 'The class is created, its code is {0}. Say the number of the task for the class.',
+    'teacher.ready': 'Students can join by saying \"Class {0}\". Say \"Results\" to hear the results.',
+    'teacher.help': 'You are running a class. Choose a task first, then tell the students the code of the class. '
+                    'Say \"Results\" to hear their results and \"Back\" to close the class.',
+
+    'leaderboard.empty': 'There are no results in class {0} yet.',
+    'leaderboard.title': 'Results of class {0}, participants: {1}.\n',
+    'leaderboard.line': '{0}) participant {1}: {2}',
+
+    'review.start': 'Let\'s review the questions you got wrong.\n',
+    'review.empty': 'There is nothing to review now. Say \"Back\" to choose a task.',
+    'review.help': 'Here you review the questions you got wrong. The more often you answer correctly, the less '
+                   'often the question comes back. Say \"Back\" to choose a task.',
+
+    'fact.again': (' Shall we play again?', ' One more round?', ' I want to see you in action again.'),
+    'fact.source': 'SOURCE',
+    'fact.title': 'Interesting fact',
+    'fact.help': 'You just heard a fact. If you want to solve more examples, say \"Once more\", and if you want '
+                 'to finish, just say so.',
+    'fact.buttons': ('Play again', 'Stop'),
+
+    # Pre-rendered answers of the shed and the rate-limited requests, see "load_shedding.py" and "rate_limit.py"
+    'shed.reply': 'I am a little busy right now. Let\'s come back to it a bit later and go on for now.',
+    'limited.reply': 'You are talking faster than I can count. Let\'s take a short pause and go on.',
+}
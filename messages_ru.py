@@ -0,0 +1,269 @@
+"""
+Russian message catalog, see "locales.py".
+
+A message is a string or a tuple of variants one of which is chosen at random. Noun forms are tuples of three forms
+agreeing with 1, 2 and 5.
+"""
+
+NAME = "\"Математический мозговой тренажёр\""
+_REPEAT = ' Скажите \"Повтори\", чтобы я повторила.'
+
+MESSAGES = {
+    'button.repeat': 'Повторить',
+    'button.back': 'Назад',
+    'button.results': 'Результаты',
+
+    'decimal_separator': ',',
+    'noun.seconds': ('секунда', 'секунды', 'секунд'),
+    'noun.questions': ('вопрос', 'вопроса', 'вопросов'),
+    'noun.questions_gen': ('вопроса', 'вопросов', 'вопросов'),
+
+    'fallback.excuses': ('Прошу прощения. ', 'Простите меня. ', 'Приношу свои извинения. ', 'Извините. ', ''),
+    'fallback.incomprehension': ('Я вас не поняла.', 'Пожалуйста повторите еще раз.',
+                                 'Пожалуйста, попробуйте переформулировать запрос.'),
+    'fallback.repeat': _REPEAT,
+    'fallback.buttons': ('Повтори', 'В самое начало', 'Помощь', 'Что умеет навык?'),
+
+    'welcome.reply': (
+        'Добро пожаловать в навык ' + NAME + '. Данный навык поможет детям и'
+        ' школьникам разобраться как в базовых, так и в углублённых арифметических действиях, используя '
+        'устный счёт. Например, сложение, вычитание, умножение и так далее. Скажите \"Начнем\", чтобы '
+        'начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
+        'Привет, это навык ' + NAME + ' давай посчитаем? Скажите \"Начнем\", чтобы '
+        'начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
+        'Приветствую тебя, данный навык поможет детям и школьникам разобраться как в базовых, так и в '
+        'углублённых арифметических действиях, используя устный счёт. Например, сложение, вычитание, '
+        'умножение и так далее, займемся устным счетом? Скажите \"Начнем\", чтобы начать или \"Что ты '
+        'умеешь?\", чтобы узнать, что умеет навык.',
+        'Добро пожаловать в навык ' + NAME + ', посчитаем? Скажите \"Начнем\", '
+        'чтобы начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
+        'Привет! Вы зашли в навык ' + NAME + '. Давайте оценим твои умения! Если вы'
+        ' хотите узнать, что я умею, так и скажите. Если вы хотите остановить навык, скажите \"Хватит\". '
+        'Вы готовы?'),
+    'welcome.help': (
+        'Вы оказались в навыке ' + NAME + '! Вы можете узнать, что умеет этот навык'
+        ', сказав \"Что умеет этот навык?\". Или начать игру, сказав \"Начнем\"',
+        'Это навык ' + NAME + '. Чтобы узнать, что умеет навык, нужно сказать \"Что'
+        ' ты умеешь\". Чтобы вернуться назад, так и скажите. Или может просто начнем?'),
+    'welcome.agreements': ('Да', 'Давай', 'С радостью'),
+    'welcome.failures': ('Нет', 'В другой раз', 'Не сейчас', 'Как-нибудь потом'),
+    'welcome.helps': ('Что умеет этот навык?',),
+    # Task, question number, questions in the round
+    'resume.offer': 'С прошлого раза у вас осталось незаконченное задание: {0}, вопрос {1} из {2}. Продолжим его? '
+                    'Скажите \"Да\", чтобы продолжить, или \"Нет\", чтобы выбрать задание заново.',
+    'resume.continue': 'Продолжаем с того места, где вы остановились. Вопрос {0} из {1}.\n',
+
+    'parting.reply': ('Хорошо, до новых встреч!', 'Жаль, а так хотелось посмотреть вас в деле.',
+                      'Ну ничего в следующий раз.', 'Ну ничего. Будет скучно - обращайтесь.'),
+
+    'help.reply': (
+        'Навык ' + NAME + ' представляет из себя программу, которая  предлагает'
+        ' выполнить расчёты в уме, используя простейшие арифметические действия, также может рассказать'
+        ' что-нибудь интересное и увлекательное. Скажите \"В начало\", чтобы вернуться в начало навыка.'
+        ' Вы можете попросить повторить последнее сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для'
+        ' того, чтобы покинуть навык.',
+        '' + NAME + ' - полезный и увлекательный навык, который в игровой форме'
+        ' поможет разобраться с умением счёта в уме. Навык предложит решить вам задания, укажет на ваши'
+        ' ошибки и оценит ваши умения. Скажите \"В начало\", чтобы вернуться в начало навыка. Вы можете'
+        ' попросить повторить последнее сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для того,'
+        ' чтобы покинуть навык.',
+        'В жтом навыке вы будете выполнять расчёты без ручки и бумаги. Ваша цель ответить на все вопросы'
+        ' используя только устный счёт. А еще навык укажет на ваши ошибки и оценит ваши умения. Скажите '
+        '\"В начало\", чтобы вернуться в начало навыка. Вы можете попросить повторить последнее сообщение, '
+        'сказав \"Повтори\". Команда \"Стоп\" нужна для того, чтобы покинуть навык.',
+        'Этот навык нацелен на работу с простейшими арифметическими действиями: сложение, вычитание, '
+        'умножение, деление, операции с дробями, возведение в степень, вычисление квадратного корня, '
+        'тригонометрические табличные значения. Также навык укажет на ваши ошибки и оценит ваши умения. '
+        'Скажите \"В начало\", чтобы вернуться в начало навыка. Вы можете попросить повторить последнее '
+        'сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для того, чтобы покинуть навык. Не '
+        'волнуйтесь, по ходу действий вы всё поймёте.'),
+    'help.start': ' Начнём?',
+    'help.help': ('Если вы хотите вернуться назад, просто скажите \"Назад\".',
+                  'Вы узнали, что умеет навык, хотите вернуться назад?',
+                  'Не переживайте, вы все поймете, вернемся назад?'),
+    'help.confirms': ('Давай начнём', 'Погнали', 'Поехали', 'Вперед'),
+
+    'room.code': 'Назовите код класса из четырёх цифр, например: \"класс 1234\".',
+    'room.not_found': 'Класс с кодом {0} не найден или учитель ещё не выбрал задание. Проверьте код и попробуйте '
+                      'ещё раз.',
+
+    'start.options_text': ('1) сложение, вычитание',
+                           '2) умножение, деление',
+                           '3) операции с дробями',
+                           '4) возведение в степень',
+                           '5) вычисление квадратного корня',
+                           '6) тригонометрические табличные значения'),
+    'start.options_tts': ('первое. сложение, вычитание',
+                          'второе. умножение, деление',
+                          'третье. операции с дробями',
+                          'четвертое. возведение в степень',
+                          'пятое. вычисление квадратного корня',
+                          'шестое. тригонометрические табличные значения'),
+    'start.reply': ('С каким типом заданий вы бы хотели поработать?', 'Выберите тип задания.',
+                    'Какое задание вам по душе?'),
+    'start.speed_run': 'Режим на скорость. ',
+    'start.choose': 'Назовите номер, выбранного задания.',
+    'start.help': ('Сейчас вам нужно выбрать один из типов заданий, которые вы хотите пройти. Если хотите еще раз'
+                   ' ознакомиться со списком вариантов скажите \"Повторить\" или просто выберите задание.',
+                   'Навык содержит 6 типов заданий, ваша задача выбрать один из типов. Чтобы услышать варианты '
+                   'выбора, скажите \"Повторить\".'),
+    'start.speed_run_button': 'На скорость',
+    'start.review_button': 'Повторить ошибки',
+    'start.marathon_button': 'Марафон',
+
+    # Seconds for an answer
+    'marathon.intro': 'Марафон: задания всех типов вперемешку, пока вы не скажете \"Назад\". Задания, в которых вы '
+                      'ошибаетесь, будут попадаться чаще. На каждый ответ у вас есть {0} {1}. Удачи!\n',
+    # Score, correct answers in a row
+    'marathon.score': 'Счёт {0}, правильных ответов подряд: {1}.\n',
+    # Correct answers, questions, score
+    'marathon.help': 'Это марафон: вопросы всех типов идут один за другим без конца. Вы верно ответили на {0} из {1} '
+                     '{2}, ваш счёт {3}. Чтобы закончить, скажите \"Назад\". Продолжаем.\n',
+
+    'quiz.correct': ('Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
+                     'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n'),
+    'quiz.incorrect': ('Верный ответ: {0}.\n', 'Ваш ответ неверный, правильный ответ: {0}.\n',
+                       'Увы, вы ответили неправильно, ответом было {0}\n', 'Вы дали неверный ответ, верным был {0}\n',
+                       'Этот ответ был неправильный. Верный ответ: {0}\n'),
+    'quiz.late': ('Время вышло, этот ответ я засчитать не могу.\n', 'Ответ верный, но вы не уложились во время.\n',
+                  'Правильно, но слишком долго, постарайтесь отвечать быстрее.\n'),
+    # Number of questions, description of the task, seconds for an answer, rules of the task
+    'quiz.intro': 'Вам поочерёдно представятся {0} {1}. На каждый из них у вас есть {2} {3}. {4}Удачи!\n',
+    'quiz.help': 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.',
+    'quiz.help_intro': ' Вам поочерёдно представляются {0} {1}. На каждый из них у вас есть {2} {3}. Главное не '
+                       'торопитесь, времени у вас достаточно.',
+    'quiz.help_no_points': ' Вы не смогли дать правильного ответа ни на один из вопросов. ',
+    'quiz.help_points': ' Вы верно ответили на {0} из {1} {2}, правильный ответ на пример {3}.',
+    'quiz.help_back': ' Возвращаемся назад.',
+
+    'AdditionSubtraction.description': 'примеров, содержащих операции сложения и вычитания, для решения на время',
+    'AdditionSubtraction.help_tips': (
+        'Чтобы сложить числа с разными знаками, нужно из большего модуля вычесть меньший модуль, и перед '
+        'полученным ответом поставить знак того числа, модуль которого больше. Чтобы из меньшего числа вычесть '
+        'большее, нужно из большего числа вычесть меньшее и перед полученным ответом поставить минус.',),
+    'AdditionSubtraction.addition': ('сколько будет {0} плюс {1}', 'реши {0} плюс {1}', 'сумма {0:gen} и {1:gen} равна',
+                                     '{0} плюс {1} б+уудет', '{0} плюс {1} равн+оо'),
+    'AdditionSubtraction.subtraction': ('сколько будет {0} минус {1}', 'реши {0} минус {1}',
+                                        'разница {0:gen} и {1:gen} равна', '{0} минус {1} б+уудет',
+                                        '{0} минус {1} равн+оо'),
+
+    'MultiplicationDivision.description': 'примеров, содержащих операции умножения и деления, для решения на время',
+    'MultiplicationDivision.help_tips': (
+        'Попробуйте представлять числа в виде суммы или разности чисел, одно или несколько из которых '
+        '\"круглое\". На 10, 20, 100, 1000 и другие круглые числа умножать быстрее, в уме нужно сводить всё к '
+        'таким простым операциям.',),
+    'MultiplicationDivision.multiplication': ('сколько будет {0} умножить на {1:acc}', 'реши {0} умножить на {1:acc}',
+                                              'произведение {0:gen} и {1:gen} равно', '{0} умножить на {1:acc} б+уудет',
+                                              '{0} умноженное на {1:acc} равн+оо'),
+    'MultiplicationDivision.division': ('сколько будет {0} делить на {1:acc}', 'реши {0} делить на {1:acc}',
+                                        'частное {0:gen} и {1:gen} равно', '{0} делить на {1:acc} б+уудет',
+                                        '{0} деленное на {1:acc} равн+оо'),
+
+    'Fractions.description': 'примеров, содержащих операции сложения, вычитания, умножения и деления над дробями, '
+                             'для решения на время',
+    'Fractions.help_tips': ('Для того, чтобы сложить две дроби, нужно сначала привести их к общему знаменателю, а '
+                            'затем выполнить сложение.',
+                            'Для того, чтобы из одной дроби вычесть другую, нужно сначала привести их к общему '
+                            'знаменателю, а затем выполнить вычитание.',
+                            'Для того, чтобы перемножить две дроби, нужно перемножить соответственно их числители и '
+                            'знаменатели.',
+                            'Для того, чтобы одну дробь разделить на другую, нужно делимое умножить на дробь, '
+                            'обратную делителю.'),
+    'Fractions.addition': ('сколько будет {0} плюс {1}', 'реши {0} плюс {1}', 'сумма двух дробей {0} и {1} равна',
+                           '{0} плюс {1} б+уудет', '{0} плюс {1} равн+оо'),
+    'Fractions.subtraction': ('сколько будет {0} минус {1}', 'реши {0} минус {1}',
+                              'разница двух дробей {0} и {1} равна', '{0} минус {1} б+уудет', '{0} минус {1} равн+оо'),
+    'Fractions.multiplication': ('сколько будет {0} умножить на {1:acc}', 'реши {0} умножить на {1:acc}',
+                                 'произведение двух дробей {0} и {1} равно', '{0} умножить на {1:acc} б+уудет',
+                                 '{0} умножить на {1:acc} равн+оо'),
+    'Fractions.division': ('сколько будет {0} разделить на {1:acc}', 'реши {0} делить на {1:acc}',
+                           'частное двух дробей {0} и {1} равно', '{0} разделить на {1:acc} б+уудет',
+                           '{0} делить на {1:acc} равн+оо'),
+
+    'Exponentiation.description': 'примеров, содержащих операцию возведения в степень, для решения на время',
+    'Exponentiation.help_tips': ('Сосредоточьтесь на решении и не переживайте, результаты, кроме вас, никто не '
+                                 'увидит. Наша цель научиться.',),
+    'Exponentiation.variants': ('сколько будет {0} в степени {1}', 'реши {0} в степени {1}',
+                                '{0} в степени {1} б+уудет', '{0} в степени {1} равн+оо'),
+
+    'SquareRoot.description': 'примеров, где вам нужно найти квадратный корень, для решения на время',
+    'SquareRoot.help_tips': ('Арифметическим квадратным корнем из неотрицательного числа a называется такое '
+                             'неотрицательное число, квадрат которого равен a.',),
+    'SquareRoot.variants': ('чему равен квадратный корень из {0:gen}', 'посчитай квадратный корень из {0:gen}',
+                            'квадратный корень из {0:gen} равен', 'квадратный корень из {0:gen} б+уудет'),
+
+    'Trigonometry.description': 'вопросов о табличных тригонометрических значениях',
+    'Trigonometry.rules': 'Вы должны дать значение угла в градусах. ',
+    'Trigonometry.help_tips': ('Эти значения нужно выучить, а лучше всего запоминать тригонометрические значения, '
+                               'запоминая их на единичной окружности',),
+    'Trigonometry.prompts': ('и так ваш ответ?', 'ответом будет?', 'пол+учится?', 'ваш ответ?', 'отвечайте',
+                             'пришло время ответа'),
+    # Names of the functions in the order of "trigonometry.FUNCTIONS"
+    'Trigonometry.names': ('синус', 'косинус', 'тангенс', 'котангенс'),
+    # Function, angle
+    'Trigonometry.value_question': 'чему равен {0} {1}',
+    # Function, value
+    'Trigonometry.angle_question': '{0} какого угла равен {1}',
+    # Angle of a question in degrees or in radians
+    'Trigonometry.angle': '{0:gen}',
+    'Trigonometry.pi': 'пи',
+    'Trigonometry.pi_times': '{0:gen} пи',
+    'Trigonometry.pi_over': '{0} на {1}',
+    # Value of a question about the angle: a fraction, √a, 1/√a or √a/b
+    'Trigonometry.minus': 'минус ',
+    'Trigonometry.rational': '{0:dat}',
+    'Trigonometry.root': 'корню из {0:gen}',
+    'Trigonometry.reciprocal_root': 'единице делённой на корень из {0:gen}',
+    'Trigonometry.root_fraction': 'корню из {0:gen} делённому на {1:acc}',
+
+    'results.rank': 'Ты на {0} месте из {1} в классе. ',
+    'results.average_time': ', среднее время ответа {0} секунды',
+    'results.facts': ('Я знаю несколько интересных фактов, могу рассказать. ',
+                      'Могу поделиться с тобой сногшибательными фактами. ',
+                      'Я могу рассказать тебе то, чего ты, наверное, не знаешь. ', 'Хочешь узнать что-то новое? '),
+    'results.play_again': ('Или хочешь сыграть еще раз? ', 'Или я бы посмотрела еще раз на тебя в действии, повторим? ',
+                           'Если не хочешь, у меня есть еще режимы, кроме этого. Попробуешь? ', 'Или повторим? ',
+                           'Или же давай заново сыграем? '),
+    'results.help': ('Если хотите сыграть заново, так и скажите, тогда мы вернемся на выбор типа задания. Если '
+                     'скажете \"Факты\", я расскажу вам интересеные факты. А если вам нужно бежать, скажите '
+                     '\"Закончить\"',
+                     'Если вам понравилось и вы хотите еще скажите \"Заново\". Я могу рассказать факт, который '
+                     'удивит вас, только скажите'),
+    'results.buttons': ('Сыграть заново', 'Расскажи интересные факты', 'Закончить'),
+
+    'congratulations.delights': ('Вот это да! ', 'Ух ты! ', 'Да я вижу здесь прирожденного математика! ',
+                                 'Умные люди всегда привлекательны! ', 'Вы на высоте! ', 'Ваши умения поражают! ', ''),
+    'congratulations.reply': 'На все вопросы ты ответил верно, у тебя твердая \"5\". Твой счёт: {0}. ',
+
+    'end.delights': ('Никто не идеален! ', 'У тебя есть несколько ошибок, но ничего срашного. ',
+                     'Главное не опускать руки и все получится! ', 'Ошибки делают нас сильнее ', ''),
+    # Correct answers, the noun agreeing with them, questions in the round, mark, score, average time
+    'end.reply': 'Ты ответил верно на {0} {1} из {2}, твоя оценка \"{3}\". Твой счёт: {4}{5}. ',
+
+    'teacher.closed': 'Этот класс уже закрыт. Скажите \"Назад\", чтобы вернуться к выбору задания.',
+    'teacher.created': 'Класс создан, его код {0}. Назовите номер задания для класса.',
+    'teacher.ready': 'Ученики могут присоединиться, сказав \"Класс {0}\". Чтобы узнать результаты, скажите '
+                     '\"Результаты\".',
+    'teacher.help': 'Вы ведёте класс. Сначала выберите задание, потом скажите ученикам код класса. Результаты '
+                    'учеников можно узнать, сказав \"Результаты\". Чтобы закрыть класс, скажите \"Назад\".',
+
+    'leaderboard.empty': 'В классе {0} пока нет результатов.',
+    'leaderboard.title': 'Результаты класса {0}, участников: {1}.\n',
+    'leaderboard.line': '{0}) участник {1}: {2}',
+
+    'review.start': 'Повторим вопросы, в которых вы ошиблись.\n',
+    'review.empty': 'Сейчас повторять нечего. Скажите \"Назад\", чтобы выбрать задание.',
+    'review.help': 'Здесь повторяются вопросы, в которых вы ошиблись. Чем чаще вы отвечаете верно, тем реже вопрос '
+                   'будет повторяться. Чтобы вернуться к выбору задания, скажите \"Назад\".',
+
+    'fact.again': (' Сыграем еще раз?', ' Еще разок сыграем?', ' Я хочу еще увидеть вас в действии.'),
+    'fact.source': 'ИСТОЧНИК',
+    'fact.title': 'Интересный факт',
+    'fact.help': 'Сейчас вы услышали факт, если хотите еще порешать примеры, скажите \"Еще раз\", а если хотите'
+                 ' закончить, так и скажите.',
+    'fact.buttons': ('Сыграть еще раз', 'Стоп'),
+
+    # Pre-rendered answers of the shed and the rate-limited requests, see "load_shedding.py" and "rate_limit.py"
+    'shed.reply': 'Сейчас я немного занята. Давайте вернёмся к этому чуть позже, а пока продолжим.',
+    'limited.reply': 'Вы говорите быстрее, чем я успеваю считать. Давайте сделаем небольшую паузу и продолжим.',
+}
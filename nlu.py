@@ -0,0 +1,232 @@
+import re
+import sys
+import timeit
+
+from equivalence import read_number
+
+"""
+Offline stand-in for the NLU of Yandex Dialogs.
+
+The platform recognizes the intents of the skill with the grammars set up in the Dialogs console and sends them in
+"request.nlu". The grammars are repeated here, so an utterance gets the same "nlu" without the platform:
+    understand('давай начнём')     # {'tokens': [...], 'entities': [...], 'intents': {'start_confirm': {...}}}
+    request('повтори вариант 3')   # the "request" of an event
+Tokens are normalized as the platform does it: lower case without punctuation, numbers in digits. The numbers are
+YANDEX.NUMBER entities and the slots of the intents have the token span of their value.
+
+A grammar is a list of patterns over the tokens: words, "(a|b c)" alternatives, "?" after an optional word or group,
+"..." for any words and "$Slot" for a number. The patterns of an intent are compiled once into one regular
+expression matched against the tokens joined with spaces. An index of the words of the grammars leaves out the
+grammars having a word of the utterance out of their vocabulary, most utterances are matched against one or two
+regular expressions instead of all of them.
+"""
+
+# Intents of the skill and the built-in intents the skill uses, the button titles of both catalogs are covered
+GRAMMARS = {
+    'YANDEX.CONFIRM': ['да', 'давай', 'ага', 'конечно', 'хорошо', 'с радостью', 'yes', 'sure'],
+    'YANDEX.REJECT': ['нет', 'не (надо|хочу|сейчас)', 'в другой раз', 'как нибудь потом', 'no', 'not now'],
+    'YANDEX.HELP': ['помощь', 'помоги', 'подскажи', 'help'],
+    'YANDEX.REPEAT': ['повтори', 'повторить', 'еще раз повтори', 'repeat'],
+    'say_again': ['скажи еще раз', 'не (расслышал|расслышала|понял|поняла)'],
+    'help': ['что (ты|этот навык|навык) умеешь?', 'что умеет (этот)? навык', 'что ты можешь',
+             'what can you do'],
+    'start_confirm': ['давай (начнем|играть)', 'погнали', 'поехали', 'вперед', 'начинаем', 'начать',
+                      'сыграть (заново|еще раз)', 'еще раз', 'играть', "let's (start|go)", 'go ahead', 'play again'],
+    'start_reject': ['закончить', 'стоп', 'хватит', 'выход', 'выйти', 'finish', 'stop'],
+    'back': ['назад', 'вернись', 'вернуться', 'back'],
+    'to_start': ['в (самое)? начало', 'с начала', 'start over'],
+    'interesting_facts': ['(расскажи|давай)? (интересный|интересные)? (факт|факты)', 'еще факт',
+                          'tell me interesting facts'],
+    'leaderboard': ['результаты', 'таблица лидеров', 'results'],
+    'review': ['повторить ошибки', 'повторение ошибок', 'работа над ошибками', 'review mistakes'],
+    'speed_run': ['на скорость', 'режим на скорость', 'speed run'],
+    'marathon': ['(режим)? марафон', 'marathon'],
+    'create_room': ['(создай|создать) (класс|комнату)', 'create (a)? class'],
+    'join_room': ['(войти|зайти|вступить) в (класс|комнату) $Code', '(класс|комната) $Code', 'join class $Code'],
+    'repeat_variant': ['повтори (вариант|задание)? (номер)? $Variant', '(какой|какое) (вариант|задание)? $Variant'],
+    'addition_subtraction': ['$Number? сложение (и|,)? вычитание?', 'вычитание', 'addition (and)? subtraction?'],
+    'multiplication_division': ['$Number? умножение (и|,)? деление?', 'деление',
+                                'multiplication (and)? division?'],
+    'fractions': ['$Number? (операции с)? дробями', 'дроби', 'fractions'],
+    'exponentiation': ['$Number? возведение в степень', 'степени', 'exponentiation'],
+    'square_root': ['$Number? (вычисление)? квадратного корня', '(квадратный)? корень', 'square roots?'],
+    'trigonometry': ['$Number? тригонометрические табличные значения', 'тригонометрия', 'trigonometry'],
+    'answer': ['(ответ|это|будет|равно)? $Answer (градусов|градуса|градус)?', '$Answer (на|/)? $Denominator'],
+}
+
+_WORD = re.compile(r'-?\d+(?:[.,]\d+)?|[^\W_]+(?:\'[^\W_]+)?')
+_PATTERN = re.compile(r'\(|\)|\||\?|\.\.\.|\$\w+|[^\s()|?]+')
+_MINUS = frozenset(('минус', 'minus'))
+# A number slot and an entity are one token after the normalization
+_NUMBER = r'-?\d+(?:\.\d+)? '
+
+
+def tokenize(utterance):
+    """
+    :return: tokens of the utterance: lower case, "ё" as "е", numbers in words merged into one token with digits.
+    """
+    words = _WORD.findall(utterance.lower().replace('ё', 'е'))
+    tokens = []
+    i = 0
+    while i < len(words):
+        negative = words[i] in _MINUS and i + 1 < len(words)
+        parsed = read_number(words, i + 1 if negative else i)
+        if parsed is None:
+            tokens.append(words[i])
+            i += 1
+            continue
+        value, i = parsed
+        if negative:
+            value = -value
+        tokens.append(str(value.numerator) if value.denominator == 1 else str(float(value)))
+    return tokens
+
+
+def pattern_tokens(pattern):
+    """
+    :return: words, groups, "?", "..." and slots of the pattern.
+    """
+    return _PATTERN.findall(pattern)
+
+
+def compile_pattern(pattern):
+    """
+    :return: regular expression of the pattern, it matches the tokens joined with spaces and a trailing space.
+    """
+    parts = []
+    for token in _PATTERN.findall(pattern):
+        if token in ('(', '|'):
+            parts.append('(?:' if token == '(' else '|')
+        elif token in (')', '?'):
+            parts.append(token)
+        elif token == '...':
+            parts.append(r'(?:\S+ )*?')
+        elif token[0] == '$':
+            parts.append('(?P<%s>%s)' % (token[1:], _NUMBER))
+        else:
+            # A word of several tokens, e.g. "let's", is matched as the tokenizer splits it
+            parts.append(''.join(re.escape(word) + ' ' for word in tokenize(token)))
+    return ''.join(parts)
+
+
+class Grammar:
+    """ Compiled grammar of an intent """
+    __slots__ = ('intent', 'regex', 'slots', 'words', 'filler')
+
+    def __init__(self, intent, patterns):
+        self.intent = intent
+        # Vocabulary of the grammar, numbers are "$"
+        self.words = set()
+        self.filler = False
+        # The named groups of the alternatives are renamed apart, a regular expression can not repeat a name
+        alternatives = []
+        self.slots = []
+        for number, pattern in enumerate(patterns):
+            for token in _PATTERN.findall(pattern):
+                if token == '...':
+                    self.filler = True
+                elif token[0] == '$':
+                    self.words.add('$')
+                elif token not in ('(', ')', '|', '?'):
+                    self.words.update(tokenize(token))
+            regex = compile_pattern(pattern)
+            for name in re.findall(r'\(\?P<(\w+)>', regex):
+                group = '%s_%d' % (name, number)
+                regex = regex.replace('(?P<%s>' % name, '(?P<%s>' % group, 1)
+                self.slots.append((group, name))
+            alternatives.append(regex)
+        self.regex = re.compile('(?:' + '|'.join(alternatives) + ')')
+
+    def match(self, text):
+        """
+        :param text: tokens joined with spaces and a trailing space.
+        :return: the intent with its slots or None.
+        """
+        match = self.regex.fullmatch(text)
+        if match is None:
+            return None
+        slots = {}
+        for group, name in self.slots:
+            start = match.start(group)
+            if start < 0:
+                continue
+            value = match.group(group)[:-1]
+            first = text.count(' ', 0, start)
+            slots[name] = {'type': 'YANDEX.NUMBER', 'value': _number(value),
+                           'tokens': {'start': first, 'end': first + 1}}
+        return {'slots': slots}
+
+
+def _number(token):
+    return float(token) if '.' in token else int(token)
+
+
+def _index(grammars):
+    """
+    :return: (dict of a word to the bit mask of the grammars having it, mask of the grammars taking any word).
+    """
+    index = {}
+    filler = 0
+    for i, grammar in enumerate(grammars):
+        for word in grammar.words:
+            index[word] = index.get(word, 0) | 1 << i
+        if grammar.filler:
+            filler |= 1 << i
+    return index, filler
+
+
+_GRAMMARS = [Grammar(intent, patterns) for intent, patterns in GRAMMARS.items()]
+_INDEX, _FILLER = _index(_GRAMMARS)
+_ALL = (1 << len(_GRAMMARS)) - 1
+
+
+def understand(utterance):
+    """
+    :return: the "nlu" of the utterance, see "request.nlu" of the event in "handler.py".
+    """
+    tokens = tokenize(utterance)
+    entities = [{'type': 'YANDEX.NUMBER', 'value': _number(token), 'tokens': {'start': i, 'end': i + 1}}
+                for i, token in enumerate(tokens) if token[-1].isdigit()]
+    intents = {}
+    candidates = _ALL if tokens else 0
+    for token in tokens:
+        candidates &= _INDEX.get('$' if token[-1].isdigit() else token, 0) | _FILLER
+        if not candidates:
+            break
+    if candidates:
+        text = ' '.join(tokens) + ' '
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            grammar = _GRAMMARS[bit.bit_length() - 1]
+            intent = grammar.match(text)
+            if intent is not None:
+                intents[grammar.intent] = intent
+    return {'tokens': tokens, 'entities': entities, 'intents': intents}
+
+
+def request(utterance):
+    """
+    :return: the "request" of an event with the utterance.
+    """
+    nlu = understand(utterance)
+    return {'command': ' '.join(nlu['tokens']), 'original_utterance': utterance, 'nlu': nlu,
+            'type': 'SimpleUtterance'}
+
+
+def benchmark(number=20000):
+    """
+    :return: microseconds per utterance over a sample of the utterances of a dialog.
+    """
+    utterances = ('', 'давай начнём', '3', 'сорок два', 'три пятых', 'повтори вариант два', 'что ты умеешь',
+                  'минус один', 'пи на шесть', 'расскажи интересные факты')
+    seconds = min(timeit.repeat(lambda: [understand(u) for u in utterances], number=number // len(utterances),
+                                repeat=5))
+    return seconds / (number // len(utterances) * len(utterances)) * 1e6
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        print(understand(' '.join(sys.argv[1:])))
+    else:
+        print('%.2f us per utterance' % benchmark())
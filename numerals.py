@@ -0,0 +1,323 @@
+from functools import lru_cache
+from collections import namedtuple
+
+"""
+Verbalization of numbers for TTS.
+
+Russian numerals agree with the case and the gender of the phrase they are used in, so every function takes the
+case: 'nom', 'gen', 'dat', 'acc', 'ins' or 'pre' (the accusative is the inanimate one). English ignores the case.
+Verbalized numbers are memoized, the same numbers are spoken over and over in the quizzes.
+"""
+
+CACHE_SIZE = 4096
+CASES = ('nom', 'gen', 'dat', 'acc', 'ins', 'pre')
+
+# Values with their own spoken form, integers are spoken as cardinals
+Ratio = namedtuple('Ratio', 'numerator denominator')
+Degrees = namedtuple('Degrees', 'value')
+
+
+def written(value):
+    """
+    :return: the value as it is shown to the user.
+    """
+    if isinstance(value, Ratio):
+        return str(value.numerator) + '/' + str(value.denominator)
+    if isinstance(value, Degrees):
+        return str(value.value) + '°'
+    return str(value)
+
+
+def russian_plural(n):
+    """
+    :return: 0 for 1, 21, 31..., 1 for 2-4, 22-24..., 2 for the rest. It is the index of the noun form agreeing with n.
+    """
+    n = abs(n)
+    if n % 10 == 1 and n % 100 != 11:
+        return 0
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return 1
+    return 2
+
+
+def english_plural(n):
+    return 0 if abs(n) == 1 else 1
+
+
+_RU_ZERO = {'nom': 'ноль', 'gen': 'нуля', 'dat': 'нулю', 'acc': 'ноль', 'ins': 'нулём', 'pre': 'нуле'}
+_RU_UNITS = {
+    'nom': ('', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять'),
+    'gen': ('', 'одного', 'двух', 'трёх', 'четырёх', 'пяти', 'шести', 'семи', 'восьми', 'девяти'),
+    'dat': ('', 'одному', 'двум', 'трём', 'четырём', 'пяти', 'шести', 'семи', 'восьми', 'девяти'),
+    'acc': ('', 'один', 'два', 'три', 'четыре', 'пять', 'шесть', 'семь', 'восемь', 'девять'),
+    'ins': ('', 'одним', 'двумя', 'тремя', 'четырьмя', 'пятью', 'шестью', 'семью', 'восемью', 'девятью'),
+    'pre': ('', 'одном', 'двух', 'трёх', 'четырёх', 'пяти', 'шести', 'семи', 'восьми', 'девяти'),
+}
+# Forms of "один" and "два" differing from the masculine ones
+_RU_GENDER_FORMS = {
+    ('f', 1): {'nom': 'одна', 'gen': 'одной', 'dat': 'одной', 'acc': 'одну', 'ins': 'одной', 'pre': 'одной'},
+    ('n', 1): {'nom': 'одно', 'acc': 'одно'},
+    ('f', 2): {'nom': 'две', 'acc': 'две'},
+}
+_RU_TEENS = ('десять', 'одиннадцать', 'двенадцать', 'тринадцать', 'четырнадцать', 'пятнадцать', 'шестнадцать',
+             'семнадцать', 'восемнадцать', 'девятнадцать')
+_RU_TENS = {
+    'nom': ('', '', 'двадцать', 'тридцать', 'сорок', 'пятьдесят', 'шестьдесят', 'семьдесят', 'восемьдесят',
+            'девяносто'),
+    'gen': ('', '', 'двадцати', 'тридцати', 'сорока', 'пятидесяти', 'шестидесяти', 'семидесяти', 'восьмидесяти',
+            'девяноста'),
+    'ins': ('', '', 'двадцатью', 'тридцатью', 'сорока', 'пятьюдесятью', 'шестьюдесятью', 'семьюдесятью',
+            'восемьюдесятью', 'девяноста'),
+}
+_RU_TENS['dat'] = _RU_TENS['pre'] = _RU_TENS['gen']
+_RU_TENS['acc'] = _RU_TENS['nom']
+_RU_HUNDREDS = {
+    'nom': ('', 'сто', 'двести', 'триста', 'четыреста', 'пятьсот', 'шестьсот', 'семьсот', 'восемьсот', 'девятьсот'),
+    'gen': ('', 'ста', 'двухсот', 'трёхсот', 'четырёхсот', 'пятисот', 'шестисот', 'семисот', 'восьмисот',
+            'девятисот'),
+    'dat': ('', 'ста', 'двумстам', 'трёмстам', 'четырёмстам', 'пятистам', 'шестистам', 'семистам', 'восьмистам',
+            'девятистам'),
+    'ins': ('', 'ста', 'двумястами', 'тремястами', 'четырьмястами', 'пятьюстами', 'шестьюстами', 'семьюстами',
+            'восемьюстами', 'девятьюстами'),
+    'pre': ('', 'ста', 'двухстах', 'трёхстах', 'четырёхстах', 'пятистах', 'шестистах', 'семистах', 'восьмистах',
+            'девятистах'),
+}
+_RU_HUNDREDS['acc'] = _RU_HUNDREDS['nom']
+
+
+def _ru_noun(singular, plural, few):
+    """
+    Forms of a noun counted by a numeral.
+    :param singular: forms after 1, 21... by case.
+    :param plural: forms after the other numbers by case, the nominative and accusative are the genitive plural.
+    :param few: form after 2-4 in the nominative and accusative.
+    """
+    return {'one': singular, 'many': plural, 'few': few}
+
+
+_RU_SCALES = (
+    (10 ** 9, 'm', _ru_noun(
+        {'nom': 'миллиард', 'gen': 'миллиарда', 'dat': 'миллиарду', 'acc': 'миллиард', 'ins': 'миллиардом',
+         'pre': 'миллиарде'},
+        {'nom': 'миллиардов', 'gen': 'миллиардов', 'dat': 'миллиардам', 'acc': 'миллиардов', 'ins': 'миллиардами',
+         'pre': 'миллиардах'}, 'миллиарда')),
+    (10 ** 6, 'm', _ru_noun(
+        {'nom': 'миллион', 'gen': 'миллиона', 'dat': 'миллиону', 'acc': 'миллион', 'ins': 'миллионом',
+         'pre': 'миллионе'},
+        {'nom': 'миллионов', 'gen': 'миллионов', 'dat': 'миллионам', 'acc': 'миллионов', 'ins': 'миллионами',
+         'pre': 'миллионах'}, 'миллиона')),
+    (10 ** 3, 'f', _ru_noun(
+        {'nom': 'тысяча', 'gen': 'тысячи', 'dat': 'тысяче', 'acc': 'тысячу', 'ins': 'тысячей', 'pre': 'тысяче'},
+        {'nom': 'тысяч', 'gen': 'тысяч', 'dat': 'тысячам', 'acc': 'тысяч', 'ins': 'тысячами', 'pre': 'тысячах'},
+        'тысячи')),
+)
+DEGREE = _ru_noun(
+    {'nom': 'градус', 'gen': 'градуса', 'dat': 'градусу', 'acc': 'градус', 'ins': 'градусом', 'pre': 'градусе'},
+    {'nom': 'градусов', 'gen': 'градусов', 'dat': 'градусам', 'acc': 'градусов', 'ins': 'градусами',
+     'pre': 'градусах'}, 'градуса')
+
+# Stems of the ordinals the denominators are spoken with
+_RU_ORDINAL_UNITS = ('', 'перв', 'втор', 'трет', 'четвёрт', 'пят', 'шест', 'седьм', 'восьм', 'девят')
+_RU_ORDINAL_TEENS = ('десят', 'одиннадцат', 'двенадцат', 'тринадцат', 'четырнадцат', 'пятнадцат', 'шестнадцат',
+                     'семнадцат', 'восемнадцат', 'девятнадцат')
+_RU_ORDINAL_TENS = ('', '', 'двадцат', 'тридцат', 'сороков', 'пятидесят', 'шестидесят', 'семидесят',
+                    'восьмидесят', 'девяност')
+_RU_ORDINAL_HUNDREDS = ('', 'сот', 'двухсот', 'трёхсот', 'четырёхсот', 'пятисот', 'шестисот', 'семисот',
+                        'восьмисот', 'девятисот')
+# Endings of the feminine singular and of the plural ordinal by case, "третий" has the soft ones
+_RU_ORDINAL_ENDINGS = {
+    'hard': ({'nom': 'ая', 'acc': 'ую'}, 'ой', {'dat': 'ым', 'ins': 'ыми'}, 'ых'),
+    'soft': ({'nom': 'ья', 'acc': 'ью'}, 'ьей', {'dat': 'ьим', 'ins': 'ьими'}, 'ьих'),
+}
+
+
+def _ru_agree(n, noun, case):
+    """
+    :return: the form of the noun agreeing with the number n in the case.
+    """
+    form = russian_plural(n)
+    if case in ('nom', 'acc'):
+        if form == 0:
+            return noun['one'][case]
+        return noun['few'] if form == 1 else noun['many'][case]
+    return noun['one'][case] if form == 0 else noun['many'][case]
+
+
+def _ru_triad(n, case, gender):
+    """
+    :return: list of words of 0 < n < 1000.
+    """
+    words = []
+    if n >= 100:
+        words.append(_RU_HUNDREDS[case][n // 100])
+        n %= 100
+    if 10 <= n < 20:
+        words.append(_RU_TEENS[n - 10] if case in ('nom', 'acc') else
+                     _RU_TEENS[n - 10][:-1] + ('ью' if case == 'ins' else 'и'))
+        return words
+    if n >= 20:
+        words.append(_RU_TENS[case][n // 10])
+        n %= 10
+    if n:
+        forms = _RU_GENDER_FORMS.get((gender, n), {})
+        words.append(forms.get(case, _RU_UNITS[case][n]))
+    return words
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def russian_cardinal(n, case='nom', gender='m'):
+    """
+    :param gender: gender of the counted noun, 'm', 'f' or 'n'.
+    :return: the cardinal number in words, e.g. "двадцати одной" for (21, 'gen', 'f').
+    """
+    if n < 0:
+        return 'минус ' + russian_cardinal(-n, case, gender)
+    if n == 0:
+        return _RU_ZERO[case]
+    words = []
+    for scale, scale_gender, noun in _RU_SCALES:
+        if n >= scale:
+            count, n = divmod(n, scale)
+            # "тысяча", not "одна тысяча"
+            if count != 1:
+                words.append(russian_cardinal(count, case, scale_gender))
+            words.append(_ru_agree(count, noun, case))
+    if n:
+        words.extend(_ru_triad(n, case, gender))
+    return ' '.join(words)
+
+
+def _ru_ordinal_stem(n):
+    """
+    :return: (words of the cardinal part, stem of the ordinal part) of 0 < n <= 1000 or None.
+    """
+    if n == 1000:
+        return '', 'тысячн'
+    if n > 1000:
+        return None
+    head = n - n % 100
+    rest = n % 100
+    if rest == 0:
+        return '', _RU_ORDINAL_HUNDREDS[n // 100]
+    if 10 <= rest < 20:
+        stem = _RU_ORDINAL_TEENS[rest - 10]
+    elif rest % 10 == 0:
+        stem = _RU_ORDINAL_TENS[rest // 10]
+    else:
+        head += rest - rest % 10
+        stem = _RU_ORDINAL_UNITS[rest % 10]
+    return (russian_cardinal(head) + ' ' if head else ''), stem
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def russian_fraction(numerator, denominator, case='nom'):
+    """
+    :return: the common fraction in words, e.g. "три шестнадцатых" or "одну вторую" for (1, 2, 'acc').
+    """
+    if numerator < 0:
+        return 'минус ' + russian_fraction(-numerator, denominator, case)
+    if denominator == 1 or numerator == 0:
+        return russian_cardinal(numerator, case)
+    ordinal = _ru_ordinal_stem(denominator)
+    if ordinal is None:
+        return russian_cardinal(numerator, case) + ' дробь ' + russian_cardinal(denominator, case)
+    head, stem = ordinal
+    singular, singular_oblique, plural, plural_rest = _RU_ORDINAL_ENDINGS['soft' if stem == 'трет' else 'hard']
+    if russian_plural(numerator) == 0:
+        ending = singular.get(case, singular_oblique)
+    else:
+        ending = plural.get(case, plural_rest)
+    return russian_cardinal(numerator, case, 'f') + ' ' + head + stem + ending
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def russian_degrees(n, case='nom'):
+    """
+    :return: the angle in words, e.g. "тридцати градусов" for (30, 'gen').
+    """
+    return russian_cardinal(n, case) + ' ' + _ru_agree(n, DEGREE, case)
+
+
+_EN_SMALL = ('zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten', 'eleven',
+             'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen')
+_EN_TENS = ('', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety')
+_EN_SCALES = ((10 ** 9, 'billion'), (10 ** 6, 'million'), (10 ** 3, 'thousand'), (100, 'hundred'))
+_EN_ORDINALS = {'one': 'first', 'two': 'second', 'three': 'third', 'five': 'fifth', 'eight': 'eighth',
+                'nine': 'ninth', 'twelve': 'twelfth'}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def english_cardinal(n, case='nom', gender='m'):
+    if n < 0:
+        return 'minus ' + english_cardinal(-n)
+    if n < 20:
+        return _EN_SMALL[n]
+    if n < 100:
+        return _EN_TENS[n // 10] + ('-' + _EN_SMALL[n % 10] if n % 10 else '')
+    for scale, name in _EN_SCALES:
+        if n >= scale:
+            count, rest = divmod(n, scale)
+            words = english_cardinal(count) + ' ' + name
+            if rest:
+                words += (' and ' if rest < 100 else ' ') + english_cardinal(rest)
+            return words
+
+
+def _english_ordinal(n):
+    words = english_cardinal(n)
+    if n in (100, 1000):
+        words = words[len('one '):]
+    head, _, last = words.rpartition('-' if words.rfind('-') > words.rfind(' ') else ' ')
+    if last in _EN_ORDINALS:
+        last = _EN_ORDINALS[last]
+    elif last.endswith('y'):
+        last = last[:-1] + 'ieth'
+    else:
+        last += 'th'
+    return words[:len(head) + 1] + last if head else last
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def english_fraction(numerator, denominator, case='nom'):
+    if numerator < 0:
+        return 'minus ' + english_fraction(-numerator, denominator)
+    if denominator == 1 or numerator == 0:
+        return english_cardinal(numerator)
+    if denominator == 2:
+        name = 'half' if numerator == 1 else 'halves'
+    elif denominator == 4:
+        name = 'quarter' if numerator == 1 else 'quarters'
+    else:
+        name = _english_ordinal(denominator) + ('' if numerator == 1 else 's')
+    return english_cardinal(numerator) + ' ' + name
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def english_degrees(n, case='nom'):
+    return english_cardinal(n) + (' degree' if abs(n) == 1 else ' degrees')
+
+
+class Numerals:
+    """ Number verbalization of a language """
+    def __init__(self, cardinal, fraction, degrees, plural):
+        self.cardinal = cardinal
+        self.fraction = fraction
+        self.degrees = degrees
+        self.plural = plural
+
+    def spoken(self, value, case='nom'):
+        """
+        :param value: integer, Ratio, Degrees or text.
+        :return: the value as it is spoken in the case.
+        """
+        if isinstance(value, Ratio):
+            return self.fraction(value.numerator, value.denominator, case)
+        if isinstance(value, Degrees):
+            return self.degrees(value.value, case)
+        if isinstance(value, int):
+            return self.cardinal(value, case)
+        return str(value)
+
+
+RUSSIAN = Numerals(russian_cardinal, russian_fraction, russian_degrees, russian_plural)
+ENGLISH = Numerals(english_cardinal, english_fraction, english_degrees, english_plural)
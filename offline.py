@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+import load_shedding
+import rate_limit
+
+"""
+Global settings of the offline harnesses.
+
+The harnesses ("batch", "golden", "memory") play the dialogs through "handler.handler" with some of its global
+settings replaced, e.g. the load thresholds and the rate limits that would make the output depend on the machine and
+on the speed of the replay. A setting is (object, attribute name, value). A worker process of a pool belongs to the
+harness and installs the settings for good in its initializer, the process of the caller gets its settings back:
+    with patched(full_speed()):
+        handler.handler(event, None)
+"""
+
+
+def full_speed():
+    """
+    :return: settings of a replay at full speed: the load is never degraded or shed and the clients are never limited.
+    """
+    return [(load_shedding.monitor, 'thresholds', load_shedding.Thresholds.never()),
+            (rate_limit.limiter, 'limits', rate_limit.Limits.never())]
+
+
+def install(settings):
+    """ Sets the settings for good, in a worker process of a harness """
+    for target, name, value in settings:
+        setattr(target, name, value)
+
+
+@contextmanager
+def patched(settings):
+    """ Sets the settings and restores the previous values on exit, in the process of the caller """
+    saved = [(target, name, getattr(target, name)) for target, name, _ in settings]
+    try:
+        install(settings)
+        yield
+    finally:
+        install(reversed(saved))
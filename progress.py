@@ -0,0 +1,176 @@
+import sys
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from heapq import heapify, heappush, heappop
+
+"""
+Local progress store of the users and the spaced-repetition review deck kept in it.
+
+Missed questions are put into the deck and scheduled with Leitner boxes: a correct answer moves the question to the
+next box with a longer interval, a wrong one moves it back to the first box. Due questions are kept in a heap by the
+time of the next review, so the next question is found in O(log n) even for long histories.
+
+The store keeps the progress in memory, SQLite persistence is optional:
+    progress = ProgressStore('progress.sqlite3')
+Only the MAX_DECKS most recently used decks are kept in memory. With persistence a deck is saved on every change and
+is loaded again when its user comes back, without it the deck of a user not seen for long is forgotten.
+"""
+
+# Review intervals of the boxes in seconds, the question is mastered after the last box
+INTERVALS = (0, 10 * 60, 24 * 60 * 60, 3 * 24 * 60 * 60, 7 * 24 * 60 * 60, 30 * 24 * 60 * 60)
+MAX_ITEMS = 500
+# Decks kept in memory
+MAX_DECKS = 1000
+
+
+class ReviewItem:
+    """ Missed question scheduled for review """
+    __slots__ = ('id', 'task', 'text', 'tts', 'answer_state', 'box', 'due')
+
+    def __init__(self, id, task, text, tts, answer_state, box=0, due=0):
+        """
+        :param task: id of the quiz scenario of the question.
+        :param answer_state: session state the quiz scenario checks the answer with.
+        :param due: time of the next review in seconds.
+        """
+        self.id = id
+        self.task = task
+        self.text = text
+        self.tts = tts
+        self.answer_state = answer_state
+        self.box = box
+        self.due = due
+
+    def to_list(self):
+        return [self.id, self.task, self.text, self.tts, self.answer_state, self.box, self.due]
+
+
+class ReviewDeck:
+    """ Review questions of one user """
+    def __init__(self, items=()):
+        self._items = {}
+        self._by_question = {}
+        for item in items:
+            item = ReviewItem(*item)
+            # Task ids loaded from JSON are new strings, interned they are shared with the scenarios
+            item.task = sys.intern(item.task)
+            self._items[item.id] = item
+            self._by_question[(item.task, item.text)] = item.id
+        self._next_id = max(self._items, default=-1) + 1
+        self._heap = [(item.due, item.id) for item in self._items.values()]
+        heapify(self._heap)
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, item_id):
+        return self._items.get(item_id)
+
+    def add(self, task, text, tts, answer_state, now):
+        """ Puts a missed question into the first box, it is due at once """
+        item_id = self._by_question.get((task, text))
+        if item_id is not None:
+            item = self._items[item_id]
+            item.box = 0
+            item.due = now
+        else:
+            if len(self._items) >= MAX_ITEMS:
+                self._remove(next(iter(self._items)))
+            item = ReviewItem(self._next_id, task, text, tts, answer_state, 0, now)
+            self._next_id += 1
+            self._items[item.id] = item
+            self._by_question[(task, text)] = item.id
+        self._push(item)
+        return item
+
+    def next_due(self, now):
+        """
+        :return: the question due for review at "now" with the earliest review time or None.
+        """
+        heap = self._heap
+        while heap:
+            due, item_id = heap[0]
+            item = self._items.get(item_id)
+            # Entries of removed and rescheduled questions are dropped lazily
+            if item is None or item.due != due:
+                heappop(heap)
+                continue
+            return item if due <= now else None
+        return None
+
+    def grade(self, item_id, correct, now):
+        """
+        Reschedules the question after the review.
+        :return: True if the question is mastered and left the deck.
+        """
+        item = self._items.get(item_id)
+        if item is None:
+            return False
+        if not correct:
+            item.box = 0
+        elif item.box + 1 == len(INTERVALS):
+            self._remove(item_id)
+            return True
+        else:
+            item.box += 1
+        item.due = now + INTERVALS[item.box]
+        self._push(item)
+        return False
+
+    def to_list(self):
+        return [item.to_list() for item in self._items.values()]
+
+    def _push(self, item):
+        heappush(self._heap, (item.due, item.id))
+        if len(self._heap) > 2 * len(self._items) + 16:
+            self._heap = [(item.due, item.id) for item in self._items.values()]
+            heapify(self._heap)
+
+    def _remove(self, item_id):
+        item = self._items.pop(item_id)
+        del self._by_question[(item.task, item.text)]
+
+
+class ProgressStore:
+    """ Progress of the users, in memory with optional SQLite persistence """
+    def __init__(self, path=None):
+        self._decks = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS review (user TEXT PRIMARY KEY, deck TEXT)')
+            self._connection.commit()
+
+    def deck(self, user):
+        """
+        :return: the review deck of the user, it is loaded once per process or again after it is evicted.
+        """
+        deck = self._decks.get(user)
+        if deck is not None:
+            self._decks.move_to_end(user)
+        else:
+            items = ()
+            if self._connection is not None:
+                with self._lock:
+                    row = self._connection.execute('SELECT deck FROM review WHERE user = ?', (user,)).fetchone()
+                if row is not None:
+                    items = json.loads(row[0])
+            deck = self._decks[user] = ReviewDeck(items)
+            if len(self._decks) > MAX_DECKS:
+                # Saved on every change, the evicted deck is loaded again from the database if it is persisted
+                self._decks.popitem(last=False)
+        return deck
+
+    def save(self, user):
+        if self._connection is None or user not in self._decks:
+            return
+        data = json.dumps(self._decks[user].to_list(), ensure_ascii=False)
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO review VALUES (?, ?)', (user, data))
+            self._connection.commit()
+
+
+progress = ProgressStore()
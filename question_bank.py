@@ -0,0 +1,256 @@
+import os
+import sys
+import mmap
+import struct
+import hashlib
+
+"""
+Question bank: a compact binary file opened with mmap, so all worker processes share its pages.
+
+Layout (little-endian):
+    header   magic b'QBNK', version u16, fields per record u16, number of records u32, number of tags u32,
+             SHA-1 of the sources of the tables 20 bytes
+    tags     number of tags * (offset u32, length u32) - tag names in the blob
+    index    number of records * (tag u16, difficulty u8, pad u8, fields * (offset u32, length u32))
+    blob     UTF-8 strings
+The index is fixed-width, so a record is found in O(1) by its number. A bank built from other sources than the ones
+on the disk is stale, the tables are generated from "question_tables.py" instead until the bank is built again.
+
+Build the bank of the skill with:
+    python question_bank.py [path]
+"""
+
+MAGIC = b'QBNK'
+VERSION = 2
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(_DIRECTORY, 'questions.bank')
+# Modules the tables are generated from, the trigonometry questions are spoken with the Russian catalog
+SOURCES = ('question_tables.py', 'trigonometry.py', 'numerals.py', 'locales.py', 'messages_ru.py')
+
+_HEADER = struct.Struct('<4sHHII20s')
+_SPAN = struct.Struct('<II')
+_RECORD_HEAD = struct.Struct('<HBx')
+
+# Tags of the tables compiled from "question_tables.py"
+TRIGONOMETRY = 'trigonometry'
+FACTS = 'facts'
+
+
+class QuestionBankError(Exception):
+    pass
+
+
+class Record:
+    """ Record of the question bank """
+    __slots__ = ('tag', 'difficulty', 'fields')
+
+    def __init__(self, tag, difficulty, fields):
+        self.tag = tag
+        self.difficulty = difficulty
+        self.fields = tuple(fields)
+
+    def __getitem__(self, index):
+        return self.fields[index]
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __eq__(self, other):
+        return isinstance(other, Record) and \
+            (self.tag, self.difficulty, self.fields) == (other.tag, other.difficulty, other.fields)
+
+    def __repr__(self):
+        return 'Record(%r, %r, %r)' % (self.tag, self.difficulty, self.fields)
+
+
+def source_hash(directory=_DIRECTORY):
+    """
+    :return: SHA-1 digest of the sources of the tables.
+    """
+    digest = hashlib.sha1()
+    for name in SOURCES:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def build(path, records, fields, source=b''):
+    """
+    Compiles records into a bank file.
+    :param path: path of the bank file.
+    :param records: iterable of Record, every record has exactly "fields" string fields.
+    :param fields: number of fields per record.
+    :param source: digest of the sources of the records, see "source_hash".
+    """
+    tags = []
+    tag_ids = {}
+    blob = bytearray()
+    spans = {}
+    index = bytearray()
+
+    def put(string):
+        # Equal strings (tags, links) are stored once
+        if string not in spans:
+            data = string.encode('utf-8')
+            spans[string] = (len(blob), len(data))
+            blob.extend(data)
+        return spans[string]
+
+    count = 0
+    for record in records:
+        if len(record.fields) != fields:
+            raise QuestionBankError('Record %r has %d fields instead of %d' % (record, len(record.fields), fields))
+        if record.tag not in tag_ids:
+            tag_ids[record.tag] = len(tags)
+            tags.append(record.tag)
+        index += _RECORD_HEAD.pack(tag_ids[record.tag], record.difficulty)
+        for field in record.fields:
+            index += _SPAN.pack(*put(field))
+        count += 1
+
+    tag_table = bytearray()
+    for tag in tags:
+        tag_table += _SPAN.pack(*put(tag))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, fields, count, len(tags), source))
+        f.write(tag_table)
+        f.write(index)
+        f.write(blob)
+    # Workers that have the old bank mapped keep reading it until they reopen
+    os.replace(tmp_path, path)
+
+
+class QuestionBank:
+    """ Read-only memory-mapped question bank """
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._fields, self._count, tags, self.source = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise QuestionBankError('Unsupported question bank ' + path)
+        self._record_size = _RECORD_HEAD.size + _SPAN.size * self._fields
+        self._index = _HEADER.size + _SPAN.size * tags
+        self._blob = self._index + self._record_size * self._count
+        self._tags = [self._string(*_SPAN.unpack_from(self._mmap, _HEADER.size + _SPAN.size * i))
+                      for i in range(tags)]
+        self._filters = {}
+
+    def _string(self, offset, length):
+        start = self._blob + offset
+        return self._mmap[start:start + length].decode('utf-8')
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Question bank index out of range')
+        position = self._index + self._record_size * index
+        tag, difficulty = _RECORD_HEAD.unpack_from(self._mmap, position)
+        position += _RECORD_HEAD.size
+        fields = [self._string(*_SPAN.unpack_from(self._mmap, position + _SPAN.size * i))
+                  for i in range(self._fields)]
+        return Record(self._tags[tag], difficulty, fields)
+
+    @property
+    def tags(self):
+        return list(self._tags)
+
+    def filter(self, tag=None, difficulty=None):
+        """
+        :param tag: tag of the records or None for any tag.
+        :param difficulty: difficulty of the records or None for any difficulty.
+        :return: tuple of the record numbers. The scan of the index is done once per filter.
+        """
+        key = (tag, difficulty)
+        if key not in self._filters:
+            tag_id = self._tags.index(tag) if tag in self._tags else -1
+            found = []
+            for index in range(self._count):
+                record_tag, record_difficulty = _RECORD_HEAD.unpack_from(
+                    self._mmap, self._index + self._record_size * index)
+                if (tag is None or record_tag == tag_id) and (difficulty is None or record_difficulty == difficulty):
+                    found.append(index)
+            self._filters[key] = tuple(found)
+        return self._filters[key]
+
+    def view(self, tag=None, difficulty=None, decode=None):
+        return BankView(self, self.filter(tag, difficulty), decode)
+
+    def close(self):
+        self._mmap.close()
+
+
+class BankView:
+    """ Lazy sequence over the filtered records of a bank """
+    def __init__(self, bank, indices, decode=None):
+        self._bank = bank
+        self._indices = indices
+        self._decode = decode
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        record = self._bank[self._indices[index]]
+        if self._decode is not None:
+            return self._decode(record)
+        return record
+
+
+def _trigonometry_records(table):
+    for text, tts, answer in table:
+        # Questions about the value of a function are easier than questions about the angle
+        difficulty = 1 if text.endswith('?') else 2
+        yield Record(TRIGONOMETRY, difficulty, (text, tts, ','.join(str(angle) for angle in answer)))
+
+
+def _fact_records(table):
+    for fact, link in table:
+        yield Record(FACTS, 0, (fact, link, ''))
+
+
+def decode_trigonometry(record):
+    return record[0], record[1], tuple(int(angle) for angle in record[2].split(','))
+
+
+def decode_fact(record):
+    return record[0], record[1]
+
+
+def build_default(path=DEFAULT_PATH):
+    """ Compiles the tables of "question_tables.py" into the bank of the skill """
+    import question_tables
+
+    records = list(_trigonometry_records(question_tables.TRIGONOMETRY)) + \
+        list(_fact_records(question_tables.FACTS))
+    build(path, records, 3, source_hash())
+    return len(records)
+
+
+def load_tables(path=DEFAULT_PATH):
+    """
+    :return: trigonometry table and facts table, read from the bank if it is built from the current sources and
+        from "question_tables.py" otherwise.
+    """
+    try:
+        bank = QuestionBank(path)
+    except (OSError, QuestionBankError):
+        bank = None
+    if bank is not None and bank.source != source_hash():
+        bank.close()
+        bank = None
+    if bank is None:
+        import question_tables
+        return question_tables.TRIGONOMETRY, question_tables.FACTS
+    return bank.view(TRIGONOMETRY, decode=decode_trigonometry), bank.view(FACTS, decode=decode_fact)
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    print('Compiled %d records into %s' % (build_default(target), target))
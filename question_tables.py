@@ -0,0 +1,80 @@
+import trigonometry
+
+"""
+Question tables of the skill.
+
+They are the source the question bank (see "question_bank.py") is compiled from and the fallback used when the
+compiled bank is not available.
+"""
+
+# 'question text', 'question tts', (answer values or angles), generated from the exact values of the functions
+TRIGONOMETRY = trigonometry.build().questions
+
+# 'fact', 'link'
+FACTS = (('Сейчас мы живем в век информации и ее массового распространения, каждый день человек получает дозу'
+          ' данных, которые мозгу необходимо переработать и использовать в дальнейшем или определить, как '
+          'бесполезные и не использовать вовсе. Именно так и появилась ментальная арифметика, она помогает '
+          'легче усваивать информацию, лучше ее структурировать, а также правильно использовать.',
+          'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'),
+         ('Ментальная арифметика особенно хороша для детей и подростков. Именно на этом этапе жизни стоит'
+          ' подключать развитие памяти и навыков работы с ней. Также ментальная арифметика развивает логическое'
+          ' мышление, причинно-следственные связи, помогает понять, как работают законы мироздания и не только.',
+          'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'),
+         ('Ментальная арифметика – это новейший метод всестороннего развития мышления и восприятия. В настоящее'
+          ' время довольно трудно стать по-настоящему полезным в социуме, если вышеперечисленные качества не'
+          ' выведены на нужный уровень.',
+          'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'),
+         ('Ментальная арифметика в странах Азии, включая КНР и Японию, является обязательным предметом для'
+          ' изучения в учебных заведениях. Это может быть обычный школьный урок или факультативное занятие.',
+          'https://maxxbay.livejournal.com/17292120.html'),
+         ('Древние счеты активно применяются в странах Запада, в том числе США и Канаде.',
+          'https://maxxbay.livejournal.com/17292120.html'),
+         ('Ученым давно известен тот факт, что левое полушарие отвечает за логическое мышление, а правое – за '
+          'творческие способности. К примеру, если задействовать правую руку, то включается левое полушарие и'
+          ' наоборот. Однако задействовав одновременно оба полушария, можно достичь значимых успехов в развитие'
+          ' ребенка.', 'https://maxxbay.livejournal.com/17292120.html'),
+         ('Используемая нами десятичная система счисления возникла по причине того, что у человека на руках'
+          ' 10 пальцев. Способность к абстрактному счёту появилась у людей не сразу, а использовать для счёта '
+          'именно пальцы оказалось удобнее всего.',
+          'https://ru.wikipedia.org/wiki/'
+          '%D0%9F%D0%B0%D0%BB%D1%8C%D1%86%D0%B5%D0%B2%D1%8B%D0%B9_%D1%81%D1%87%D1%91%D1%82'),
+         ('Было давно замечено, что если у курицы десять цыплят, то пропажа одного вызывает у нее беспокойство.'
+          ' Считать она, конечно же, не умеет, но недостачу чувствует. А вот пропажи тринадцатого, пятнадцатого'
+          ' она уже не замечает. Удивительно, но человек ведет себя примерно так же: количества, большие десяти'
+          ', без предварительного счета он воспринимает как абстрактное множество. Количества, меньшие десяти, '
+          'мы называем «несколько» и воспринимаем уже иначе.',
+          'http://oper-sist.blogspot.com/p/blog-page_5156.html'),
+         ('Как известно, военные любят командовать. Многовековой опыт показал, что удобнее всего командовать'
+          ' четырьмя подчиненными. Поэтому обычно в полку четыре батальона, в батальоне – четыре роты, в роте'
+          ' – четыре взвода и так далее. Значит, у военных на каждой «позиции» может быть до четырех единиц! '
+          'Военные мыслят как бы в системе счисления с основанием 4. Четверичную систему используют с '
+          'незапамятных времен индейцы юкки в Калифорнии и родственное им племя в Южной Америке - они считают '
+          'на промежутках между пальцами.', 'http://oper-sist.blogspot.com/p/blog-page_5156.html'),
+         ('Мы считаем отрицательные числа чем-то естественным, но так было далеко не всегда. Впервые'
+          ' отрицательные числа были узаконены в Китае в 3 веке, но использовались лишь для исключительных '
+          'случаев, так как считались, в общем, бессмысленными. Чуть позднее отрицательные числа стали '
+          'использоваться в Индии для обозначения долгов.',
+          'http://www.nsmu.ru/student/pr_education/nauch_dejt/docs/math.pdf'),
+         ('Если мы напишем произвольное двузначное число, а затем напишем цифры этого же числа в обратном '
+          'порядке и возьмем разность полученных чисел, то эта разность всегда разделится на 9.',
+          'http://www.nsmu.ru/student/pr_education/nauch_dejt/docs/math.pdf'),
+         ('В комнате, состоящей всего из 23 человек, 50% вероятности того, что у двух человек будет одинаковый '
+          'день рождения.',
+          'https://1gai.ru/publ/523846-16-faktov-matematiki-kotorye-zastavjat-vas-skazat-ne-uzheli-jeto-pravda.html'),
+         ('Сумма цифр числа 18 вдвое меньше его самого. В этом плане оно единственное в своём роде.',
+          'https://interesnyefakty.org/interesnye-fakty-o-matematike/'),
+         ('Древние египтяне не использовали дроби.',
+          'https://interesnyefakty.org/interesnye-fakty-o-matematike/'),
+         ('Знак равенства впервые применил британский математик Роберт Рекорд в 1557 году.',
+          'http://xn--80aexocohdp.xn--p1ai/22-'
+          '%D0%B8%D0%BD%D1%82%D0%B5%D1%80%D0%B5%D1%81%D0%BD%D1%8B%D1%85-%D1%84%D0%B0%D0%BA%D1%82%D0%B0-'
+          '%D0%BE-%D0%BC%D0%B0%D1%82%D0%B5%D0%BC%D0%B0%D1%82%D0%B8%D0%BA%D0%B5/'),
+         ('Первые знакомые нам знаки сложения и вычитания были описаны практически 520 лет назад в книге'
+          ' «Правила алгебры», написанной Яном Видманом.',
+          'https://100-faktov.ru/50-interesnyx-faktov-o-matematike/'),
+         ('Выемки (порезы или углубления) на костях животных доказывают, что люди занимались математикой'
+          ' примерно с 30 000 лет до нашей эры.',
+          'https://vseznaesh.ru/30-interesnyh-i-udivitelnyh-faktov-o-matematike'),
+         ('Доведение числа Пи до 39 знаков позволяет измерить окружность наблюдаемой Вселенной с точностью до'
+          ' ширины одного атома водорода.',
+          'https://vseznaesh.ru/30-interesnyh-i-udivitelnyh-faktov-o-matematike'))
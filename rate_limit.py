@@ -0,0 +1,211 @@
+import sys
+import math
+import time
+import timeit
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+
+from locales import get_locale
+
+"""
+Per-client rate limiting for "handler.handler".
+
+A person says an utterance every few seconds at most, a client sending requests much faster is a script or a broken
+device and is not played. Every client, the "user_id" of a logged-in user or else the "application_id" of the device,
+has a token bucket: a request takes a token, the tokens are refilled at "rate" per second up to "burst". A client
+without tokens gets a pre-rendered answer and stays in the current scenario:
+    if not limiter.allow(client_id(event)):
+        return limited_response(event)
+A check is O(1): the bucket is two numbers refilled lazily when the client is seen. The buckets are kept in the
+process memory, the least recently seen ones are evicted when there are more than "max_clients" of them. A bucket
+idle for "burst / rate" seconds is full and is the same as a new one, so evicting the idle buckets loses nothing.
+With several worker processes a client is limited by the sum of their buckets, the buckets can be shared by the
+workers of one machine in SQLite instead, at the cost of a write transaction per request:
+    limiter.store = BucketStore('buckets.sqlite3')
+Events without a client id are not limited. Allowed, limited and unidentified requests, evictions and the errors of
+the store are counted in "limiter.counters".
+"""
+
+
+class Limits:
+    """ Configurable limits of the clients """
+    def __init__(self, rate=1.0, burst=20, max_clients=100000):
+        """
+        :param rate: tokens added to a bucket per second, the sustained requests per second of a client.
+        :param burst: capacity of a bucket, the requests a client can send at once.
+        :param max_clients: buckets kept in memory.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.unlimited = math.isinf(rate)
+
+    @classmethod
+    def never(cls):
+        """ Limits that are never reached, for the offline harnesses replaying the dialogs at full speed """
+        return cls(rate=float('inf'), burst=float('inf'))
+
+    def refill(self, tokens, elapsed):
+        """
+        :param elapsed: seconds since the bucket was updated.
+        :return: the tokens of the bucket now.
+        """
+        return min(self.burst, tokens + elapsed * self.rate)
+
+
+class BucketStore:
+    """ SQLite buckets shared by the worker processes of one machine """
+    def __init__(self, path, timeout=0.5):
+        """
+        :param timeout: seconds to wait for the lock of the database, then the request is allowed.
+        """
+        # Transactions are begun explicitly, the bucket is locked before it is read
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._takes = 0
+        with self._lock:
+            # The buckets are refilled in seconds, they are not worth a sync of the disk per request
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=OFF')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS buckets '
+                                     '(client TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)')
+
+    def take(self, client, limits, now):
+        """
+        Takes a token from the bucket of the client.
+        :param now: the current time in seconds, the same clock in all the processes.
+        :return: True if the bucket had a token.
+        :raises sqlite3.Error: if the database is locked for longer than the timeout.
+        """
+        with self._lock:
+            connection = self._connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute('SELECT tokens, updated FROM buckets WHERE client = ?', (client,)).fetchone()
+                tokens = limits.burst if row is None else limits.refill(row[0], now - row[1])
+                allowed = tokens >= 1
+                if allowed:
+                    tokens -= 1
+                connection.execute('INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)', (client, tokens, now))
+                self._takes += 1
+                # The full buckets are the same as the missing ones, they are deleted from time to time
+                if self._takes % 1024 == 0:
+                    connection.execute('DELETE FROM buckets WHERE updated < ?', (now - limits.burst / limits.rate,))
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        return allowed
+
+
+class RateLimiter:
+    """ Token buckets of the clients """
+    def __init__(self, limits=None, store=None):
+        """
+        :param store: BucketStore shared by the workers or None to keep the buckets in memory.
+        """
+        self.limits = limits or Limits()
+        self.store = store
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        # Client to [tokens, monotonic time of the update], the least recently seen first
+        self._buckets = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def allow(self, client, now=None):
+        """
+        Takes a token from the bucket of the client.
+        :param client: id of the client or None if the event has none.
+        :param now: the current time in seconds, the monotonic clock for the memory and the wall clock for the store.
+        :return: True if the request is handled, False if the client exceeded the limits.
+        """
+        limits = self.limits
+        if limits.unlimited:
+            return True
+        if client is None:
+            self.count('unidentified')
+            return True
+        if self.store is not None:
+            return self._take_shared(client, limits, time.time() if now is None else now)
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [limits.burst, now]
+                if len(self._buckets) > limits.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.counters['evicted'] += 1
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = limits.refill(bucket[0], now - bucket[1])
+                bucket[1] = now
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            self.counters['allowed' if allowed else 'limited'] += 1
+        return allowed
+
+    def _take_shared(self, client, limits, now):
+        try:
+            allowed = self.store.take(client, limits, now)
+        except sqlite3.Error:
+            # A busy store must not stop the skill
+            self.count('store_errors')
+            return True
+        self.count('allowed' if allowed else 'limited')
+        return allowed
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self._buckets.clear()
+
+
+def client_id(event):
+    """
+    :param event: events.Event of the request.
+    :return: the id the client is limited by or None.
+    """
+    session = event.session
+    return session.user_id if session.user_id is not None else session.application_id
+
+
+def limited_response(event):
+    """
+    Pre-rendered answer for a limited request in the language of the request, the user stays in the current
+    scenario.
+    :param event: events.Event of the request.
+    :return: response to be serialized as JSON.
+    """
+    text = get_locale(event.meta.locale)['limited.reply']
+    return {
+        'response': {'text': text, 'tts': text},
+        'version': '1.0',
+        'session_state': dict(event.state.session),
+    }
+
+
+limiter = RateLimiter()
+
+
+def benchmark(clients=1000, number=200000):
+    """
+    :return: microseconds per check of the in-memory buckets.
+    """
+    bench = RateLimiter(Limits(rate=1e9, burst=1e9))
+    ids = ['client-%d' % i for i in range(clients)]
+    checks = [ids[i % clients] for i in range(number)]
+    seconds = min(timeit.repeat(lambda: [bench.allow(client) for client in checks], number=1, repeat=5))
+    return seconds / number * 1e6
+
+
+if __name__ == '__main__':
+    print('%.2f us per check' % benchmark(*map(int, sys.argv[1:])))
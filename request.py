@@ -48,26 +48,7 @@ Sample request sent by Alice:
 """
 
 
-class Request:
-    """ Class for more convenient work with the request """
-    def __init__(self, request_body):
-        self.request_body = request_body
+from events import UserRequest
 
-    def __getitem__(self, key):
-        return self.request_body[key]
-
-    @property
-    def intents(self):
-        return self.request_body['request'].get('nlu', {}).get('intents', {})
-
-    @property
-    def tokens(self):
-        return self.request_body['request'].get('nlu', {}).get('tokens', {})
-
-    @property
-    def entities(self):
-        return self.request_body['request'].get('nlu', {}).get('entities', {})
-
-    @property
-    def type(self):
-        return self.request_body.get('request', {}).get('type')
+# The scenarios work with the decoded request of the event, see "events.py"
+Request = UserRequest
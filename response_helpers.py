@@ -23,3 +23,88 @@ def button(title, payload=None, url=None, hide=False):
     if url is not None:
         new_button['url'] = url
     return new_button
+
+
+# Limits of the card fields in Yandex Dialogs
+TITLE_LIMIT = 128
+DESCRIPTION_LIMIT = 256
+HEADER_LIMIT = 64
+
+
+def big_image(image_id, title=None, description=None, button=None):
+    """
+    :param image_id: id of an image uploaded to the skill.
+    :param title: title of the image.
+    :param description: text under the image.
+    :param button: dict with the "text", "url" and "payload" of the image button.
+    :return: property - a card with one image.
+    "card": {
+        "type": "BigImage",
+        "image_id": "1027858/46r960da47f60207e924",
+        "title": "title",
+        "description": "text",
+        "button": {
+            "text": "text",
+            "url": "https://example.com/"
+        }
+    }
+    """
+    card = {
+        'type': 'BigImage',
+        'image_id': image_id,
+    }
+    if title is not None:
+        card['title'] = title
+    if description is not None:
+        card['description'] = description
+    if button is not None:
+        card['button'] = button
+    return card
+
+
+def item(image_id, title=None, description=None):
+    """
+    :return: an image of the ItemsList card.
+    """
+    new_item = {
+        'image_id': image_id,
+    }
+    if title is not None:
+        new_item['title'] = title
+    if description is not None:
+        new_item['description'] = description
+    return new_item
+
+
+def items_list(items, header=None, footer=None):
+    """
+    :param items: from 1 to 5 items made with "item".
+    :param header: text above the images.
+    :param footer: text under the images.
+    :return: property - a card with a list of images.
+    "card": {
+        "type": "ItemsList",
+        "header": {
+            "text": "text"
+        },
+        "items": [
+            {
+                "image_id": "1027858/46r960da47f60207e924",
+                "title": "title",
+                "description": "text"
+            }
+        ],
+        "footer": {
+            "text": "text"
+        }
+    }
+    """
+    card = {
+        'type': 'ItemsList',
+        'items': items,
+    }
+    if header is not None:
+        card['header'] = {'text': header}
+    if footer is not None:
+        card['footer'] = {'text': footer}
+    return card
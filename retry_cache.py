@@ -0,0 +1,156 @@
+import sys
+import json
+import time
+import threading
+from collections import Counter, OrderedDict
+
+"""
+Idempotent retries for "handler.handler".
+
+Alice sends a request again when the answer is late. A retry has the same "session_id" and "message_id", handling
+it again would draw another question and could count the points twice. The responses are kept by
+(session_id, message_id) and a retry gets the response of the first request:
+    response = retries.claim(key, timeout)    # the cached response or None, then the caller handles the request
+    retries.put(key, response)
+A retry arriving while the first request is still handled waits for its response up to the timeout. The last
+response of a session is also what a repeat replays:
+    retries.get((session_id, message_id - 1))
+
+The responses are kept serialized to JSON, so a retry gets exactly the same bytes and the memory of the cache is
+measured: it is bounded by the number of the responses and by their size, a response is dropped after TTL seconds or
+when the cache is full, the least recently used first. Hits, misses and evictions are counted in "retries.counters".
+The offline harnesses replaying the recorded events, which may repeat a key without being retries, disable the cache:
+    retries.enabled = False
+"""
+
+# Alice retries within its deadline, a response older than that is not asked for again
+DEFAULT_TTL = 60.0
+MAX_ENTRIES = 10000
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class RetryCache:
+    """ Responses of the recent requests by (session_id, message_id) """
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, enabled=True):
+        """
+        :param enabled: if False nothing is kept, every request is handled and nothing is replayed.
+        """
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        # Key to (expiry time, size, serialized response), the least recently used first
+        self._entries = OrderedDict()
+        # Keys of the requests being handled to the events their retries wait on
+        self._pending = {}
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """
+        :return: memory of the kept responses in bytes.
+        """
+        return self._bytes
+
+    def _get(self, key, now):
+        """
+        :return: the serialized response or None, the lock is held by the caller.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < now:
+            self._remove(key)
+            self.counters['expired'] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        """
+        :return: the kept response to the request or None, e.g. the last response of a session for a repeat.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            data = self._get(key, time.monotonic())
+        return None if data is None else json.loads(data)
+
+    def claim(self, key, timeout=0.0):
+        """
+        :param key: (session_id, message_id) of the request.
+        :param timeout: seconds to wait for the response if the request is being handled.
+        :return: the response to the request or None if the caller handles it, then "put" or "release" must follow.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            data = self._get(key, time.monotonic())
+            if data is not None:
+                self.counters['hits'] += 1
+                return json.loads(data)
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = threading.Event()
+                self.counters['misses'] += 1
+                return None
+        # A retry of a request that is still handled
+        pending.wait(max(0.0, min(timeout, self.ttl)))
+        with self._lock:
+            data = self._get(key, time.monotonic())
+            if data is not None:
+                self.counters['waited'] += 1
+                return json.loads(data)
+            self.counters['wait_timeouts'] += 1
+        return None
+
+    def put(self, key, response):
+        """ Keeps the response and wakes up the retries waiting for it """
+        if not self.enabled:
+            return
+        data = json.dumps(response, ensure_ascii=False, separators=(',', ':'))
+        size = sys.getsizeof(data)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (now + self.ttl, size, data)
+                self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes or
+                                     next(iter(self._entries.values()))[0] < now):
+                self._remove(next(iter(self._entries)))
+                self.counters['evicted'] += 1
+            pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.set()
+
+    def release(self, key):
+        """ Gives up the claim of a request that failed, its retries are handled again """
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is not None:
+            pending.set()
+
+    def clear(self):
+        """ Forgets the responses and the claims, the retries waiting for a claimed request are woken up """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.counters.clear()
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for event in pending:
+            event.set()
+
+
+retries = RetryCache()
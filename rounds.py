@@ -0,0 +1,66 @@
+import time
+
+"""
+Configuration of quiz rounds and server-side timing of answers.
+
+The time a question was asked at is kept in the session state ("asked_at", milliseconds), so the time to answer
+is measured without any server storage: one clock read and one state write per turn.
+"""
+
+DEFAULT_MODE = 'normal'
+SPEED_RUN = 'speed_run'
+MARATHON = 'marathon'
+
+# Points for a correct answer in time and the maximal bonus for answering fast
+ANSWER_POINTS = 100
+SPEED_BONUS = 100
+
+# Replaced by the offline harnesses to get reproducible timings
+clock = time.time
+
+
+class RoundConfig:
+    """ Configuration of a quiz round """
+    def __init__(self, questions=10, time_limit=30, speed_run=False):
+        """
+        :param questions: number of questions in the round, None if the round is endless.
+        :param time_limit: seconds given for an answer.
+        :param speed_run: the speed bonus is doubled in the speed-run mode.
+        """
+        self.questions = questions
+        self.time_limit = time_limit
+        self.speed_run = speed_run
+
+    def in_time(self, elapsed):
+        """
+        :param elapsed: milliseconds the user took to answer or None if unknown.
+        """
+        return elapsed is None or elapsed <= self.time_limit * 1000
+
+    def answer_score(self, elapsed):
+        """
+        :param elapsed: milliseconds the user took to answer the question correctly or None if unknown.
+        :return: points for the answer, the faster the more.
+        """
+        if elapsed is None:
+            return ANSWER_POINTS
+        limit = self.time_limit * 1000
+        bonus = max(0, limit - elapsed) * SPEED_BONUS // limit
+        if self.speed_run:
+            bonus *= 2
+        return ANSWER_POINTS + bonus
+
+
+ROUNDS = {
+    DEFAULT_MODE: RoundConfig(),
+    SPEED_RUN: RoundConfig(questions=20, time_limit=10, speed_run=True),
+    MARATHON: RoundConfig(questions=None),
+}
+
+
+def round_config(mode):
+    return ROUNDS.get(mode, ROUNDS[DEFAULT_MODE])
+
+
+def now_ms():
+    return int(clock() * 1000)
@@ -0,0 +1,349 @@
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import hashlib
+import tempfile
+import threading
+import socketserver
+import multiprocessing
+from bisect import bisect
+
+import handler
+from load_shedding import ALICE_DEADLINE, monitor
+
+"""
+Session-affinity router for running the skill on our own fleet.
+
+Every event is consistent-hashed by "session.session_id" (or "session.user.user_id" if there is no session)
+onto one of N local worker processes, each of them serving "handler.handler" over a Unix socket. Thus all turns
+of one dialog reach the same worker and its warm per-user caches. If a shard is down, the event is handled
+in-process, which is always correct because the skill keeps the dialog state in "state.session". An event is only
+handled in-process if it was not sent: a worker failing or late after the event was sent may have handled it, so
+the error is raised and the retry of Alice gets the response kept by the worker.
+
+Frame format on the socket: 4-byte big-endian length followed by the UTF-8 JSON payload.
+"""
+
+_HEADER = struct.Struct('>I')
+VIRTUAL_NODES = 64
+CONNECT_TIMEOUT = 1.0
+# A later answer is dropped by Alice anyway
+READ_TIMEOUT = ALICE_DEADLINE
+START_TIMEOUT = 5.0
+
+
+def session_key(event):
+    """
+    :param event: request payload.
+    :return: the key the event is routed by.
+    """
+    session = event.get('session', {})
+    key = session.get('session_id')
+    if key is None:
+        key = session.get('user', {}).get('user_id')
+    if key is None:
+        key = session.get('user_id', '')
+    return key
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """ Consistent hash ring with virtual nodes """
+    def __init__(self, nodes=(), virtual_nodes=VIRTUAL_NODES):
+        self._virtual_nodes = virtual_nodes
+        self._hashes = []
+        self._nodes = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node):
+        for i in range(self._virtual_nodes):
+            point = _hash(node + '#' + str(i))
+            index = bisect(self._hashes, point)
+            self._hashes.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def remove_node(self, node):
+        points = [(point, name) for point, name in zip(self._hashes, self._nodes) if name != node]
+        self._hashes = [point for point, name in points]
+        self._nodes = [name for point, name in points]
+
+    def get_node(self, key):
+        """
+        :param key: routing key.
+        :return: the node owning the key or None if the ring is empty.
+        """
+        if not self._hashes:
+            return None
+        index = bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+    @property
+    def nodes(self):
+        return sorted(set(self._nodes))
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('Connection closed by peer')
+        data += chunk
+    return data
+
+
+def send_frame(sock, payload):
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_frame(sock):
+    size, = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size).decode('utf-8'))
+
+
+# Scenarios keep the current user in a module-level helper, so a worker handles one event at a time
+_handler_lock = threading.Lock()
+
+
+def _handle_queued(event):
+    # The events of all the connections waiting for the handler are in flight, the load monitor sees the queue of the
+    # worker and the wait counts against the deadline
+    budget = monitor.start()
+    try:
+        with _handler_lock:
+            return handler.handle(event, budget)
+    finally:
+        monitor.finish(budget)
+
+
+class _WorkerRequestHandler(socketserver.BaseRequestHandler):
+    """ Serves framed events of one connection until the router closes it """
+    def handle(self):
+        while True:
+            try:
+                event = recv_frame(self.request)
+            except ConnectionError:
+                return
+            send_frame(self.request, _handle_queued(event))
+
+
+def _serve(path):
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, _WorkerRequestHandler) as server:
+        server.daemon_threads = True
+        server.serve_forever()
+
+
+class Worker:
+    """ Local worker process serving "handler.handler" on a Unix socket """
+    def __init__(self, name, path, owned=True):
+        self.name = name
+        self.path = path
+        # Workers attached by path belong to another router and are never stopped by this one
+        self.owned = owned
+        self._process = None
+
+    def start(self):
+        self._process = multiprocessing.Process(target=_serve, args=(self.path,), daemon=True)
+        self._process.start()
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.is_alive() and os.path.exists(self.path):
+                return
+            time.sleep(0.01)
+        raise RuntimeError('Worker ' + self.name + ' did not start')
+
+    def stop(self):
+        if not self.owned:
+            return
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def is_alive(self):
+        if not self.owned:
+            return os.path.exists(self.path)
+        return self._process is not None and self._process.is_alive()
+
+
+class Router:
+    """ Routes events to the worker owning their session, falling back to stateless in-process handling """
+    def __init__(self, workers=0, socket_dir=None):
+        self._socket_dir = socket_dir or tempfile.mkdtemp(prefix='alice-skill-')
+        self._workers = {}
+        self._ring = HashRing()
+        self._lock = threading.Lock()
+        # Connections are not shared between threads, every thread keeps its own per worker
+        self._local = threading.local()
+        self._next_id = 0
+        self.routed = 0
+        self.failovers = 0
+        for _ in range(workers):
+            self.add_worker()
+
+    @classmethod
+    def attach(cls, paths):
+        """
+        Builds a router over workers started by another router, e.g. in a client process.
+        :param paths: dict of worker name -> socket path.
+        """
+        router = cls()
+        for name, path in paths.items():
+            router._workers[name] = Worker(name, path, owned=False)
+            router._ring.add_node(name)
+        return router
+
+    @property
+    def paths(self):
+        return {name: worker.path for name, worker in self._workers.items()}
+
+    def add_worker(self):
+        """
+        Starts a new worker and only then puts it on the ring, so no event is routed to a cold socket.
+        :return: the name of the worker.
+        """
+        with self._lock:
+            name = 'worker-' + str(self._next_id)
+            self._next_id += 1
+        worker = Worker(name, os.path.join(self._socket_dir, name + '.sock'))
+        worker.start()
+        with self._lock:
+            self._workers[name] = worker
+            self._ring.add_node(name)
+        return name
+
+    def remove_worker(self, name):
+        """
+        Takes the worker off the ring first, so only ~1/N of the sessions move, then stops it.
+        :param name: the name of the worker.
+        """
+        with self._lock:
+            self._ring.remove_node(name)
+            worker = self._workers.pop(name)
+        worker.stop()
+
+    def close(self):
+        for name in list(self._workers):
+            self.remove_worker(name)
+        if os.path.isdir(self._socket_dir) and not os.listdir(self._socket_dir):
+            os.rmdir(self._socket_dir)
+
+    @property
+    def workers(self):
+        return self._ring.nodes
+
+    def worker_for(self, event):
+        with self._lock:
+            return self._ring.get_node(session_key(event))
+
+    def _connection(self, name):
+        connections = self._local.__dict__.setdefault('connections', {})
+        sock = connections.get(name)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(self._workers[name].path)
+            sock.settimeout(READ_TIMEOUT)
+            connections[name] = sock
+        return sock
+
+    def _drop_connection(self, name):
+        sock = self._local.__dict__.get('connections', {}).pop(name, None)
+        if sock is not None:
+            sock.close()
+
+    def handler(self, event, context):
+        """
+        Drop-in replacement of "handler.handler".
+        :param event: request payload.
+        :param context: information about current execution context.
+        :return: response to be serialized as JSON.
+        :raises OSError: if the worker failed or timed out after the event was sent to it.
+        """
+        name = self.worker_for(event)
+        if name is not None:
+            try:
+                sock = self._connection(name)
+                send_frame(sock, event)
+            except (OSError, KeyError, ValueError):
+                self._drop_connection(name)
+            else:
+                try:
+                    response = recv_frame(sock)
+                except (OSError, ValueError):
+                    # The worker may have handled the event, handling it again could run the turn twice
+                    self._drop_connection(name)
+                    raise
+                self.routed += 1
+                return response
+        # The shard is down or there are no workers at all
+        self.failovers += 1
+        return handler.handler(event, context)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _sample_event(session_id, message_id):
+    return {
+        'request': {'command': '', 'nlu': {'entities': [], 'tokens': [], 'intents': {}}, 'type': 'SimpleUtterance'},
+        'session': {'message_id': message_id, 'new': message_id == 0, 'session_id': session_id},
+        'state': {'session': {'scenario': 'StartBody'}},
+        'version': '1.0'
+    }
+
+
+def _run_client(paths, sessions, turns, offset, routed):
+    router = Router.attach(paths)
+    for session in range(offset, offset + sessions):
+        for turn in range(turns):
+            router.handler(_sample_event('session-' + str(session), turn), None)
+    with routed.get_lock():
+        routed.value += router.routed
+
+
+def benchmark(workers, sessions=64, turns=50):
+    """
+    Multi-process scaling check: one client process per worker sends "turns" events for each of its sessions.
+    :return: events per second handled by the workers, the ones handled by the clients after a failover are not
+        counted.
+    """
+    with Router(workers) as router:
+        per_client = sessions // workers
+        routed = multiprocessing.Value('q', 0)
+        clients = [multiprocessing.Process(target=_run_client,
+                                           args=(router.paths, per_client, turns, i * per_client, routed))
+                   for i in range(workers)]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        return routed.value / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() // 2 or 1
+    base = None
+    for n in range(1, max_workers + 1):
+        rate = benchmark(n)
+        base = base or rate
+        print('%2d workers: %8.0f events/s, speedup x%.2f' % (n, rate, rate / base))
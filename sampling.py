@@ -0,0 +1,137 @@
+import sys
+import math
+import random
+from bisect import bisect_right
+from collections import Counter
+
+"""
+Weighted sampling of the operands of the quiz questions.
+
+A task declares the distribution of every operand as weights over its values, e.g. a rare 0 among the bases:
+    BASES = AliasSampler(dict.fromkeys(range(1, 31), 1000), {0: 1})
+    base = BASES.sample()
+The weights are compiled once into a Walker alias table (Vose's method): a draw is one random number split into a
+column and a coin, O(1) for any number of values. An operand depending on another one, e.g. the exponent of a base,
+is drawn from one of the tiers of a Tiered sampler.
+
+The distributions are verified with the chi-squared test:
+    python sampling.py
+"""
+
+# Draws of the chi-squared test of a distribution
+TEST_DRAWS = 200000
+# Quantile of the standard normal distribution for the significance 0.001
+TEST_Z = 3.09
+
+
+class AliasSampler:
+    """ Discrete distribution compiled into a Walker alias table """
+    __slots__ = ('values', 'weights', '_probabilities', '_aliases')
+
+    def __init__(self, *weights):
+        """
+        :param weights: dicts of the values to their relative weights, the later ones update the earlier ones.
+        """
+        self.weights = {}
+        for part in weights:
+            self.weights.update(part)
+        self.weights = {value: weight for value, weight in self.weights.items() if weight > 0}
+        if not self.weights:
+            raise ValueError('A distribution needs a value with a positive weight')
+        self.values = tuple(self.weights)
+        n = len(self.values)
+        total = sum(self.weights.values())
+        # Every column is filled up to 1 with the alias of a value having more than its share
+        scaled = [self.weights[value] * n / total for value in self.values]
+        self._probabilities = [1.0] * n
+        self._aliases = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._probabilities[less] = scaled[less]
+            self._aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # The rest are columns of their own up to the rounding errors
+
+    def __len__(self):
+        return len(self.values)
+
+    def sample(self, rng=None):
+        """
+        :param rng: random.Random, the module generator by default.
+        :return: a random value.
+        """
+        u = (random.random() if rng is None else rng.random()) * len(self.values)
+        column = int(u)
+        if u - column < self._probabilities[column]:
+            return self.values[column]
+        return self.values[self._aliases[column]]
+
+    def probability(self, value):
+        return self.weights.get(value, 0) / sum(self.weights.values())
+
+
+class Tiered:
+    """ Distribution chosen by the tier of a key, e.g. the exponents by the base """
+    __slots__ = ('bounds', 'samplers')
+
+    def __init__(self, tiers):
+        """
+        :param tiers: list of (upper bound of the key, AliasSampler) in the ascending order, None is no bound.
+        """
+        self.bounds = [bound for bound, _ in tiers if bound is not None]
+        self.samplers = [sampler for _, sampler in tiers]
+        if len(self.samplers) != len(self.bounds) + 1 or tiers[-1][0] is not None:
+            raise ValueError('Only the last tier is without a bound')
+
+    def tier(self, key):
+        """
+        :return: AliasSampler of the first tier with the key below its bound.
+        """
+        return self.samplers[bisect_right(self.bounds, key)]
+
+    def sample(self, key, rng=None):
+        return self.tier(key).sample(rng)
+
+
+def chi_squared(sampler, draws=TEST_DRAWS, rng=None):
+    """
+    :return: (statistic, degrees of freedom) of the chi-squared test of the draws against the weights.
+    """
+    rng = rng or random.Random(0)
+    counts = Counter(sampler.sample(rng) for _ in range(draws))
+    statistic = 0.0
+    for value in sampler.values:
+        expected = sampler.probability(value) * draws
+        statistic += (counts[value] - expected) ** 2 / expected
+    return statistic, len(sampler.values) - 1
+
+
+def critical(freedom):
+    """
+    :return: the critical value of the chi-squared statistic at the significance 0.001, Wilson–Hilferty approximation.
+    """
+    return freedom * (1 - 2 / (9 * freedom) + TEST_Z * math.sqrt(2 / (9 * freedom))) ** 3 if freedom else 0.0
+
+
+def fits(sampler, draws=TEST_DRAWS, rng=None):
+    """
+    :return: True if the draws fit the weights at the significance 0.001.
+    """
+    statistic, freedom = chi_squared(sampler, draws, rng)
+    return statistic <= critical(freedom)
+
+
+if __name__ == '__main__':
+    from scenarios import distributions
+
+    failed = 0
+    for name, sampler in distributions():
+        statistic, freedom = chi_squared(sampler)
+        ok = statistic <= critical(freedom)
+        failed += not ok
+        print('%-30s chi2 %8.2f, df %2d, critical %6.2f %s' % (name, statistic, freedom, critical(freedom),
+                                                               'ok' if ok else 'FAILED'))
+    sys.exit(1 if failed else 0)
@@ -1,24 +1,49 @@
 import sys
 import inspect
+from fractions import Fraction
 from abc import ABC, abstractmethod
 from typing import Optional
-from random import randint, choice
+from random import randint, choice, getrandbits
 
+from events import Event
 from helper import Helper
 from request import Request
-from response_helpers import button
-
-helper = Helper({})
-NAME = "\"Математический мозговой тренажёр\""
+from response_helpers import button, big_image, item, items_list, DESCRIPTION_LIMIT, HEADER_LIMIT
+from cards import images, FORMULA, TEXT
+from locales import DEFAULT_LOCALE
+from tts import OPENING_SOUND, CLOSING_SOUND, TASK_SOUND, APPLAUSE_SOUNDS, SAD_SOUNDS, pause, build
+from numerals import Ratio, Degrees
+from equivalence import number_forms, angle_forms, matches
+from question_bank import load_tables
+from rounds import DEFAULT_MODE, SPEED_RUN, MARATHON, round_config
+from classroom import classroom, leaderboard_text, seeded_question
+from progress import progress
+from sampling import AliasSampler, Tiered
+import marathon
+import checkpoint
+import trigonometry
+
+helper = Helper(Event())
+# Read from the memory-mapped question bank if it is built
+TRIGONOMETRY, FACTS = load_tables()
+
+
+def init_helper(event, degraded=False):
+    global helper
+    helper = Helper(event, degraded)
 
 
-def init_helper(event):
-    global helper
-    helper = Helper(event)
+def show_cards():
+    """
+    :return: True if the response gets a card: the device has a screen and the server is not overloaded.
+    """
+    return helper.screen and not helper.degraded
 
 
 class Scenario(ABC):
     """ Abstract class of scenarios """
+    __slots__ = ()
+
     @classmethod
     def id(cls):
         return cls.__name__
@@ -37,23 +62,43 @@ class Scenario(ABC):
     def handle_local_intents(self, request: Request) -> Optional[str]:
         raise NotImplementedError()
 
-    def fallback(self, request: Request, buttons=None):
-        """ Called when the user's intent is not clear """
-        excuses = ['Прошу прощения. ', 'Простите меня. ', 'Приношу свои извинения. ', 'Извините. ', '']
-        incomprehension = ['Я вас не поняла.', 'Пожалуйста повторите еще раз.',
-                           'Пожалуйста, попробуйте переформулировать запрос.']
-        return self.make_response(choice(excuses) + choice(incomprehension) + ' Скажите \"Повтори\", чтобы я повторила.'
-                                  , buttons=buttons + [
-                                      button('Повтори', hide=True),
-                                      button('В самое начало', hide=True),
-                                      button('Помощь', hide=True),
-                                      button('Что умеет навык?', hide=True)
-                                  ])
+    def fallback(self, request: Request, buttons=None, state=None):
+        """
+        Called when the user's intent is not clear.
+        :param state: session state to keep, e.g. of the question the user is asked to answer again.
+        """
+        locale = helper.locale
+        text = locale.choice('fallback.excuses') + locale.choice('fallback.incomprehension') + locale['fallback.repeat']
+        return self.make_response(text, state=state, buttons=buttons + [button(title, hide=True)
+                                                                        for title in locale['fallback.buttons']])
+
+    def repeat(self, state):
+        """
+        Rebuilds the previous response from the session state if it was not kept by this instance.
+        :param state: session state of the previous response, it is kept as it is.
+        :return: response or None if the scenario can not rebuild it.
+        """
+        return None
+
+    @classmethod
+    def card_sources(cls):
+        """
+        :return: iterable of (source, kind) of the card images of the scenario, see "cards.py".
+        """
+        return ()
+
+    @classmethod
+    def distributions(cls):
+        """
+        :return: iterable of (name, AliasSampler) of the operands the scenario draws, see "sampling.py".
+        """
+        return ()
 
     def make_response(self, text, tts=None, card=None, state=None, buttons=None, directives=None, end_session=None):
         """
         :param text: required property. The text to be shown and spoken to the user.
-        :param tts: response in TTS (text-to-speech) format. If tts is empty tts = text
+        :param tts: response in TTS (text-to-speech) format, a string or a list of fragments, see "tts.py".
+            If tts is empty tts = text
         :param card: posts with image support. If the application is able to display the card to the user,
             the response.text property is not used.
         :param state: an object containing the state of the skill to store.
@@ -66,8 +111,12 @@ class Scenario(ABC):
         """
         if tts is None:
             tts = text
-        tts = '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/661bc281-2f05-4593-9cad-6a6f9caa3e1c.opus\">' + \
-              tts + '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/bdc67ca3-0972-4599-bc26-dedb90f25c45.opus\">'
+        if type(tts) is list:
+            fragments = [OPENING_SOUND, *tts, CLOSING_SOUND]
+        else:
+            fragments = [OPENING_SOUND, tts, CLOSING_SOUND]
+        # Sounds are skipped under overload
+        tts = build(fragments, sounds=not helper.degraded)
         response = {
             'text': text,
             'tts': tts,
@@ -101,63 +150,57 @@ class Scenario(ABC):
 
 class Welcome(Scenario):
     """ Welcome scenario """
+    __slots__ = ()
+
     def reply(self, request: Request):
-        variants = ['Добро пожаловать в навык ' + NAME + '. Данный навык поможет детям и' 
-                    ' школьникам разобраться как в базовых, так и в углублённых арифметических действиях, используя ' 
-                    'устный счёт. Например, сложение, вычитание, умножение и так далее. Скажите \"Начнем\", чтобы ' 
-                    'начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
-                    'Привет, это навык ' + NAME + ' давай посчитаем? Скажите \"Начнем\", чтобы '
-                    'начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
-                    'Приветствую тебя, данный навык поможет детям и школьникам разобраться как в базовых, так и в '
-                    'углублённых арифметических действиях, используя устный счёт. Например, сложение, вычитание, '
-                    'умножение и так далее, займемся устным счетом? Скажите \"Начнем\", чтобы начать или \"Что ты '
-                    'умеешь?\", чтобы узнать, что умеет навык.',
-                    'Добро пожаловать в навык ' + NAME + ', посчитаем? Скажите \"Начнем\", '
-                    'чтобы начать или \"Что ты умеешь?\", чтобы узнать, что умеет навык.',
-                    'Привет! Вы зашли в навык ' + NAME + '. Давайте оценим твои умения! Если вы'
-                    ' хотите узнать, что я умею, так и скажите. Если вы хотите остановить навык, скажите \"Хватит\". '
-                    'Вы готовы?']
-        text = choice(variants)
-        return self.make_response(text, buttons=self.buttons)
+        saved = saved_round()
+        if saved is not None:
+            locale = helper.locale
+            text = locale.text(locale['resume.offer'], task_name(saved.task), saved.question_number + 1,
+                               round_config(checkpoint.MODES[saved.mode]).questions)
+            return self.make_response(text, buttons=[button(locale.choice('welcome.agreements'), hide=True),
+                                                     button(locale.choice('welcome.failures'), hide=True)])
+        text = helper.locale.choice('welcome.reply')
+        # A checkpoint too old to be continued is deleted
+        return forget_checkpoint(self.make_response(text, buttons=self.buttons))
 
     def help(self, request: Request):
-        variants = ['Вы оказались в навыке ' + NAME + '! Вы можете узнать, что умеет этот навык'
-                    ', сказав \"Что умеет этот навык?\". Или начать игру, сказав \"Начнем\"',
-                    'Это навык ' + NAME + '. Чтобы узнать, что умеет навык, нужно сказать \"Что'
-                    ' ты умеешь\". Чтобы вернуться назад, так и скажите. Или может просто начнем?']
-        text = choice(variants)
+        text = helper.locale.choice('welcome.help')
         return self.make_response(text, buttons=self.buttons + [
-            button('Повторить', hide=True)
+            button(helper.locale['button.repeat'], hide=True)
         ])
 
     def handle_local_intents(self, request: Request):
+        code = joined_room_code(request)
+        if code is not None or 'join_room' in request.intents:
+            return join_room(self, code)
+        saved = saved_round()
         if 'start_confirm' in request.intents or 'YANDEX.CONFIRM' in request.intents:
-            return StartBody()
+            return resume(saved) if saved is not None else StartBody()
         elif 'start_reject' in request.intents or 'YANDEX.REJECT' in request.intents:
-            return Parting()
+            # The user chooses another task instead of the unfinished one
+            return StartBody() if saved is not None else Parting()
         elif 'help' in request.intents:
             return Help()
 
     @property
     def buttons(self):
-        agreements = ['Да', 'Давай', 'С радостью']
-        failures = ['Нет', 'В другой раз', 'Не сейчас', 'Как-нибудь потом']
-        helps = ['Что умеет этот навык?']
         buttons = [
-            button(choice(agreements), hide=True),
-            button(choice(failures), hide=True),
-            button(choice(helps), hide=True)
+            button(helper.locale.choice('welcome.agreements'), hide=True),
+            button(helper.locale.choice('welcome.failures'), hide=True),
+            button(helper.locale.choice('welcome.helps'), hide=True)
         ]
         return buttons
 
 
 class Parting(Scenario):
     """ Parting scenario """
+    __slots__ = ()
+
     def reply(self, request: Request):
-        variants = ['Хорошо, до новых встреч!', 'Жаль, а так хотелось посмотреть вас в деле.',
-                    'Ну ничего в следующий раз.', 'Ну ничего. Будет скучно - обращайтесь.']
-        text = choice(variants)
-        return self.make_response(text, end_session=True)
+        text = helper.locale.choice('parting.reply')
+        # The user refused to go on, the unfinished round is not offered again
+        return forget_checkpoint(self.make_response(text, end_session=True))
 
     def help(self, request):
         pass
@@ -172,38 +215,17 @@ class Parting(Scenario):
 
 class Help(Scenario):
     """ This scenario shows what the skill is capable of """
+    __slots__ = ()
+
     def reply(self, request):
-        variants = ['Навык ' + NAME + ' представляет из себя программу, которая  предлагает'
-                    ' выполнить расчёты в уме, используя простейшие арифметические действия, также может рассказать'
-                    ' что-нибудь интересное и увлекательное. Скажите \"В начало\", чтобы вернуться в начало навыка.'
-                    ' Вы можете попросить повторить последнее сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для'
-                    ' того, чтобы покинуть навык.',
-                    '' + NAME + ' - полезный и увлекательный навык, который в игровой форме'
-                    ' поможет разобраться с умением счёта в уме. Навык предложит решить вам задания, укажет на ваши'
-                    ' ошибки и оценит ваши умения. Скажите \"В начало\", чтобы вернуться в начало навыка. Вы можете'
-                    ' попросить повторить последнее сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для того,'
-                    ' чтобы покинуть навык.',
-                    'В жтом навыке вы будете выполнять расчёты без ручки и бумаги. Ваша цель ответить на все вопросы'
-                    ' используя только устный счёт. А еще навык укажет на ваши ошибки и оценит ваши умения. Скажите '
-                    '\"В начало\", чтобы вернуться в начало навыка. Вы можете попросить повторить последнее сообщение, '
-                    'сказав \"Повтори\". Команда \"Стоп\" нужна для того, чтобы покинуть навык.',
-                    'Этот навык нацелен на работу с простейшими арифметическими действиями: сложение, вычитание, '
-                    'умножение, деление, операции с дробями, возведение в степень, вычисление квадратного корня, '
-                    'тригонометрические табличные значения. Также навык укажет на ваши ошибки и оценит ваши умения. '
-                    'Скажите \"В начало\", чтобы вернуться в начало навыка. Вы можете попросить повторить последнее '
-                    'сообщение, сказав \"Повтори\". Команда \"Стоп\" нужна для того, чтобы покинуть навык. Не '
-                    'волнуйтесь, по ходу действий вы всё поймёте.']
-        text = choice(variants)
-        return self.make_response(text + ' Начнём?', buttons=self.buttons)
+        text = helper.locale.choice('help.reply')
+        return self.make_response(text + helper.locale['help.start'], buttons=self.buttons)
 
     def help(self, request: Request):
-        variants = ['Если вы хотите вернуться назад, просто скажите \"Назад\".',
-                    'Вы узнали, что умеет навык, хотите вернуться назад?',
-                    'Не переживайте, вы все поймете, вернемся назад?']
-        text = choice(variants)
+        text = helper.locale.choice('help.help')
         return self.make_response(text, buttons=self.buttons + [
-            button('Повторить', hide=True),
-            button('Назад', hide=True)
+            button(helper.locale['button.repeat'], hide=True),
+            button(helper.locale['button.back'], hide=True)
         ])
 
     def handle_local_intents(self, request: Request):
@@ -214,293 +236,469 @@ class Help(Scenario):
 
     @property
     def buttons(self):
-        confirms = ['Давай начнём', 'Погнали', 'Поехали', 'Вперед']
         buttons = [
-            button(choice(confirms), hide=True),
+            button(helper.locale.choice('help.confirms'), hide=True),
         ]
         return buttons
 
 
+def chosen_task(request: Request):
+    """
+    :return: the quiz scenario class the user has chosen or None.
+    """
+    if 'addition_subtraction' in request.intents:
+        return AdditionSubtraction
+    elif 'multiplication_division' in request.intents:
+        return MultiplicationDivision
+    elif 'fractions' in request.intents:
+        return Fractions
+    elif 'exponentiation' in request.intents:
+        return Exponentiation
+    elif 'square_root' in request.intents:
+        return SquareRoot
+    elif 'trigonometry' in request.intents:
+        return Trigonometry
+
+    for el in request.entities:
+        if el['value'] == 1:
+            return AdditionSubtraction
+        elif el['value'] == 2:
+            return MultiplicationDivision
+        elif el['value'] == 3:
+            return Fractions
+        elif el['value'] == 4:
+            return Exponentiation
+        elif el['value'] == 5:
+            return SquareRoot
+        elif el['value'] == 6:
+            return Trigonometry
+
+
+def joined_room_code(request: Request):
+    """
+    :return: the code of the room the student wants to join or None.
+    """
+    if 'join_room' in request.intents:
+        # The intent may be recognized without the code
+        code = request.intents['join_room'].get('slots', {}).get('Code')
+        if code is not None:
+            return code.get('value')
+    if 'класс' in request.tokens or 'комната' in request.tokens or 'комнату' in request.tokens:
+        for el in request.entities:
+            if el.get('type') == 'YANDEX.NUMBER' and 1000 <= el['value'] <= 9999:
+                return el['value']
+
+
+def join_room(scenario, code):
+    """
+    Joins the student to the room and starts the task of the room.
+    :param scenario: the current scenario, it answers if the room can not be joined.
+    :param code: the code of the room or None if the student did not say it.
+    """
+    if code is None:
+        return scenario.make_response(helper.locale['room.code'], buttons=scenario.buttons)
+    room = classroom.get(code)
+    if room is None or room.task is None:
+        text = helper.locale.text(helper.locale['room.not_found'], code)
+        return scenario.make_response(text, buttons=scenario.buttons)
+    helper.room = code
+    if helper.user_id not in room.leaderboard:
+        classroom.record(room, helper.user_id, 0)
+    return SCENARIOS[room.task]()
+
+
+def persist_checkpoint(response, value):
+    """
+    Puts the checkpoint of the round into the persistent state of the response.
+    :param value: encoded checkpoint or None to delete it.
+    """
+    if helper.authorized:
+        # A null value deletes the key
+        response['user_state_update'] = {checkpoint.KEY: value}
+    else:
+        # The application state is replaced as a whole
+        response['application_state'] = {} if value is None else {checkpoint.KEY: value}
+    helper.saved = value
+    return response
+
+
+def forget_checkpoint(response):
+    """
+    Deletes the checkpoint of the unfinished round, the response is unchanged if there is none.
+    """
+    if helper.saved is not None:
+        persist_checkpoint(response, None)
+    return response
+
+
+def saved_round():
+    """
+    :return: Checkpoint of the unfinished round the user can continue or None.
+    """
+    if helper.saved is None:
+        return None
+    saved = checkpoint.load(helper.saved, helper.now)
+    if saved is None or saved.task >= len(QUIZ_TASKS) or \
+            saved.question_number >= round_config(checkpoint.MODES[saved.mode]).questions:
+        return None
+    return saved
+
+
+def resume(saved):
+    """
+    Restores the round of the checkpoint, its current question is generated again from the seed.
+    :return: the scenario of the task of the round.
+    """
+    helper.mode = checkpoint.MODES[saved.mode]
+    helper.seed = saved.seed
+    helper.question_number = saved.question_number
+    helper.points = saved.points
+    helper.score = saved.score
+    helper.asked = list(saved.asked)
+    helper.resumed = True
+    return QUIZ_TASKS[saved.task]()
+
+
+def task_name(index):
+    """
+    :return: the name of the task type in the task choice, e.g. "операции с дробями".
+    """
+    return helper.locale['start.options_text'][index].split(') ', 1)[-1]
+
+
+# Spoken between the options of the task choice
+OPTION_PAUSE = pause(500)
+
+
 class StartBody(Scenario):
     """ This scenario prompts user to select a task to choose from """
+    __slots__ = ('_options_text', '_options_tts')
+
     def __init__(self):
-        self._options_text = ['1) сложение, вычитание',
-                              '2) умножение, деление',
-                              '3) операции с дробями',
-                              '4) возведение в степень',
-                              '5) вычисление квадратного корня',
-                              '6) тригонометрические табличные значения']
-        self._options_tts = ['sil <[500]> первое. сложение, вычитание sil <[500]> ',
-                             'второе. умножение, деление sil <[500]> ',
-                             'третье. операции с дробями sil <[500]> ',
-                             'четвертое. возведение в степень sil <[500]> ',
-                             'пятое. вычисление квадратного корня sil <[500]> ',
-                             'шестое. тригонометрические табличные значения sil <[500]> ']
+        self._options_text = helper.locale['start.options_text']
+        self._options_tts = helper.locale['start.options_tts']
 
     def reply(self, request: Request):
-        variants = ['С каким типом заданий вы бы хотели поработать?', 'Выберите тип задания.',
-                    'Какое задание вам по душе?']
-        text = choice(variants)
-        tts = text +\
-               self._options_tts[0] +\
-               self._options_tts[1] +\
-               self._options_tts[2] +\
-               self._options_tts[3] +\
-               self._options_tts[4] +\
-               self._options_tts[5]
-        return self.make_response(text, tts=tts, buttons=self.buttons)
+        text = helper.locale.choice('start.reply')
+        tts = [text, OPTION_PAUSE]
+        for option in self._options_tts:
+            tts.append(option)
+            tts.append(OPTION_PAUSE)
+        if helper.mode == SPEED_RUN:
+            text = helper.locale['start.speed_run'] + text
+            tts.insert(0, helper.locale['start.speed_run'])
+        # The unfinished round is left
+        return forget_checkpoint(self.make_response(text, tts=tts, buttons=self.buttons, state=self.state))
 
     def help(self, request: Request):
-        variants = ['Сейчас вам нужно выбрать один из типов заданий, которые вы хотите пройти. Если хотите еще раз'
-                    ' ознакомиться со списком вариантов скажите \"Повторить\" или просто выберите задание.',
-                    'Навык содержит 6 типов заданий, ваша задача выбрать один из типов. Чтобы услышать варианты выбора,'
-                    ' скажите \"Повторить\".']
-        text = choice(variants)
+        text = helper.locale.choice('start.help')
         return self.make_response(text, buttons=self.buttons + [
-            button('Повторить', hide=True)
+            button(helper.locale['button.repeat'], hide=True)
         ])
 
     def handle_local_intents(self, request: Request):
         if 'repeat_variant' in request.intents:
-            if request.intents['repeat_variant']['slots']['Variant']['value'] > 0 and request.intents['repeat_variant']['slots']['Variant']['value'] < 7:
-                text = self._options_text[request.intents['repeat_variant']['slots']['Variant']['value'] - 1] + '. Назовите номер, выбранного задания.'
-                tts = self._options_tts[request.intents['repeat_variant']['slots']['Variant']['value'] - 1] + ' Назовите номер, выбранного задания.'
-                return self.make_response(text, tts=tts, buttons=self.buttons)
+            variant = request.intents['repeat_variant']['slots']['Variant']['value']
+            if 0 < variant <= len(self._options_text):
+                text = self._options_text[variant - 1] + '. ' + helper.locale['start.choose']
+                tts = [self._options_tts[variant - 1], OPTION_PAUSE, helper.locale['start.choose']]
+                return self.make_response(text, tts=tts, buttons=self.buttons, state=self.state)
             else:
                 return StartBody()
 
-        if 'addition_subtraction' in request.intents:
-            return AdditionSubtraction()
-        elif 'multiplication_division' in request.intents:
-            return MultiplicationDivision()
-        elif 'fractions' in request.intents:
-            return Fractions()
-        elif 'exponentiation' in request.intents:
-            return Exponentiation()
-        elif 'square_root' in request.intents:
-            return SquareRoot()
-        elif 'trigonometry' in request.intents:
-            return Trigonometry()
+        # The task chosen next is played in the speed-run mode
+        if 'speed_run' in request.intents or 'скорость' in request.tokens:
+            helper.mode = SPEED_RUN
+            return StartBody()
 
-        for el in request.entities:
-            if el['value'] == 1:
-                return AdditionSubtraction()
-            elif el['value'] == 2:
-                return MultiplicationDivision()
-            elif el['value'] == 3:
-                return Fractions()
-            elif el['value'] == 4:
-                return Exponentiation()
-            elif el['value'] == 5:
-                return SquareRoot()
-            elif el['value'] == 6:
-                return Trigonometry()
+        # Classroom mode
+        if 'create_room' in request.intents or \
+                'класс' in request.tokens and ('создай' in request.tokens or 'создать' in request.tokens):
+            room = classroom.create(helper.user_id)
+            helper.room = room.code
+            return TeacherRoom()
+        code = joined_room_code(request)
+        if code is not None or 'join_room' in request.intents:
+            return join_room(self, code)
+
+        if 'review' in request.intents or 'ошибки' in request.tokens or 'повторение' in request.tokens:
+            return Review()
+
+        if 'marathon' in request.intents or 'марафон' in request.tokens:
+            return Marathon()
+
+        task = chosen_task(request)
+        if task is not None:
+            return task()
 
     @property
     def buttons(self):
-        buttons = [
-            button(self._options_text[0]),
-            button(self._options_text[1]),
-            button(self._options_text[2]),
-            button(self._options_text[3]),
-            button(self._options_text[4]),
-            button(self._options_text[5]),
+        buttons = [button(option) for option in self._options_text] + [
+            button(helper.locale['start.speed_run_button'], hide=True),
+            button(helper.locale['start.review_button'], hide=True),
+            button(helper.locale['start.marathon_button'], hide=True),
         ]
         return buttons
 
+    @property
+    def state(self):
+        if helper.mode == DEFAULT_MODE:
+            return None
+        return {'mode': helper.mode}
 
-class AdditionSubtraction(Scenario):
-    def reply(self, request):
-        num1, num2 = randint(-1000, 1000), randint(-1000, 1000)
-        text = ''
-        tts = ''
-        if helper.question_number == 0:
-            # Rules
-            text = 'Вам поочерёдно представятся 10 примеров, содержащих операции сложения и вычитания, для решения ' \
-                   'на время. На каждый из них у вас есть 30 секунд. Удачи!\n'
-            tts = text
-        else:
-            # If answer is correct
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            # Else show the correct answer
-            else:
-                variants = ['Верный ответ: ' + str(helper.answer) + '.\n',
-                            'Ваш ответ неверный, правильный ответ: ' + str(helper.answer) + '.\n',
-                            'Увы, вы ответили неправильно, ответом было ' + str(helper.answer) + '\n',
-                            'Вы дали неверный ответ, верным был ' + str(helper.answer) + '\n',
-                            'Этот ответ был неправильный. Верный ответ: ' + str(helper.answer) + '\n']
-                text = choice(variants)
-                tts = text
-        answer = 0
-        example = ''
-        # Randomize the operation. 1 - addition, 2 - subtraction
-        if randint(1, 2) == 1:
-            text += str(num1) + ' + ' + str(num2) + ' = ?'
-            variants = ['сколько будет ' + str(num1) + ' плюс ' + str(num2),
-             'реши ' + str(num1) + ' плюс ' + str(num2), 'сумма ' + str(num1) + ' и ' + str(num2) + ' равна',
-             str(num1) + ' плюс ' + str(num2) + ' б+уудет', str(num1) + ' плюс ' + str(num2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
-            answer = num1+num2
-        else:
-            text += str(num1) + ' - ' + str(num2) + ' = ?'
-            variants = ['сколько будет ' + str(num1) + ' минус ' + str(num2),
-             'реши ' + str(num1) + ' минус ' + str(num2), 'разница ' + str(num1) + ' и ' + str(num2) + ' равна',
-             str(num1) + ' минус ' + str(num2) + ' б+уудет', str(num1) + ' минус ' + str(num2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
-            answer = num1-num2
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
-        if helper.question_number != 0:
-            tts = tts + example
-        return self.make_response(text, tts, state={
-            'points': helper.points,
-            'question_number': helper.question_number,
-            'answer': answer
-        })
 
-    def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
-        if helper.question_number == 0:
-            text += ' Вам поочерёдно представляются 10 примеров, содержащих операции сложения и вычитания, для ' \
-                    'решения на время. На каждый из них у вас есть 30 секунд. Главное не торопитесь, времени у вас ' \
-                    'достаточно.'
-        elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов. Чтобы сложить числа с разными ' \
-                    'знаками, нужно из большего модуля вычесть меньший модуль, и перед полученным ответом поставить ' \
-                    'знак того числа, модуль которого больше. Чтобы из меньшего числа вычесть большее, нужно из ' \
-                    'большего числа вычесть меньшее и перед полученным ответом поставить минус.'
-        else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + \
-                    ' вопросов, правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
-        })
+class Question:
+    """ Generated question of a quiz """
+    __slots__ = ('text', 'tts', 'example', 'answer', 'state')
+
+    def __init__(self, text, tts, example, answer, state=None):
+        """
+        :param text: the question shown to the user.
+        :param tts: the question spoken to the user.
+        :param example: the question spoken once again after the sound.
+        :param answer: the expected answer, it is stored in the session state.
+        :param state: additional session state of the question.
+        """
+        self.text = text
+        self.tts = tts
+        self.example = example
+        self.answer = answer
+        self.state = state
 
-    def handle_local_intents(self, request: Request):
-        # If user activates help or back intent
-        if helper.points == -1 or 'back' in request.intents:
-            return StartBody()
-        elif 'answer' in request.intents:
-            if request.intents['answer']['slots']['Answer']['value'] == helper.answer:
-                helper.points += 1
-                helper.correct = True
-        helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
-                return Congratulations()
-            else:
-                return EndBody()
-        else:
-            return AdditionSubtraction()
+
+class QuizScenario(Scenario):
+    """
+    Round of questions of one task type, see "rounds.py" for the length and the time limit of the round. A task type
+    only generates questions and checks answers, the loop, the feedback and the state handling are shared. Texts of a
+    task type are the messages of the locale prefixed with its id, e.g. 'Fractions.description'.
+    """
+    __slots__ = ()
 
     @property
-    def buttons(self):
-        return []
+    def description(self):
+        """
+        What the questions are about, e.g. 'примеров, где вам нужно найти квадратный корень, для решения на время'.
+        """
+        return helper.locale[self.id() + '.description']
 
+    @property
+    def rules(self):
+        """ Additional rules told before the first question """
+        return helper.locale.get(self.id() + '.rules', '')
+
+    @property
+    def help_tips(self):
+        """ Tips told if the user asks for help and has not answered any question correctly """
+        return helper.locale[self.id() + '.help_tips']
+
+    def variants(self, name):
+        """
+        :return: templates of the spoken question "name" of the task type.
+        """
+        return helper.locale[self.id() + '.' + name]
+
+    @abstractmethod
+    def generate(self):
+        """
+        :return: Question to be asked.
+        """
+        raise NotImplementedError()
+
+    def check_answer(self, request: Request):
+        """
+        :return: True if the user answered the current question correctly.
+        """
+        return 'answer' in request.intents and \
+            request.intents['answer']['slots']['Answer']['value'] == helper.answer
+
+    def answer_value(self):
+        """
+        :return: the answer to the current question, it is written with digits in the text and spoken in words.
+        """
+        return helper.answer
+
+    def answer_state(self):
+        """
+        :return: session state "check_answer" needs to check the answer to the current question.
+        """
+        return {'answer': helper.answer}
+
+    def card(self, text, question):
+        """
+        :param text: text shown before the question.
+        :return: card with the image of the question or None if there is no image or the text does not fit.
+        """
+        image_id = images.get(question.text)
+        if image_id is None or len(text) > DESCRIPTION_LIMIT:
+            return None
+        return big_image(image_id, question.text, text)
+
+    def repeat(self, state):
+        # The current question, the feedback on the previous answer is not repeated
+        if helper.question is None:
+            return None
+        text, tts = helper.question
+        return self.make_response(text, [tts, TASK_SOUND], state=dict(state))
+
+    @staticmethod
+    def question(text, variants, args, answer, state=None):
+        """
+        Builds a question spoken with one of the variants.
+        :param variants: templates of the spoken question, "args" are substituted into them.
+        """
+        locale = helper.locale
+        return Question(text, locale.speech(choice(variants), *args), locale.speech(choice(variants), *args), answer,
+                        state)
 
-class MultiplicationDivision(Scenario):
     def reply(self, request):
-        num1, num2 = randint(-50, 50), randint(-50, 50)
-        text = ''
-        tts = ''
-        if helper.question_number == 0:
-            text = 'Вам поочерёдно представятся 10 примеров, содержащих операции умножения и деления, для решения на' \
-                   ' время. На каждый из них у вас есть 30 секунд. Удачи!\n'
-            tts = text
+        locale = helper.locale
+        config = round_config(helper.mode)
+        room = classroom.get(helper.room)
+        # A round outside a room is checkpointed to be continued in another session, see "checkpoint.py"
+        resumable = room is None and helper.user_id is not None and helper.mode in checkpoint.MODES and \
+            type(self) in QUIZ_TASKS
+        # Trigonometry variants asked before the question
+        asked = helper.asked
+        # Every participant of a room gets the same questions
+        if room is not None:
+            question = room.question(self.generate, helper.question_number)
+        elif resumable:
+            if helper.seed is None:
+                helper.seed = getrandbits(30)
+            question = seeded_question(self.generate, helper.seed, helper.question_number)
         else:
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            else:
-                variants = ['Верный ответ: ' + str(helper.answer) + '.\n', 
-                            'Ваш ответ неверный, правильный ответ: ' + str(helper.answer) + '.\n', 
-                            'Увы, вы ответили неправильно, ответом было ' + str(helper.answer) + '\n',
-                            'Вы дали неверный ответ, верным был ' + str(helper.answer) + '\n', 
-                            'Этот ответ был неправильный. Верный ответ: ' + str(helper.answer) + '\n']
-                text = choice(variants)
-                tts = text
-        answer = 0
-        example = ''
-        # Randomize the operation. 1 - multiplication, 2 - division
-        if randint(1, 2) == 1:
-            text += str(num1) + ' * ' + str(num2) + ' = ?'
-            variants = ['сколько будет ' + str(num1) + ' умножить на ' + str(num2), 
-                        'реши ' + str(num1) + ' умножить на ' + str(num2),
-                        'произведение ' + str(num1) + ' и ' + str(num2) + ' равно',
-                        str(num1) + ' умножить на ' + str(num2) + ' б+уудет',
-                        str(num1) + ' умноженное на ' + str(num2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
-            answer = num1 * num2
+            question = self.generate()
+        if helper.resumed:
+            text = tts = locale.text(locale['resume.continue'], helper.question_number + 1, config.questions)
+        elif helper.question_number == 0:
+            text, tts = locale.render(locale['quiz.intro'], config.questions, self.description, config.time_limit,
+                                      locale.plural(config.time_limit, 'noun.seconds'), self.rules)
+        # If answer is correct
+        elif helper.correct:
+            text = tts = locale.choice('quiz.correct')
+        # If answer is correct, but the time is over
+        elif helper.late:
+            text = tts = locale.choice('quiz.late')
+        # Else show the correct answer
         else:
-            answer = num1
-            num1 = num1 * num2
-            text += str(num1) + ' / ' + str(num2) + ' = ?'
-            variants = ['сколько будет ' + str(num1) + ' делить на ' + str(num2),
-             'реши ' + str(num1) + ' делить на ' + str(num2), 'частное ' + str(num1) + ' и ' + str(num2) + ' равно',
-             str(num1) + ' делить на ' + str(num2) + ' б+уудет', str(num1) + ' деленное на ' + str(num2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
+            text, tts = locale.render(locale.choice('quiz.incorrect'), self.answer_value())
+        card = None
+        if show_cards():
+            card = self.card(text.rstrip('\n'), question)
+        tts = [tts, question.tts, TASK_SOUND]
         if helper.question_number != 0:
-            tts = tts + example
-        return self.make_response(text, tts, state={
+            tts.append(question.example)
+        state = {
             'points': helper.points,
             'question_number': helper.question_number,
-            'answer': answer
-        })
+            'answer': question.answer,
+            'asked_at': helper.now,
+            'times': helper.times,
+            'score': helper.score,
+            # Kept to put the question into the review deck if the answer is wrong
+            'question': [question.text, question.tts]
+        }
+        if helper.mode != DEFAULT_MODE:
+            state['mode'] = helper.mode
+        if room is not None:
+            state['room'] = room.code
+        if resumable:
+            state['seed'] = helper.seed
+        if question.state is not None:
+            state.update(question.state)
+        response = self.make_response(text + question.text, tts, card=card, state=state)
+        if resumable:
+            persist_checkpoint(response, checkpoint.encode(checkpoint.Checkpoint(
+                QUIZ_TASKS.index(type(self)), helper.seed, helper.question_number, helper.points, helper.score,
+                checkpoint.MODES.index(helper.mode), helper.now // 60000, tuple(asked))))
+        return response
 
     def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
+        locale = helper.locale
+        text = tts = locale['quiz.help']
         if helper.question_number == 0:
-            text += ' Вам поочерёдно представляются 10 примеров, содержащих операции умножения и деления, для решения' \
-                    ' на время. На каждый из них у вас есть 30 секунд. Главное не торопитесь, времени у вас достаточно.'
+            config = round_config(helper.mode)
+            text, tts = locale.render(text + locale['quiz.help_intro'], config.questions, self.description,
+                                      config.time_limit, locale.plural(config.time_limit, 'noun.seconds'))
         elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов. Попробуйте представлять числа в ' \
-                    'виде суммы или разности чисел, одно или несколько из которых \"круглое\". На 10, 20, 100, 1000 и' \
-                    ' другие круглые числа умножать быстрее, в уме нужно сводить всё к таким простым операциям.'
+            text = tts = text + locale['quiz.help_no_points'] + choice(self.help_tips)
         else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + \
-                    ' вопросов, правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
-        })
+            text, tts = locale.render(text + locale['quiz.help_points'], helper.points, helper.question_number,
+                                      locale.plural(helper.question_number, 'noun.questions_gen'),
+                                      self.answer_value())
+        # The round can not be continued after the help
+        return forget_checkpoint(self.make_response(text + locale['quiz.help_back'], tts + locale['quiz.help_back'],
+                                                    buttons=self.buttons + [
+                                                        button(locale['button.back'], hide=True)
+                                                    ], state={
+                                                        'points': -1
+                                                    }))
 
     def handle_local_intents(self, request: Request):
+        config = round_config(helper.mode)
         # If user activates help or back intent
         if helper.points == -1 or 'back' in request.intents:
             return StartBody()
-        elif 'answer' in request.intents:
-            if request.intents['answer']['slots']['Answer']['value'] == helper.answer:
+        # The time to answer is measured from the time the question was asked at
+        elapsed = None
+        if helper.asked_at is not None:
+            elapsed = helper.now - helper.asked_at
+            helper.times.append(elapsed)
+        if self.check_answer(request):
+            if config.in_time(elapsed):
                 helper.points += 1
                 helper.correct = True
+                helper.score += config.answer_score(elapsed)
+                room = classroom.get(helper.room)
+                if room is not None:
+                    classroom.record(room, helper.user_id, helper.score)
+            else:
+                helper.late = True
+        elif helper.question is not None and helper.user_id is not None:
+            progress.deck(helper.user_id).add(self.id(), helper.question[0], helper.question[1], self.answer_state(),
+                                              helper.now // 1000)
+            progress.save(helper.user_id)
         helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
+        if helper.question_number == config.questions:
+            if helper.points == config.questions:
                 return Congratulations()
             else:
                 return EndBody()
         else:
-            return MultiplicationDivision()
+            return type(self)()
 
     @property
     def buttons(self):
         return []
 
 
+class AdditionSubtraction(QuizScenario):
+    __slots__ = ()
+
+    def generate(self):
+        num1, num2 = randint(-1000, 1000), randint(-1000, 1000)
+        # Randomize the operation. 1 - addition, 2 - subtraction
+        if randint(1, 2) == 1:
+            return self.question(str(num1) + ' + ' + str(num2) + ' = ?', self.variants('addition'), (num1, num2),
+                                 num1 + num2)
+        return self.question(str(num1) + ' - ' + str(num2) + ' = ?', self.variants('subtraction'), (num1, num2),
+                             num1 - num2)
+
+
+class MultiplicationDivision(QuizScenario):
+    __slots__ = ()
+
+    def generate(self):
+        num1, num2 = randint(-50, 50), randint(-50, 50)
+        # Randomize the operation. 1 - multiplication, 2 - division
+        if randint(1, 2) == 1:
+            return self.question(str(num1) + ' * ' + str(num2) + ' = ?', self.variants('multiplication'),
+                                 (num1, num2), num1 * num2)
+        dividend = num1 * num2
+        return self.question(str(dividend) + ' / ' + str(num2) + ' = ?', self.variants('division'), (dividend, num2),
+                             num1)
+
+
 def find_gcd(a, b):
     while a != 0 and b != 0:
         if a > b:
@@ -515,569 +713,388 @@ def find_lcm(a, b):
     return a*b // find_gcd(a, b)
 
 
-class Fractions(Scenario):
-    def reply(self, request):
-        operation = randint(1, 4)
-        numerator1, denominator1 = 1, 1
-        numerator2, denominator2 = 1, 1
-        text = ''
-        tts = ''
-        if helper.question_number == 0:
-            text = 'Вам поочерёдно представятся 10 примеров, содержащих операции сложения, вычитания, умножения и ' \
-                   'деления над дробями, для решения на время. На каждый из них у вас есть 30 секунд. Удачи!\n'
-            tts = text
-        else:
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            else:
-                ans = str(helper.answer) + '/' + str(helper.answer_den)
-                variants = ['Верный ответ: ' + ans + '.\n', 'Ваш ответ неверный, правильный ответ: ' + ans + '.\n',
-                            'Увы, вы ответили неправильно, ответом было ' + ans + '\n',
-                            'Вы дали неверный ответ, верным был ' + ans + '\n',
-                            'Этот ответ был неправильный. Верный ответ: ' + ans + '\n']
-                text = choice(variants)
-                tts = text
-        answer = 2
-        answer_den = 1
-        example = ''
+def random_fraction():
+    """
+    :return: random reduced fraction as (numerator, denominator).
+    """
+    numerator, denominator = randint(1, 20), randint(1, 20)
+    gcd = find_gcd(numerator, denominator)
+    return numerator // gcd, denominator // gcd
 
-        # Randomize the operation. 1 - addition, 2 - subtraction, 3 - multiplication, 4 - division
-        if operation == 1:
-            numerator1, denominator1 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator1, denominator1)
-            numerator1 //= gcd
-            denominator1 //= gcd
 
-            numerator2, denominator2 = randint(1, 20), denominator1 * (randint(199, 399) // 100)
+class Fractions(QuizScenario):
+    __slots__ = ()
+
+    # Operation sign and the name of the spoken variants
+    _operations = {
+        1: (' + ', 'addition'),
+        2: (' - ', 'subtraction'),
+        3: (' * ', 'multiplication'),
+        4: (' / ', 'division'),
+    }
+    # Factor of the second denominator of addition and subtraction, equal denominators are rare
+    _factors = AliasSampler({1: 1, 2: 100, 3: 100})
+
+    def generate(self):
+        # Randomize the operation. 1 - addition, 2 - subtraction, 3 - multiplication, 4 - division
+        operation = randint(1, 4)
+        numerator1, denominator1 = random_fraction()
+        if operation < 3:
+            # The second denominator is a multiple of the first one
+            numerator2, denominator2 = randint(1, 20), denominator1 * self._factors.sample()
             gcd = find_gcd(numerator2, denominator2)
             numerator2 //= gcd
             denominator2 //= gcd
+        else:
+            numerator2, denominator2 = random_fraction()
 
-            text += str(numerator1) + '/' + str(denominator1) + ' + ' + str(numerator2) + '/' + str(denominator2) +\
-                                                                                                                ' = ?'
-            variants = [
-                'сколько будет ' + str(numerator1) + ' дробь ' + str(denominator1) + ' плюс ' + str(numerator2) +
-                ' дробь ' + str(denominator2),
-                'реши ' + str(numerator1) + ' дробь ' + str(denominator1) + ' плюс ' + str(numerator2) + ' дробь ' +
-                str(denominator2),
-                'сумма двух дробей ' + str(numerator1) + ' дробь ' + str(denominator1) + ' и ' + str(numerator2) +
-                ' дробь ' + str(denominator2) + ' равна',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' плюс ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' б+уудет',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' плюс ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
+        if operation == 1:
             lcm = find_lcm(denominator1, denominator2)
             answer = numerator1 * (lcm // denominator1) + numerator2 * (lcm // denominator2)
             answer_den = lcm
         elif operation == 2:
-            numerator1, denominator1 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator1, denominator1)
-            numerator1 //= gcd
-            denominator1 //= gcd
-
-            numerator2, denominator2 = randint(1, 20), denominator1 * (randint(199, 399) // 100)
-            gcd = find_gcd(numerator2, denominator2)
-            numerator2 //= gcd
-            denominator2 //= gcd
-
             lcm = find_lcm(denominator1, denominator2)
             nnumerator1 = numerator1 * (lcm // denominator1)
             nnumerator2 = numerator2 * (lcm // denominator2)
             answer = max(nnumerator1, nnumerator2) - min(nnumerator1, nnumerator2)
+            # The answer must not be negative
             if nnumerator1 < nnumerator2:
                 numerator1, numerator2 = numerator2, numerator1
                 denominator1, denominator2 = denominator2, denominator1
             answer_den = lcm
-
-            text += str(numerator1) + '/' + str(denominator1) + ' - ' + str(numerator2) + '/' + str(denominator2) +\
-                                                                                                                ' = ?'
-            variants = [
-                'сколько будет ' + str(numerator1) + ' дробь ' + str(denominator1) + ' минус ' + str(numerator2) +
-                ' дробь ' + str(denominator2),
-                'реши ' + str(numerator1) + ' дробь ' + str(denominator1) + ' минус ' + str(numerator2) + ' дробь ' +
-                str(denominator2),
-                'разница двух дробей ' + str(numerator1) + ' дробь ' + str(denominator1) + ' и ' + str(numerator2) +
-                ' дробь ' + str(denominator2) + ' равна',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' минус ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' б+уудет',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' минус ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
         elif operation == 3:
-            numerator1, denominator1 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator1, denominator1)
-            numerator1 //= gcd
-            denominator1 //= gcd
-
-            numerator2, denominator2 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator2, denominator2)
-            numerator2 //= gcd
-            denominator2 //= gcd
-
-            text += str(numerator1) + '/' + str(denominator1) + ' * ' + str(numerator2) + '/' + str(denominator2) + \
-                                                                                                                ' = ?'
-            variants = [
-                'сколько будет ' + str(numerator1) + ' дробь ' + str(denominator1) + ' умножить на ' + str(numerator2)
-                + ' дробь ' + str(denominator2),
-                'реши ' + str(numerator1) + ' дробь ' + str(denominator1) + ' умножить на ' + str(numerator2) +
-                ' дробь ' + str(denominator2),
-                'произведение двух дробей ' + str(numerator1) + ' дробь ' + str(denominator1) + ' и ' + str(numerator2)
-                + ' дробь ' + str(denominator2) + ' равно',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' умножить на ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' б+уудет',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' умножить на ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
             answer = numerator1 * numerator2
             answer_den = denominator1 * denominator2
         else:
-            numerator1, denominator1 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator1, denominator1)
-            numerator1 //= gcd
-            denominator1 //= gcd
-
-            numerator2, denominator2 = randint(1, 20), randint(1, 20)
-            gcd = find_gcd(numerator2, denominator2)
-            numerator2 //= gcd
-            denominator2 //= gcd
-
-            text += str(numerator1) + '/' + str(denominator1) + ' / ' + str(numerator2) + '/' + str(denominator2) + \
-                                                                                                                ' = ?'
-            variants = [
-                'сколько будет ' + str(numerator1) + ' дробь ' + str(denominator1) + ' разделить на ' + str(numerator2)
-                + ' дробь ' + str(denominator2),
-                'реши ' + str(numerator1) + ' дробь ' + str(denominator1) + ' делить на ' + str(numerator2) + ' дробь '
-                + str(denominator2),
-                'частное двух дробей ' + str(numerator1) + ' дробь ' + str(denominator1) + ' и ' + str(numerator2) +
-                ' дробь ' + str(denominator2) + ' равно',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' разделить на ' + str(numerator2) + ' дробь '
-                + str(denominator2) + ' б+уудет',
-                str(numerator1) + ' дробь ' + str(denominator1) + ' делить на ' + str(numerator2) + ' дробь ' +
-                str(denominator2) + ' равн+оо']
-            tts += choice(variants)
-            example = choice(variants)
             answer = numerator1 * denominator2
             answer_den = denominator1 * numerator2
 
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
-        if helper.question_number != 0:
-            tts = tts + example
-
         gcd = find_gcd(answer, answer_den)
-        answer //= gcd
-        answer_den //= gcd
+        sign, name = self._operations[operation]
+        text = str(numerator1) + '/' + str(denominator1) + sign + str(numerator2) + '/' + str(denominator2) + ' = ?'
+        spoken = (Ratio(numerator1, denominator1), Ratio(numerator2, denominator2))
+        return self.question(text, self.variants(name), spoken, answer // gcd, {'answer_den': answer_den // gcd})
+
+    def check_answer(self, request: Request):
+        # Unreduced fractions, mixed numbers and decimals are accepted as well
+        return matches(request, number_forms((Fraction(helper.answer, helper.answer_den),)))
+
+    def answer_value(self):
+        return Ratio(helper.answer, helper.answer_den)
+
+    def card(self, text, question):
+        # Every operand has its own image, the list of all examples would be too long to render
+        first, sign, second = question.text.split(' ')[:3]
+        first_id, second_id = images.get(first), images.get(second)
+        if first_id is None or second_id is None or len(text) > HEADER_LIMIT:
+            return None
+        return items_list([item(first_id, first), item(second_id, sign + ' ' + second)], header=text or None,
+                          footer=question.text)
 
-        return self.make_response(text, tts, state={
-            'points': helper.points,
-            'question_number': helper.question_number,
-            'answer': answer,
-            'answer_den': answer_den
-        })
+    @classmethod
+    def card_sources(cls):
+        fractions = set()
+        for numerator in range(1, 21):
+            for denominator in range(1, 21):
+                gcd = find_gcd(numerator, denominator)
+                fractions.add((numerator // gcd, denominator // gcd))
+        # Second operands of addition and subtraction, their denominator is a multiple of the first one
+        for _, denominator in list(fractions):
+            for numerator in range(1, 21):
+                for factor in cls._factors.values:
+                    gcd = find_gcd(numerator, denominator * factor)
+                    fractions.add((numerator // gcd, denominator * factor // gcd))
+        return [(str(numerator) + '/' + str(denominator), FORMULA) for numerator, denominator in sorted(fractions)]
+
+    def answer_state(self):
+        return {'answer': helper.answer, 'answer_den': helper.answer_den}
 
-    def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
-        variants = ['Для того, чтобы сложить две дроби, нужно сначала привести их к общему знаменателю, а затем'
-                    ' выполнить сложение.',
-                    'Для того, чтобы из одной дроби вычесть другую, нужно сначала привести их к общему знаменателю,'
-                    ' а затем выполнить вычитание.',
-                    'Для того, чтобы перемножить две дроби, нужно перемножить соответственно их числители и '
-                    'знаменатели.',
-                    'Для того, чтобы одну дробь разделить на другую, нужно делимое умножить на дробь, обратную '
-                    'делителю.']
-        if helper.question_number == 0:
-            variants += [' Главное не торопитесь, времени у вас достаточно.']
-            text += ' Вам поочерёдно представятся 10 примеров, содержащих операции сложения, вычитания, умножения и ' \
-                    'деления над дробями, для решения. На каждый из них у вас есть 30 секунд.' + \
-                    choice(variants)
-        elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов.' + choice(variants)
-        else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + \
-                    ' вопросов, правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
-        })
+    @classmethod
+    def distributions(cls):
+        return [('fractions.factors', cls._factors)]
 
-    def handle_local_intents(self, request: Request):
-        # If user activates help or back intent
-        if helper.points == -1 or 'back' in request.intents:
-            return StartBody()
-        elif 'answer' in request.intents:
-            numerator = int(request.tokens[request.intents['answer']['slots']['Answer']['tokens']['start']])
-            denominator = 1
-            if request.intents['answer']['slots']['Answer']['tokens']['start'] + 1 < len(request.tokens):
-                denominator = int(request.tokens[request.intents['answer']['slots']['Answer']['tokens']['start'] + 1])
-            gcd = find_gcd(numerator, denominator)
-            numerator //= gcd
-            denominator //= gcd
-            if numerator == helper.answer and denominator == helper.answer_den:
-                helper.points += 1
-                helper.correct = True
-        helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
-                return Congratulations()
-            else:
-                return EndBody()
-        else:
-            return Fractions()
 
-    @property
-    def buttons(self):
-        return []
+class Exponentiation(QuizScenario):
+    __slots__ = ()
 
+    # 0 is a rare base, so is the exponent 1, and the larger the base the smaller the exponents
+    _bases = AliasSampler(dict.fromkeys(range(1, 31), 1000), {0: 1})
+    _exponents = Tiered([(4, AliasSampler(dict.fromkeys(range(2, 6), 100), {1: 1})),
+                         (11, AliasSampler(dict.fromkeys(range(2, 5), 100), {1: 1})),
+                         (21, AliasSampler(dict.fromkeys(range(2, 4), 100), {1: 1})),
+                         (None, AliasSampler({2: 1}))])
 
-class Exponentiation(Scenario):
-    def reply(self, request):
-        num1 = randint(999, 30999) // 1000
-        num2 = 0
-        if num1 < 4:
-            num2 = randint(199, 599) // 100
-        elif num1 < 11:
-            num2 = randint(199, 499) // 100
-        elif num1 < 21:
-            num2 = randint(199, 399) // 100
-        else:
-            num2 = 2
-        text = ''
-        tts = ''
-        if helper.question_number == 0:
-            text = 'Вам поочерёдно представятся 10 примеров, содержащих операцию возведения в степень, для решения на' \
-                   ' время. На каждый из них у вас есть 30 секунд. Удачи!\n'
-            tts = text
-        else:
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            else:
-                variants = ['Верный ответ: ' + str(helper.answer) + '.\n',
-                            'Ваш ответ неверный, правильный ответ: ' + str(helper.answer) + '.\n',
-                            'Увы, вы ответили неправильно, ответом было ' + str(helper.answer) + '\n',
-                            'Вы дали неверный ответ, верным был ' + str(helper.answer) + '\n',
-                            'Этот ответ был неправильный. Верный ответ: ' + str(helper.answer) + '\n']
-                text = choice(variants)
-                tts = text
-        answer = 0
-        example = ''
-        text = str(num1) + '^' + str(num2) + ' = ?'
-        variants = ['сколько будет ' + str(num1) + ' в степени ' + str(num2),
-                    'реши ' + str(num1) + ' в степени ' + str(num2),
-                    str(num1) + ' в степени ' + str(num2) + ' б+уудет',
-                    str(num1) + ' в степени ' + str(num2) + ' равн+оо']
-        tts = choice(variants)
-        example = choice(variants)
-        answer = num1**num2
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
-        if helper.question_number != 0:
-            tts = tts + example
-        return self.make_response(text, tts, state={
-            'points': helper.points,
-            'question_number': helper.question_number,
-            'answer': answer
-        })
+    def generate(self):
+        num1 = self._bases.sample()
+        num2 = self._exponents.sample(num1)
+        return self.question(str(num1) + '^' + str(num2) + ' = ?', self.variants('variants'), (num1, num2),
+                             num1**num2)
 
-    def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
-        if helper.question_number == 0:
-            text += ' Вам поочерёдно представляются 10 примеров, содержащих операцию возведения в степень, для ' \
-                    'решения на время. На каждый из них у вас есть 30 секунд. Главное не торопитесь, времени у вас ' \
-                    'достаточно.'
-        elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов. Сосредоточьтесь на решении и не ' \
-                    'переживайте, результаты, кроме вас, никто не увидит. Наша цель научиться.'
-        else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + ' вопросов' \
-                    ', правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
-        })
+    @classmethod
+    def card_sources(cls):
+        # The values "generate" draws
+        for num1 in sorted(cls._bases.values):
+            for num2 in sorted(cls._exponents.tier(num1).values):
+                yield str(num1) + '^' + str(num2) + ' = ?', FORMULA
 
-    def handle_local_intents(self, request: Request):
-        # If user activates help or back intent
-        if helper.points == -1 or 'back' in request.intents:
-            return StartBody()
-        elif 'answer' in request.intents:
-            if request.intents['answer']['slots']['Answer']['value'] == helper.answer:
-                helper.points += 1
-                helper.correct = True
-        helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
-                return Congratulations()
-            else:
-                return EndBody()
-        else:
-            return Exponentiation()
+    @classmethod
+    def distributions(cls):
+        return [('exponentiation.bases', cls._bases)] + \
+            [('exponentiation.exponents.%d' % i, sampler) for i, sampler in enumerate(cls._exponents.samplers)]
 
-    @property
-    def buttons(self):
-        return []
 
+class SquareRoot(QuizScenario):
+    __slots__ = ()
 
-class SquareRoot(Scenario):
-    def reply(self, request):
-        num1 = randint(999, 50999) // 1000
-        text = ''
-        tts = ''
-        if helper.question_number == 0:
-            text = 'Вам поочерёдно представятся 10 примеров, где вам нужно найти квадратный корень, для решения на ' \
-                   'время. На каждый из них у вас есть 30 секунд. Удачи!\n'
-            tts = text
-        else:
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            else:
-                variants = ['Верный ответ: ' + str(helper.answer) + '.\n',
-                            'Ваш ответ неверный, правильный ответ: ' + str(helper.answer) + '.\n',
-                            'Увы, вы ответили неправильно, ответом было ' + str(helper.answer) + '\n',
-                            'Вы дали неверный ответ, верным был ' + str(helper.answer) + '\n',
-                            'Этот ответ был неправильный. Верный ответ: ' + str(helper.answer) + '\n']
-                text = choice(variants)
-                tts = text
-        answer = num1
-        num1 = num1**2
-        example = ''
-        text += '√' + str(num1) + ' = ?'
-        variants = ['чему равен квадратный корень из ' + str(num1),
-                    'посчитай квадратный корень из ' + str(num1), 'квадратный корень из ' + str(num1) + ' равен',
-                    'квадратный корень из ' + str(num1) + ' б+уудет']
-        tts += choice(variants)
-        example = choice(variants)
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
-        if helper.question_number != 0:
-            tts = tts + example
-        return self.make_response(text, tts, state={
-            'points': helper.points,
-            'question_number': helper.question_number,
-            'answer': answer
-        })
+    # 0 is a rare answer
+    _answers = AliasSampler(dict.fromkeys(range(1, 51), 1000), {0: 1})
 
-    def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
-        if helper.question_number == 0:
-            text += ' Вам поочерёдно представляются 10 примеров, где вам нужно найти квадратный корень, для решения ' \
-                    'на время. На каждый из них у вас есть 30 секунд. Главное не торопитесь, времени у вас достаточно.'
-        elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов. Арифметическим квадратным корнем ' \
-                    'из неотрицательного числа a называется такое неотрицательное число, квадрат которого равен a.'
-        else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + \
-                    ' вопросов, правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
-        })
+    def generate(self):
+        answer = self._answers.sample()
+        return self.question('√' + str(answer**2) + ' = ?', self.variants('variants'), (answer**2,), answer)
 
-    def handle_local_intents(self, request: Request):
-        # If user activates help or back intent
-        if helper.points == -1 or 'back' in request.intents:
-            return StartBody()
-        elif 'answer' in request.intents:
-            if request.intents['answer']['slots']['Answer']['value'] == helper.answer:
-                helper.points += 1
-                helper.correct = True
-        helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
-                return Congratulations()
-            else:
-                return EndBody()
-        else:
-            return SquareRoot()
+    @classmethod
+    def card_sources(cls):
+        return [('√' + str(answer**2) + ' = ?', FORMULA) for answer in sorted(cls._answers.values)]
 
-    @property
-    def buttons(self):
-        return []
+    @classmethod
+    def distributions(cls):
+        return [('square_root.answers', cls._answers)]
 
 
-class Trigonometry(Scenario):
-    def __init__(self):
-        self._values = [
-            ('sin0° = ?', 'чему равен синус нуля градусов', [0]),
-            ('cos0° = ?', 'чему равен косинус нуля градусов', [1]),
-            ('tg0° = ?', 'чему равен тангенс нуля градусов', [0]),
-            ('sin?° = 1/2', 'синус какого угла равен одной второй', [30, 150]),
-            ('cos?° = √3/2', 'косинус какого угла равен корню из трех деленному на два', [30, 330]),
-            ('tg?° = 1/√3', 'тангенс какого угла равен единице деленной на корень из трех', [30, 210]),
-            ('ctg?° = √3', 'котангенс какого угла равен корню из трех', [30, 210]),
-            ('sin?° = √2/2', 'синус какого угла равен корню из двух деленному на два', [45, 135]),
-            ('cos?° = √2/2', 'косинус какого угла равен корню из двух деленному на два', [45, 315]),
-            ('tg45° = ?', 'чему равен тангенс сорока пяти градусов', [1]),
-            ('ctg45° = ?', 'чему равен котангенс сорока пяти градусов', [1]),
-            ('cos?° = 1/2', 'косинус какого угла равен одной второй', [60, 300]),
-            ('sin?° = √3/2', 'синус какого угла равен корню из трех деленному на два', [60, 120]),
-            ('ctg?° = 1/√3', 'котангенс какого угла равен единице деленной на корень из трех', [60, 240]),
-            ('tg?° = √3', 'тангенс какого угла равен корню из трех', [60, 240]),
-            ('sin90° = ?', 'чему равен синус девяноста градусов', [1]),
-            ('cos90° = ?', 'чему равен косинус девяноста градусов', [0]),
-            ('ctg90° = ?', 'чему равен котангенс девяноста градусов', [0]),
-            ('cos?° = -1/2', 'косинус какого угла равен минус одной второй', [120, 240]),
-            ('ctg?° = -1/√3', 'котангенс какого угла равен минус единице деленной на корень из трех', [120, 300]),
-            ('tg?° = -√3', 'тангенс какого угла равен минус корню из трех', [120, 300]),
-            ('cos?° = -√2/2', 'косинус какого угла равен минус корню из двух деленному на два', [135, 225]),
-            ('tg135° = ?', 'чему равен тангенс ста тридцати пяти градусов', [-1]),
-            ('ctg135° = ?', 'чему равен котангенс ста тридцати пяти градусов', [-1]),
-            ('cos?° = -√3/2', 'косинус какого угла равен минус корню из трех деленному на два', [150, 210]),
-            ('tg?° = -1/√3', 'тангенс какого угла равен минус единице деленной на корень из трех', [150, 330]),
-            ('ctg?° = -√3', 'котангенс какого угла равен минус корню из трех', [150, 330]),
-            ('sin180° = ?', 'чему равен синус ста восьмидесяти градусов', [0]),
-            ('cos180° = ?', 'чему равен косинус ста восьмидесяти градусов', [-1]),
-            ('tg180° = ?', 'чему равен тангенс ста восьмидесяти градусов', [0]),
-            ('sin?° = -1/2', 'синус какого угла равен минус одной второй', [210, 330]),
-            ('sin?° = -√2/2', 'синус какого угла равен минус корню из двух деленному на два', [225, 315]),
-            ('tg225° = ?', 'чему равен тангенс двухсот двадцати пяти градусов', [1]),
-            ('ctg225° = ?', 'чему равен котангенс двухсот двадцати пяти градусов', [1]),
-            ('sin?° = -√3/2', 'синус какого угла равен минус корню из трех деленному на два', [240, 300]),
-            ('sin270° = ?', 'чему равен синус двухсот семидесяти градусов', [-1]),
-            ('cos270° = ?', 'чему равен косинус двухсот семидесяти градусов', [0]),
-            ('ctg270° = ?', 'чему равен котангенс двухсот семидесяти градусов', [0]),
-            ('sin360° = ?', 'чему равен синус трехсот шестидесяти градусов', [0]),
-            ('cos360° = ?', 'чему равен косинус трехсот шестидесяти градусов', [1]),
-            ('tg360° = ?', 'чему равен тангенс трехсот шестидесяти градусов', [0]),
-        ]
+class Trigonometry(QuizScenario):
+    __slots__ = ()
 
-    def reply(self, request):
-        if helper.question_number == 0:
-            text = 'Вам поочерёдно представятся 10 вопросов о табличных тригонометрических значениях. На каждый из ' \
-                   'них у вас есть 30 секунд. Вы должны дать значение угла в градусах. Удачи!\n'
-            tts = text
-        else:
-            if helper.correct:
-                variants = ['Вы ответили верно.\n', 'Ваш ответ правильный.\n', 'Браво, вы правы!\n',
-                            'Поздравляю вас, вы дали верный ответ!\n', 'Этот ответ был правильный.\n']
-                text = choice(variants)
-                tts = text
-            else:
-                variants = ['Верный ответ: ' + str(helper.answer[0]) + '.\n',
-                            'Ваш ответ неверный, правильный ответ: ' + str(helper.answer[0]) + '.\n',
-                            'Увы, вы ответили неправильно, ответом было ' + str(helper.answer[0]) + '\n',
-                            'Вы дали неверный ответ, верным был ' + str(helper.answer[0]) + '\n',
-                            'Этот ответ был неправильный. Верный ответ: ' + str(helper.answer[0]) + '\n']
-                text = choice(variants)
-                tts = text
+    _values = TRIGONOMETRY
+    # Canonical forms of the answers by the question, angles are asked for with "?°" and the other questions are
+    # about values
+    _forms = {text: angle_forms(answer) if '?°' in text else number_forms(answer) for text, _, answer in TRIGONOMETRY}
+
+    # The questions spoken in the other languages by the locale, in the order of the table
+    _speech = {}
 
+    def generate(self):
         variant = randint(0, len(self._values) - 1)
         while variant in helper.asked:
             variant = (variant + 1) % (len(self._values) - 1)
-        text += self._values[variant][0]
-        tts += self._values[variant][1]
-
-        variants = [
-            'и так ваш ответ?',
-            'ответом будет?',
-            'пол+учится?',
-            'ваш ответ?',
-            'отвечайте',
-            'пришло время ответа',
-        ]
+        text, tts, answer = self._values[variant]
+        if helper.locale.code != DEFAULT_LOCALE:
+            tts = self.speech(helper.locale)[variant]
+        return Question(text, tts, choice(self.variants('prompts')), answer, {'asked': helper.asked + [variant]})
 
-        tts += '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/44d33529-856c-42e8-9a0f-f3d60311ef88.opus\">'
-        if helper.question_number != 0:
-            tts = tts + choice(variants)
-        return self.make_response(text, tts, state={
-            'points': helper.points,
-            'question_number': helper.question_number,
-            'answer': self._values[variant][2],
-            'asked': helper.asked + [variant]
-        })
+    @classmethod
+    def speech(cls, locale):
+        """
+        :return: the spoken questions of the table in the language of the locale, built when it is first asked for.
+        """
+        speech = cls._speech.get(locale.code)
+        if speech is None:
+            speech = cls._speech[locale.code] = tuple(tts for _, tts, _ in trigonometry.build(locale=locale).questions)
+        return speech
 
-    def help(self, request: Request):
-        text = 'Вы попросили помощи во время выполнения задания, продолжить его выполнение вы уже не сможете.'
+    def check_answer(self, request: Request):
+        # We are looking for an answer among the tokens, because sometimes voice recognition does not work correctly or
+        # the user says the whole sentence, and not just the answer
+        answer = tuple(helper.answer)
+        forms = self._forms.get(helper.question[0]) if helper.question is not None else None
+        if forms is None:
+            # A review question
+            forms = angle_forms(answer) if self.asks_angle() else number_forms(answer)
+        return matches(request, forms, loose=True)
+
+    def answer_state(self):
+        # The review questions are checked without the text of the question
+        return {'answer': helper.answer, 'angle': self.asks_angle()}
+
+    @staticmethod
+    def asks_angle():
+        """
+        :return: True if the current question asks for an angle, e.g. "sin?° = 1".
+        """
+        # Angles are asked for with "?°" in the question, the other questions are about values
+        if helper.question is not None:
+            return '?°' in helper.question[0]
+        if helper.angle is not None:
+            return helper.angle
+        # A review question kept without the flag: a value is at two angles in a turn, a single angle is taken for
+        # a value
+        return len(helper.answer) > 1
+
+    @classmethod
+    def card_sources(cls):
+        return [(text, FORMULA) for text, _, _ in cls._values]
+
+    def answer_value(self):
+        if self.asks_angle():
+            return Degrees(helper.answer[0])
+        return helper.answer[0]
+
+
+# Task types of the rounds in the order of the options of the task choice, the checkpoints keep their indices
+QUIZ_TASKS = (AdditionSubtraction, MultiplicationDivision, Fractions, Exponentiation, SquareRoot, Trigonometry)
+# Task types of the marathon, their order is the order of the recent accuracy in the session state
+MARATHON_TASKS = QUIZ_TASKS
+
+
+class Marathon(Scenario):
+    """ Endless round mixing the questions of all the task types, see "marathon.py" """
+    __slots__ = ()
+
+    def reply(self, request):
+        locale = helper.locale
+        config = round_config(MARATHON)
+        accuracy = marathon.accuracy(helper.accuracy, MARATHON_TASKS)
+        previous = SCENARIOS.get(helper.task)
+        previous = MARATHON_TASKS.index(previous) if previous in MARATHON_TASKS else None
+        index, question = next(marathon.stream(MARATHON_TASKS, accuracy, previous))
+        task = MARATHON_TASKS[index]()
         if helper.question_number == 0:
-            text += ' Вам поочерёдно представляются 10 вопросов о табличных тригонометрических значениях. На каждый ' \
-                    'из них у вас есть 30 секунд. Главное не торопитесь, времени у вас достаточно.'
-        elif helper.points == 0:
-            text += ' Вы не смогли дать правильного ответа ни на один из вопросов. Эти значения нужно выучить, а ' \
-                    'лучше всего запоминать тригонометрические значения, запоминая их на единичной окружности'
+            text, tts = locale.render(locale['marathon.intro'], config.time_limit,
+                                      locale.plural(config.time_limit, 'noun.seconds'))
         else:
-            text += ' Вы верно ответили на ' + str(helper.points) + ' из ' + str(helper.question_number) + \
-                    ' вопросов, правильный ответ на пример ' + str(helper.answer) + '.'
-        text += ' Возвращаемся назад.'
-        return self.make_response(text, buttons=self.buttons + [
-            button('Назад', hide=True)
-        ], state={
-            'points': -1
+            if helper.correct:
+                text = tts = locale.choice('quiz.correct')
+            elif helper.late:
+                text = tts = locale.choice('quiz.late')
+            else:
+                text, tts = locale.render(locale.choice('quiz.incorrect'), SCENARIOS[helper.task]().answer_value())
+            score_text, score_tts = locale.render(locale['marathon.score'], helper.score, helper.streak)
+            text, tts = text + score_text, tts + score_tts
+        card = None
+        if show_cards():
+            card = task.card(text.rstrip('\n'), question)
+        tts = [tts, question.tts, TASK_SOUND]
+        if helper.question_number != 0:
+            tts.append(question.example)
+        state = self.state(accuracy)
+        state.update({
+            'task': task.id(),
+            'answer': question.answer,
+            'asked_at': helper.now,
+            'question': [question.text, question.tts]
         })
+        if question.state is not None:
+            state.update(question.state)
+            if 'asked' in question.state:
+                state['asked'] = state['asked'][-marathon.RECENT:]
+        return self.make_response(text + question.text, tts, card=card, state=state)
+
+    def help(self, request: Request):
+        locale = helper.locale
+        text, tts = locale.render(locale['marathon.help'], helper.points, helper.question_number,
+                                  locale.plural(helper.question_number, 'noun.questions_gen'), helper.score)
+        # The question stays, the time to answer it goes on
+        state = self.state(marathon.accuracy(helper.accuracy, MARATHON_TASKS))
+        state.update({'task': helper.task, 'answer': helper.answer, 'answer_den': helper.answer_den,
+                      'asked_at': helper.asked_at, 'question': helper.question})
+        if helper.question is not None:
+            text, tts = text + helper.question[0], [tts, helper.question[1], TASK_SOUND]
+        return self.make_response(text, tts, buttons=[button(locale['button.back'], hide=True)], state=state)
+
+    def repeat(self, state):
+        if helper.question is None:
+            return None
+        text, tts = helper.question
+        return self.make_response(text, [tts, TASK_SOUND], state=dict(state))
 
     def handle_local_intents(self, request: Request):
-        answer = 3
-        isIn = False
-        # We are looking for an answer among the tokens, because sometimes voice recognition does not work correctly or
-        # the user says the whole sentence, and not just the answer
-        for el in request.tokens:
-            if el.isdigit() and (int(el) % 360) in helper.answer:
-                isIn = True
-                break
-        # If user activates help or back intent
-        if helper.points == -1 or 'back' in request.intents:
+        task = SCENARIOS.get(helper.task)
+        if 'back' in request.intents or task not in MARATHON_TASKS:
             return StartBody()
-        elif 'answer' in request.intents:
-            answer = request.intents['answer']['slots']['Answer']['value']
-            answer %= 360
-        if answer in helper.answer or isIn:
+        task = task()
+        config = round_config(MARATHON)
+        elapsed = None
+        if helper.asked_at is not None:
+            elapsed = helper.now - helper.asked_at
+        correct = task.check_answer(request)
+        if correct and config.in_time(elapsed):
             helper.points += 1
             helper.correct = True
-        helper.question_number += 1
-        if helper.question_number == 10:
-            if helper.points == 10:
-                return Congratulations()
-            else:
-                return EndBody()
+            helper.streak += 1
+            helper.score += config.answer_score(elapsed)
         else:
-            return Trigonometry()
+            helper.streak = 0
+            # The answer is correct, but the time is over
+            helper.late = correct
+            if not correct and helper.question is not None and helper.user_id is not None:
+                progress.deck(helper.user_id).add(task.id(), helper.question[0], helper.question[1],
+                                                  task.answer_state(), helper.now // 1000)
+                progress.save(helper.user_id)
+        accuracy = marathon.accuracy(helper.accuracy, MARATHON_TASKS)
+        index = MARATHON_TASKS.index(type(task))
+        accuracy[index] = marathon.update(accuracy[index], correct)
+        helper.accuracy = accuracy
+        helper.question_number += 1
+        return Marathon()
+
+    @staticmethod
+    def state(accuracy):
+        """
+        :return: session state of the marathon without the current question, its size does not depend on the number
+            of the questions asked.
+        """
+        state = {
+            'points': helper.points,
+            'question_number': helper.question_number,
+            'score': helper.score,
+            'streak': helper.streak,
+            'accuracy': accuracy
+        }
+        # Only the recent trigonometry variants are remembered
+        if helper.asked:
+            state['asked'] = helper.asked[-marathon.RECENT:]
+        return state
 
     @property
     def buttons(self):
         return []
 
 
+def round_results():
+    """
+    :return: session state with the results of the finished round, they are available to analytics.
+    """
+    return {'score': helper.score, 'times': helper.times}
+
+
+def room_rank():
+    """
+    :return: the place of the user in the room as a sentence or an empty string if the user is not in a room.
+    """
+    room = classroom.get(helper.room)
+    if room is None or helper.user_id not in room.leaderboard:
+        return ''
+    return helper.locale.text(helper.locale['results.rank'], room.leaderboard.rank(helper.user_id),
+                              len(room.leaderboard))
+
+
+def average_time():
+    """
+    :return: the average time to answer in the finished round as a part of the sentence.
+    """
+    times = [elapsed for elapsed in helper.times if elapsed is not None]
+    if not times:
+        return ''
+    seconds = str(round(sum(times) / len(times) / 1000, 1)).replace('.', helper.locale['decimal_separator'])
+    return helper.locale.text(helper.locale['results.average_time'], seconds)
+
+
 class Congratulations(Scenario):
     """ Congratulations scenario, all answers are correct """
+    __slots__ = ()
+
     def reply(self, request):
-        delights = ['Вот это да! ', 'Ух ты! ', 'Да я вижу здесь прирожденного математика! ',
-                    'Умные люди всегда привлекательны! ', 'Вы на высоте! ', 'Ваши умения поражают! ', '']
-        facts = ['Я знаю несколько интересных фактов, могу рассказать. ',
-                 'Могу поделиться с тобой сногшибательными фактами. ',
-                 'Я могу рассказать тебе то, чего ты, наверное, не знаешь. ', 'Хочешь узнать что-то новое? ']
-        play_again = ['Или хочешь сыграть еще раз? ', 'Или я бы посмотрела еще раз на тебя в действии, повторим? ',
-                      'Если не хочешь, у меня есть еще режимы, кроме этого. Попробуешь? ', 'Или повторим? ',
-                      'Или же давай заново сыграем? ']
-        text = choice(delights) + 'На все вопросы ты ответил верно, у тебя твердая \"5\". ' + choice(facts) \
-               + choice(play_again)
-        applause_sounds = ['<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/87071461-1456-42f7-8cbd-5a7f2b4e4bd4.opus\">',
-                           '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/6d160340-afe2-4273-94d4-40631584f139.opus\">',
-                           '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/b2eef422-bd6d-485a-a05c-baddeb7e726d.opus\">']
-        tts = choice(applause_sounds) + text
-        return self.make_response(text, tts, buttons=self.buttons)
+        locale = helper.locale
+        text = locale.choice('congratulations.delights') + \
+            locale.text(locale['congratulations.reply'], helper.score) + \
+            room_rank() + locale.choice('results.facts') + locale.choice('results.play_again')
+        tts = [choice(APPLAUSE_SOUNDS), text]
+        return forget_checkpoint(self.make_response(text, tts, buttons=self.buttons, state=round_results()))
 
     def help(self, request: Request):
-        variants = ['Если хотите сыграть заново, так и скажите, тогда мы вернемся на выбор типа задания. Если скажете '
-                    '\"Факты\", я расскажу вам интересеные факты. А если вам нужно бежать, скажите \"Закончить\"',
-                    'Если вам понравилось и вы хотите еще скажите \"Заново\". Я могу рассказать факт, который удивит '
-                    'вас, только скажите']
-        text = choice(variants)
+        text = helper.locale.choice('results.help')
         return self.make_response(text, buttons=self.buttons + [
-            button('Повторить', hide=True)
+            button(helper.locale['button.repeat'], hide=True)
         ])
 
     def handle_local_intents(self, request: Request):
@@ -1091,54 +1108,40 @@ class Congratulations(Scenario):
 
     @property
     def buttons(self):
-        buttons = [
-            button('Сыграть заново', hide=True),
-            button('Расскажи интересные факты', hide=True),
-            button('Закончить', hide=True)
-        ]
-        return buttons
+        return [button(title, hide=True) for title in helper.locale['results.buttons']]
 
 
 class EndBody(Scenario):
+    __slots__ = ()
+
     def reply(self, request):
-        delights = ['Никто не идеален! ', 'У тебя есть несколько ошибок, но ничего срашного. ',
-                    'Главное не опускать руки и все получится! ', 'Ошибки делают нас сильнее ', '']
-        facts = ['Я знаю несколько интересных фактов, могу рассказать. ',
-                 'Могу поделиться с тобой сногшибательными фактами. ',
-                 'Я могу рассказать тебе то, чего ты, наверное, не знаешь. ', 'Хочешь узнать что-то новое? ']
-        play_again = ['Или хочешь сыграть еще раз? ', 'Или я бы посмотрела еще раз на тебя в действии, повторим? ',
-                      'Если не хочешь, у меня есть еще режимы, кроме этого. Попробуешь? ', 'Или повторим? ',
-                      'Или же давай заново сыграем? ']
+        locale = helper.locale
+        config = round_config(helper.mode)
+        # Marks are given for 10 questions
+        points = helper.points * 10 / config.questions
         mark = 0
-        if helper.points > 8:
+        if points > 8:
             mark = 5
-        elif helper.points > 5:
+        elif points > 5:
             mark = 4
-        elif helper.points > 3:
+        elif points > 3:
             mark = 3
         else:
             mark = 2
-        text = choice(delights) + 'Ты ответил верно на ' + str(helper.points) + \
-               (' вопрос' if helper.points == 1 else ' вопроса'
-               if helper.points < 5 and helper.points != 0 else ' вопросов') + \
-               ' из 10, твоя оценка \"' + str(mark) + '\". ' + choice(facts) + choice(play_again)
-        if helper.question_number != 10:
-            text = choice(delights) + ' ' + choice(facts) + choice(play_again)
-        sad_sounds = [
-            '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/79cded5f-1598-4d6e-bbf3-61e9999b092d.opus\">',
-            '<speaker audio=\"dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/c04240a1-8ef6-445a-8f1c-32a042615683.opus\">']
-        tts = sad_sounds[randint(0, len(sad_sounds) - 1)] + text
-        return self.make_response(text, tts, buttons=self.buttons)
+        text = locale.choice('end.delights') + \
+            locale.text(locale['end.reply'], helper.points, locale.plural(helper.points, 'noun.questions'),
+                        config.questions, mark, helper.score, average_time()) + \
+            room_rank() + locale.choice('results.facts') + locale.choice('results.play_again')
+        if helper.question_number != config.questions:
+            text = locale.choice('end.delights') + ' ' + locale.choice('results.facts') + \
+                locale.choice('results.play_again')
+        tts = [SAD_SOUNDS[randint(0, len(SAD_SOUNDS) - 1)], text]
+        return forget_checkpoint(self.make_response(text, tts, buttons=self.buttons, state=round_results()))
 
     def help(self, request: Request):
-        variants = [
-            'Если хотите сыграть заново, так и скажите, тогда мы вернемся на выбор типа задания. Если скажете \"Факты\"'
-            ', я расскажу вам интересеные факты. А если вам нужно бежать, скажите \"Закончить\"',
-            'Если вам понравилось и вы хотите еще скажите \"Заново\". Я могу рассказать факт, который удивит вас,'
-            ' только скажите']
-        text = choice(variants)
+        text = helper.locale.choice('results.help')
         return self.make_response(text, buttons=self.buttons + [
-            button('Повторить', hide=True)
+            button(helper.locale['button.repeat'], hide=True)
         ])
 
     def handle_local_intents(self, request: Request):
@@ -1152,90 +1155,118 @@ class EndBody(Scenario):
 
     @property
     def buttons(self):
-        buttons = [
-            button('Сыграть заново', hide=True),
-            button('Расскажи интересные факты', hide=True),
-            button('Закончить', hide=True)
-        ]
-        return buttons
+        return [button(title, hide=True) for title in helper.locale['results.buttons']]
+
+
+class TeacherRoom(Scenario):
+    """ The teacher of a room chooses the task and watches the leaderboard """
+    __slots__ = ()
+
+    def reply(self, request):
+        locale = helper.locale
+        room = classroom.get(helper.room)
+        if room is None:
+            text = locale['teacher.closed']
+        elif room.task is None:
+            text = locale.text(locale['teacher.created'], room.code)
+        else:
+            text = locale.text(locale['teacher.ready'], room.code)
+        return self.make_response(text, buttons=self.buttons, state={'room': helper.room})
+
+    def help(self, request: Request):
+        return self.make_response(helper.locale['teacher.help'], buttons=self.buttons, state={'room': helper.room})
+
+    def handle_local_intents(self, request: Request):
+        room = classroom.get(helper.room)
+        if room is None or 'back' in request.intents:
+            return StartBody()
+        elif room.task is None:
+            task = chosen_task(request)
+            if task is not None:
+                classroom.set_task(room, task.id())
+                return TeacherRoom()
+        elif 'leaderboard' in request.intents or 'результаты' in request.tokens:
+            return self.make_response(leaderboard_text(room, helper.locale), buttons=self.buttons,
+                                      state={'room': room.code})
+
+    @property
+    def buttons(self):
+        return [button(helper.locale['button.results'], hide=True), button(helper.locale['button.back'], hide=True)]
+
+
+class Review(Scenario):
+    """ Spaced-repetition review of the questions the user answered wrong, see "progress.py" """
+    __slots__ = ()
+
+    def reply(self, request):
+        locale = helper.locale
+        text = tts = locale['review.start']
+        # If the previous review question was answered
+        if helper.review is not None:
+            if helper.correct:
+                text = tts = locale.choice('quiz.correct')
+            else:
+                text, tts = locale.render(locale.choice('quiz.incorrect'), SCENARIOS[helper.review[1]]().answer_value())
+        item = progress.deck(helper.user_id).next_due(helper.now // 1000)
+        if item is None:
+            return self.make_response(text + locale['review.empty'], tts + locale['review.empty'],
+                                      buttons=self.buttons)
+        state = {'review': [item.id, item.task]}
+        state.update(item.answer_state)
+        return self.make_response(text + item.text, [tts, item.tts, TASK_SOUND], buttons=self.buttons, state=state)
+
+    def repeat(self, state):
+        # The current review question, the feedback on the previous answer is not repeated
+        if helper.review is None or helper.user_id is None:
+            return None
+        item = progress.deck(helper.user_id).get(helper.review[0])
+        if item is None:
+            return None
+        return self.make_response(item.text, [item.tts, TASK_SOUND], buttons=self.buttons, state=dict(state))
+
+    def help(self, request: Request):
+        return self.make_response(helper.locale['review.help'], buttons=self.buttons + [
+            button(helper.locale['button.repeat'], hide=True)
+        ])
+
+    def handle_local_intents(self, request: Request):
+        if helper.review is None or 'back' in request.intents:
+            return StartBody()
+        item_id, task = helper.review
+        helper.correct = SCENARIOS[task]().check_answer(request)
+        progress.deck(helper.user_id).grade(item_id, helper.correct, helper.now // 1000)
+        progress.save(helper.user_id)
+        return Review()
+
+    @property
+    def buttons(self):
+        return [button(helper.locale['button.back'], hide=True)]
+
 
 class InterestingFact(Scenario):
+    __slots__ = ()
+
     def reply(self, request):
         # 'fact', 'link'
-        facts = [['Сейчас мы живем в век информации и ее массового распространения, каждый день человек получает дозу'
-                  ' данных, которые мозгу необходимо переработать и использовать в дальнейшем или определить, как '
-                  'бесполезные и не использовать вовсе. Именно так и появилась ментальная арифметика, она помогает '
-                  'легче усваивать информацию, лучше ее структурировать, а также правильно использовать.',
-                  'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'],
-                 ['Ментальная арифметика особенно хороша для детей и подростков. Именно на этом этапе жизни стоит'
-                  ' подключать развитие памяти и навыков работы с ней. Также ментальная арифметика развивает логическое'
-                  ' мышление, причинно-следственные связи, помогает понять, как работают законы мироздания и не только.'
-                  , 'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'
-                  ],
-                 ['Ментальная арифметика – это новейший метод всестороннего развития мышления и восприятия. В настоящее'
-                  ' время довольно трудно стать по-настоящему полезным в социуме, если вышеперечисленные качества не'
-                  ' выведены на нужный уровень.',
-                  'https://www.unapersona.ru/articles/sam-sebe-psikholog/interesnye-fakty-o-mentalnoy-arifmetike.html'],
-                 ['Ментальная арифметика в странах Азии, включая КНР и Японию, является обязательным предметом для'
-                  ' изучения в учебных заведениях. Это может быть обычный школьный урок или факультативное занятие.',
-                  'https://maxxbay.livejournal.com/17292120.html'],
-                 ['Древние счеты активно применяются в странах Запада, в том числе США и Канаде.',
-                  'https://maxxbay.livejournal.com/17292120.html'],
-                 ['Ученым давно известен тот факт, что левое полушарие отвечает за логическое мышление, а правое – за '
-                  'творческие способности. К примеру, если задействовать правую руку, то включается левое полушарие и'
-                  ' наоборот. Однако задействовав одновременно оба полушария, можно достичь значимых успехов в развитие'
-                  ' ребенка.', 'https://maxxbay.livejournal.com/17292120.html'],
-                 ['Используемая нами десятичная система счисления возникла по причине того, что у человека на руках'
-                  ' 10 пальцев. Способность к абстрактному счёту появилась у людей не сразу, а использовать для счёта '
-                  'именно пальцы оказалось удобнее всего.',
-                  'https://ru.wikipedia.org/wiki/%D0%9F%D0%B0%D0%BB%D1%8C%D1%86%D0%B5%D0%B2%D1%8B%D0%B9_%D1%81%D1%87%D1%91%D1%82'],
-                 ['Было давно замечено, что если у курицы десять цыплят, то пропажа одного вызывает у нее беспокойство.'
-                  ' Считать она, конечно же, не умеет, но недостачу чувствует. А вот пропажи тринадцатого, пятнадцатого'
-                  ' она уже не замечает. Удивительно, но человек ведет себя примерно так же: количества, большие десяти'
-                  ', без предварительного счета он воспринимает как абстрактное множество. Количества, меньшие десяти, '
-                  'мы называем «несколько» и воспринимаем уже иначе.',
-                  'http://oper-sist.blogspot.com/p/blog-page_5156.html'],
-                 ['Как известно, военные любят командовать. Многовековой опыт показал, что удобнее всего командовать'
-                  ' четырьмя подчиненными. Поэтому обычно в полку четыре батальона, в батальоне – четыре роты, в роте'
-                  ' – четыре взвода и так далее. Значит, у военных на каждой «позиции» может быть до четырех единиц! '
-                  'Военные мыслят как бы в системе счисления с основанием 4. Четверичную систему используют с '
-                  'незапамятных времен индейцы юкки в Калифорнии и родственное им племя в Южной Америке - они считают '
-                  'на промежутках между пальцами.', 'http://oper-sist.blogspot.com/p/blog-page_5156.html'],
-                 ['Мы считаем отрицательные числа чем-то естественным, но так было далеко не всегда. Впервые'
-                  ' отрицательные числа были узаконены в Китае в 3 веке, но использовались лишь для исключительных '
-                  'случаев, так как считались, в общем, бессмысленными. Чуть позднее отрицательные числа стали '
-                  'использоваться в Индии для обозначения долгов.',
-                  'http://www.nsmu.ru/student/pr_education/nauch_dejt/docs/math.pdf'],
-                 ['Если мы напишем произвольное двузначное число, а затем напишем цифры этого же числа в обратном '
-                  'порядке и возьмем разность полученных чисел, то эта разность всегда разделится на 9.',
-                  'http://www.nsmu.ru/student/pr_education/nauch_dejt/docs/math.pdf'],
-                 ['В комнате, состоящей всего из 23 человек, 50% вероятности того, что у двух человек будет одинаковый '
-                  'день рождения.',
-                  'https://1gai.ru/publ/523846-16-faktov-matematiki-kotorye-zastavjat-vas-skazat-ne-uzheli-jeto-pravda.html'],
-                 ['Сумма цифр числа 18 вдвое меньше его самого. В этом плане оно единственное в своём роде.',
-                  'https://interesnyefakty.org/interesnye-fakty-o-matematike/'],
-                 ['Древние египтяне не использовали дроби.',
-                  'https://interesnyefakty.org/interesnye-fakty-o-matematike/'],
-                 ['Знак равенства впервые применил британский математик Роберт Рекорд в 1557 году.',
-                  'http://xn--80aexocohdp.xn--p1ai/22-%D0%B8%D0%BD%D1%82%D0%B5%D1%80%D0%B5%D1%81%D0%BD%D1%8B%D1%85-%D1%84%D0%B0%D0%BA%D1%82%D0%B0-%D0%BE-%D0%BC%D0%B0%D1%82%D0%B5%D0%BC%D0%B0%D1%82%D0%B8%D0%BA%D0%B5/'],
-                 ['Первые знакомые нам знаки сложения и вычитания были описаны практически 520 лет назад в книге'
-                  ' «Правила алгебры», написанной Яном Видманом.',
-                  'https://100-faktov.ru/50-interesnyx-faktov-o-matematike/'],
-                 ['Выемки (порезы или углубления) на костях животных доказывают, что люди занимались математикой'
-                  ' примерно с 30 000 лет до нашей эры.',
-                  'https://vseznaesh.ru/30-interesnyh-i-udivitelnyh-faktov-o-matematike'],
-                 ['Доведение числа Пи до 39 знаков позволяет измерить окружность наблюдаемой Вселенной с точностью до'
-                  ' ширины одного атома водорода.',
-                  'https://vseznaesh.ru/30-interesnyh-i-udivitelnyh-faktov-o-matematike']]
-        index = randint(0, len(facts) - 1)
+        facts = FACTS
+        # Under overload the first fact not shown yet is told
+        index = 0 if helper.degraded else randint(0, len(facts) - 1)
         showed = helper.showed
         if len(showed) == len(facts):
             showed = []
         while index in showed:
             index = (index + 1) % (len(facts) - 1)
-        variants = [' Сыграем еще раз?', ' Еще разок сыграем?', ' Я хочу еще увидеть вас в действии.']
-        return self.make_response(facts[index][0] + variants[randint(0, len(variants) - 1)], buttons=self.buttons +
-               [button('ИСТОЧНИК', url=facts[index][1])], state={'showed': showed + [index]})
+        variants = helper.locale['fact.again']
+        again = variants[randint(0, len(variants) - 1)]
+        card = None
+        image_id = images.get(facts[index][0]) if show_cards() else None
+        # The fact is written on the image, the link to the source is its button
+        if image_id is not None:
+            card = big_image(image_id, helper.locale['fact.title'], again.strip(),
+                             button={'text': helper.locale['fact.source'], 'url': facts[index][1]})
+        return self.make_response(facts[index][0] + again, card=card,
+                                  buttons=self.buttons + [button(helper.locale['fact.source'], url=facts[index][1])],
+                                  state={'showed': showed + [index]})
 
     def handle_local_intents(self, request: Request):
         if 'YANDEX.REJECT' in request.intents or 'start_reject' in request.intents:
@@ -1243,16 +1274,16 @@ class InterestingFact(Scenario):
         else:
             return StartBody()
 
+    @classmethod
+    def card_sources(cls):
+        return [(fact[0], TEXT) for fact in FACTS]
+
     def help(self, request):
-        text = 'Сейчас вы услышали факт, если хотите еще порешать примеры, скажите \"Еще раз\", а если хотите' \
-               ' закончить, так и скажите.'
-        return self.make_response(text, buttons=self.buttons)
+        return self.make_response(helper.locale['fact.help'], buttons=self.buttons)
 
     @property
     def buttons(self):
-        buttons = [button('Сыграть еще раз', hide=True),
-                   button('Стоп', hide=True)]
-        return buttons
+        return [button(title, hide=True) for title in helper.locale['fact.buttons']]
 
 
 def _list_scenarios():
@@ -1272,3 +1303,21 @@ SCENARIOS = {
 }
 
 DEFAULT_SCENARIO = Welcome
+
+
+def card_sources():
+    """
+    :return: (source, kind) of all card images of the skill, they are rendered by "cards.py".
+    """
+    sources = {}
+    for scenario in SCENARIOS.values():
+        for source, kind in scenario.card_sources():
+            sources[source] = kind
+    return list(sources.items())
+
+
+def distributions():
+    """
+    :return: list of (name, AliasSampler) of the operands of all scenarios, they are tested by "sampling.py".
+    """
+    return [distribution for scenario in SCENARIOS.values() for distribution in scenario.distributions()]
@@ -0,0 +1,325 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import Counter
+from urllib.parse import urlsplit
+
+import nlu
+import golden
+from numerals import russian_cardinal
+
+"""
+Local stand-in for the Dialogs platform and a closed-loop load generator.
+
+The platform keeps the "session_id" and the "message_id" of every dialog, sends the "session_state" of a response
+back in "state.session" of the next event and applies "user_state_update" to "state.user", as Yandex Dialogs does.
+The users play the dialogs of "golden.py": every user waits a random think time before the next utterance and
+answers a question correctly with the given probability. The skill is called in-process or over HTTP:
+    python simulator.py -s 2000 -t 60                                  # handler.handler in this process
+    python simulator.py -s 5000 -t 60 --url http://127.0.0.1:8080/     # a local HTTP endpoint
+With --speech the users say utterances and the "nlu" is recognized by "nlu.py", as the platform does it, instead of
+being built by "golden.py".
+The load is closed-loop: a user sends the next utterance only after the response to the previous one, so the
+offered load falls when the skill slows down, as it does with real users. The report has the latency percentiles,
+the errors and the counts of the transitions between the scenarios.
+"""
+
+DEFAULT_SESSIONS = 1000
+DEFAULT_DURATION = 30.0
+# Mean pause of a user before the next utterance in seconds
+DEFAULT_THINK_TIME = 3.0
+DEFAULT_ACCURACY = 0.7
+# Open connections to the HTTP endpoint, each of them is a file descriptor
+DEFAULT_CONNECTIONS = 256
+SKILL_ID = '75986b16-ef4a-48ae-95ce-e95c020ae7a3'
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class SimulatorError(Exception):
+    """ The skill did not respond with a valid response """
+
+
+class Session:
+    """ Dialog of a user as the platform keeps it """
+    def __init__(self, session_id, user_id, skill_id=SKILL_ID):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.skill_id = skill_id
+        self.message_id = 0
+        self.state = {}
+        self.user_state = {}
+
+    def event(self, nlu, command=''):
+        """
+        :param nlu: recognized utterance, see "request.nlu" of the event.
+        :return: the event of the next utterance of the user.
+        """
+        return {
+            'meta': {'locale': 'ru-RU', 'timezone': 'UTC', 'client_id': 'simulator', 'interfaces': {}},
+            'request': {'command': command, 'original_utterance': command, 'nlu': nlu, 'type': 'SimpleUtterance'},
+            'session': {'message_id': self.message_id, 'new': self.message_id == 0, 'session_id': self.session_id,
+                        'skill_id': self.skill_id, 'user': {'user_id': self.user_id},
+                        'application': {'application_id': self.user_id}},
+            'state': {'session': self.state, 'user': self.user_state, 'application': {}},
+            'version': '1.0'
+        }
+
+    def receive(self, response):
+        """
+        Keeps the state of the response for the next event.
+        :raises SimulatorError: if the response is not a response of a skill.
+        """
+        if type(response) is not dict or type(response.get('response')) is not dict:
+            raise SimulatorError('no "response" in the response')
+        self.message_id += 1
+        self.state = response.get('session_state') or {}
+        update = response.get('user_state_update')
+        if update:
+            # A null value deletes the key
+            for key, value in update.items():
+                if value is None:
+                    self.user_state.pop(key, None)
+                else:
+                    self.user_state[key] = value
+
+
+class InProcess:
+    """ Calls "handler.handler" in this process """
+    name = 'in-process'
+
+    def __init__(self):
+        import handler
+        self._handler = handler.handler
+
+    async def send(self, event):
+        return self._handler(event, None)
+
+    async def close(self):
+        pass
+
+
+class HTTPEndpoint:
+    """ Posts the events to a local HTTP endpoint, a connection per request """
+    def __init__(self, url, connections=DEFAULT_CONNECTIONS, timeout=10.0):
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise ValueError('Only http:// endpoints are supported, got ' + url)
+        self.name = url
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+        self._connections = asyncio.Semaphore(connections)
+        self._timeout = timeout
+
+    async def send(self, event):
+        body = json.dumps(event, ensure_ascii=False).encode('utf-8')
+        head = ('POST %s HTTP/1.1\r\nHost: %s:%d\r\nContent-Type: application/json\r\nContent-Length: %d\r\n'
+                'Connection: close\r\n\r\n' % (self._path, self._host, self._port, len(body))).encode('ascii')
+        async with self._connections:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self._host, self._port), self._timeout)
+            try:
+                writer.write(head + body)
+                status, data = await asyncio.wait_for(self._read(reader), self._timeout)
+            finally:
+                writer.close()
+        if status != 200:
+            raise SimulatorError('HTTP %d' % status)
+        return json.loads(data)
+
+    @staticmethod
+    async def _read(reader):
+        """
+        :return: (status, body) of the HTTP response.
+        """
+        head = await reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        length = None
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        data = await (reader.readexactly(length) if length is not None else reader.read())
+        return status, data
+
+    async def close(self):
+        pass
+
+
+class LoadStats:
+    """ Latencies, errors and scenario transitions of a load run """
+    def __init__(self):
+        self.latencies = []
+        self.errors = Counter()
+        self.transitions = Counter()
+        self.dialogs = 0
+        self.started = None
+        self.finished = None
+
+    @property
+    def turns(self):
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def percentile(self, p):
+        """
+        :return: the latency percentile in seconds, by the nearest rank.
+        """
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+    def report(self, out=sys.stdout, limit=20):
+        elapsed = self.elapsed
+        turns = self.turns
+        print('%d turns, %d finished dialogs in %.1f s, %.0f turns/s' %
+              (turns, self.dialogs, elapsed, turns / elapsed if elapsed else 0.0), file=out)
+        latencies = sorted(self.latencies)
+        if latencies:
+            print('latency ms: ' + ', '.join('p%s %.2f' % (p, self.percentile(p) * 1000) for p in PERCENTILES) +
+                  ', max %.2f' % (latencies[-1] * 1000), file=out)
+        errors = sum(self.errors.values())
+        print('errors: %d (%.2f%%)' % (errors, 100.0 * errors / turns if turns else 0.0), file=out)
+        for kind, count in self.errors.most_common():
+            print('    %-40s %d' % (kind, count), file=out)
+        print('transitions:', file=out)
+        for (source, target), count in self.transitions.most_common(limit):
+            print('    %-22s -> %-22s %d' % (source, target, count), file=out)
+
+
+# Utterances of the intents of the dialogs of "golden.py"
+PHRASES = {
+    'help': 'что ты умеешь',
+    'start_confirm': 'давай начнём',
+    'YANDEX.CONFIRM': 'да',
+    'YANDEX.HELP': 'помощь',
+    'YANDEX.REPEAT': 'повтори',
+    'back': 'назад',
+    'interesting_facts': 'расскажи интересные факты',
+    'start_reject': 'закончить',
+    'addition_subtraction': 'сложение и вычитание',
+    'multiplication_division': 'умножение и деление',
+    'fractions': 'операции с дробями',
+    'exponentiation': 'возведение в степень',
+    'square_root': 'вычисление квадратного корня',
+    'trigonometry': 'тригонометрические табличные значения',
+}
+
+
+def utterance(step, state):
+    """
+    :param state: session state of the previous response.
+    :return: what the user says at the step of a dialog of "golden.py", numbers are said in words.
+    """
+    kind, argument = step
+    if kind == 'intent':
+        return PHRASES[argument] if argument is not None else ''
+    if kind == 'variant':
+        return 'повтори вариант ' + russian_cardinal(argument)
+    if kind == 'entity':
+        return russian_cardinal(argument)
+    # The answer is a number or a numerator with a denominator
+    tokens = golden.step_nlu(step, state)['tokens']
+    return ' на '.join(russian_cardinal(int(token)) for token in tokens)
+
+
+def _steps(number, accuracy, rng):
+    """
+    :return: the steps of the dialog of "golden.py", an answer is correct with the probability of the accuracy.
+    """
+    return [(kind, rng.random() < accuracy) if kind == 'answer' else (kind, argument)
+            for kind, argument in golden.script(number)]
+
+
+async def _user(index, transport, stats, deadline, sessions, think_time, accuracy, seed, speech):
+    """ Plays dialogs one after another until the deadline """
+    loop = asyncio.get_running_loop()
+    rng = random.Random('%d-%d' % (seed, index))
+    # The users start spread over a think time, not all at once
+    await asyncio.sleep(min(rng.uniform(0, think_time), max(deadline - loop.time(), 0)))
+    number = index
+    while loop.time() < deadline:
+        session = Session('simulator-%d-%d' % (seed, number), 'user-%d' % index)
+        for step in _steps(number, accuracy, rng):
+            if loop.time() >= deadline:
+                return
+            source = session.state.get('scenario') or '-'
+            if speech:
+                said = utterance(step, session.state)
+                event = session.event(nlu.understand(said), said)
+            else:
+                event = session.event(golden.step_nlu(step, session.state))
+            started = time.perf_counter()
+            failed = True
+            try:
+                response = await transport.send(event)
+                session.receive(response)
+                failed = False
+            except SimulatorError as e:
+                stats.errors[str(e)] += 1
+            except Exception as e:
+                stats.errors[type(e).__name__] += 1
+            if not failed:
+                stats.latencies.append(time.perf_counter() - started)
+                stats.transitions[(source, session.state.get('scenario') or '-')] += 1
+            if think_time:
+                await asyncio.sleep(min(rng.expovariate(1 / think_time), max(deadline - loop.time(), 0)))
+            # The dialog is abandoned after a failure, like a user does
+            # The skill ends the dialog at the top level of the response, as the platform reads it
+            if failed or response.get('end_session'):
+                break
+        stats.dialogs += 1
+        number += sessions
+
+
+async def run(transport, sessions=DEFAULT_SESSIONS, duration=DEFAULT_DURATION, think_time=DEFAULT_THINK_TIME,
+              accuracy=DEFAULT_ACCURACY, seed=0, speech=False):
+    """
+    Simulates the users for the duration.
+    :param sessions: number of concurrent users.
+    :param speech: if True the users say utterances recognized by "nlu.py".
+    :return: LoadStats.
+    """
+    stats = LoadStats()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    stats.started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_user(i, transport, stats, deadline, sessions, think_time, accuracy, seed, speech)
+                               for i in range(sessions)))
+    finally:
+        stats.finished = time.perf_counter()
+        await transport.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate the users of the skill on a local platform.')
+    parser.add_argument('-s', '--sessions', type=int, default=DEFAULT_SESSIONS, help='concurrent users')
+    parser.add_argument('-t', '--duration', type=float, default=DEFAULT_DURATION, help='seconds')
+    parser.add_argument('--think-time', type=float, default=DEFAULT_THINK_TIME, help='mean pause in seconds')
+    parser.add_argument('--accuracy', type=float, default=DEFAULT_ACCURACY, help='share of correct answers')
+    parser.add_argument('--url', help='HTTP endpoint of the skill, handler.handler is called in-process without it')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--speech', action='store_true', help='recognize utterances with the offline NLU')
+    args = parser.parse_args(argv)
+    transport = HTTPEndpoint(args.url, args.connections) if args.url else InProcess()
+    print('Simulating %d users against %s for %.0f s' % (args.sessions, transport.name, args.duration))
+    stats = asyncio.run(run(transport, args.sessions, args.duration, args.think_time, args.accuracy, args.seed,
+                            args.speech))
+    stats.report()
+    return 1 if stats.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,8 @@
+import os
+import sys
+
+"""
+The modules of the skill are at the root of the repository, the tests import them as the handler does.
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,26 @@
+import time
+
+import handler
+from classroom import Classroom, Room
+from locales import RUSSIAN
+from test_retry_cache import _event
+
+
+def test_expired_room_is_not_found():
+    classroom = Classroom(ttl=60)
+    room = classroom.create('teacher')
+    # A room created before the TTL
+    old = Room(1000 if room.code != 1000 else 1001, 'teacher', 1, 'Fractions', created=time.time() - 120)
+    classroom._rooms[old.code] = old
+    classroom._rooms.move_to_end(old.code, last=False)
+    assert classroom.get(old.code) is None
+    assert classroom.get(room.code) is room
+
+
+def test_join_without_the_code_asks_for_it():
+    event = _event(message_id=1, session_id='join-without-code')
+    event['request']['nlu']['intents'] = {'join_room': {'slots': {}}}
+    event['state']['session'] = {'scenario': 'StartBody'}
+    response = handler.handler(event, None)
+    assert response['response']['text'] == RUSSIAN['room.code']
+    assert response['session_state']['scenario'] == 'StartBody'
@@ -0,0 +1,73 @@
+from fractions import Fraction
+
+import pytest
+
+import nlu
+import events
+import scenarios
+from events import UserRequest
+from numerals import Degrees
+from equivalence import number_forms, angle_forms, matches, parse
+
+
+def _request(utterance):
+    # The platform keeps "/" and "π" in the tokens
+    return UserRequest(tokens=tuple(utterance.split()), intents=nlu.understand(utterance)['intents'])
+
+
+@pytest.mark.parametrize('utterance', ['150', '30', 'пи на шесть', '5π/6', '0.52', '0,524', 'это 390 градусов'])
+def test_angle_answers(utterance):
+    assert matches(_request(utterance), angle_forms((30, 150)))
+
+
+@pytest.mark.parametrize('utterance', ['60', 'пи на три', '0.5', 'минус 30'])
+def test_wrong_angle_answers(utterance):
+    assert not matches(_request(utterance), angle_forms((30, 150)))
+
+
+@pytest.mark.parametrize('utterance', ['5/3', '10/6', '1 целая 2/3', 'одна целая две третьих', '1.67', '1,666'])
+def test_fraction_answers(utterance):
+    assert matches(_request(utterance), number_forms((Fraction(5, 3),)))
+
+
+@pytest.mark.parametrize('utterance', ['3/5', '1.6', '2', 'одна вторая'])
+def test_wrong_fraction_answers(utterance):
+    assert not matches(_request(utterance), number_forms((Fraction(5, 3),)))
+
+
+def test_negative_numbers():
+    assert matches(_request('минус одна вторая'), number_forms((Fraction(-1, 2),)))
+    assert not matches(_request('одна вторая'), number_forms((Fraction(-1, 2),)))
+
+
+def test_loose_reads_the_integers_on_their_own():
+    # "1 2" is read as 1/2, the recognition may have broken the answer apart
+    request = _request('1 2')
+    assert not matches(request, number_forms((2,)))
+    assert matches(request, number_forms((2,)), loose=True)
+
+
+def test_parse_reads_exact_values():
+    assert parse(['5π/6']) == [(Fraction(5, 6), True)]
+    assert parse(['пять', 'пи', 'на', 'шесть']) == [(Fraction(5, 6), True)]
+    assert parse(['это', '90', 'или', '180']) == [(90, False), (180, False)]
+    assert (Fraction(7, 4), False) in parse(['одна', 'целая', 'три', 'четвёртых'])
+
+
+def _review(state, utterance):
+    """
+    :return: (checked, answer shown) of the answer to a trigonometry review question.
+    """
+    event = events.decode({'meta': {'locale': 'ru-RU'}, 'request': nlu.request(utterance),
+                           'session': {'session_id': 'review', 'message_id': 1, 'new': False},
+                           'state': {'session': dict(state, review=[1, 'Trigonometry'])}, 'version': '1.0'})
+    scenarios.init_helper(event)
+    task = scenarios.Trigonometry()
+    return task.check_answer(event.request), task.answer_value()
+
+
+def test_review_of_a_single_angle_question():
+    # sin?° = 1, the angle is said in radians
+    assert _review({'answer': [90], 'angle': True}, 'пи на два') == (True, Degrees(90))
+    assert _review({'answer': [1], 'angle': False}, 'один') == (True, 1)
+    assert _review({'answer': [1], 'angle': False}, 'пи на два')[0] is False
@@ -0,0 +1,21 @@
+import pytest
+
+from events import EventError, decode
+from test_retry_cache import _event
+
+
+@pytest.mark.parametrize('field', ['locale', 'timezone', 'client_id'])
+@pytest.mark.parametrize('value', [['ru-RU'], {'ru': 'RU'}, 1])
+def test_meta_of_a_wrong_type_is_rejected(field, value):
+    event = _event()
+    event['meta'][field] = value
+    with pytest.raises(EventError, match='meta.' + field):
+        decode(event)
+
+
+def test_meta_is_cached_by_its_values():
+    first = decode(_event()).meta
+    assert decode(_event()).meta is first
+    event = _event()
+    event['meta']['locale'] = 'en-US'
+    assert decode(event).meta.locale == 'en-US'
@@ -0,0 +1,14 @@
+import io
+import os
+
+import golden
+
+GOLDENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'goldens')
+# Dialogs with the hashes in GOLDENS
+DIALOGS = 200
+
+
+def test_dialogs_match_the_goldens():
+    out = io.StringIO()
+    changed = golden.check(DIALOGS, GOLDENS, workers=1, out=out)
+    assert not changed, out.getvalue()
@@ -0,0 +1,64 @@
+import handler
+import checkpoint
+from events import decode
+from locales import RUSSIAN, ENGLISH
+from load_shedding import shed_response
+from progress import progress
+from test_retry_cache import _event
+
+
+def _repeat(state, user_id='repeat-user'):
+    # The previous response was given by another instance, it is not in the retry cache
+    event = _event(message_id=3, session_id=user_id)
+    event['session']['user'] = {'user_id': user_id}
+    event['request']['nlu']['intents'] = {'YANDEX.REPEAT': {'slots': {}}}
+    event['state']['session'] = state
+    return handler.handler(event, None)
+
+
+def test_repeat_asks_the_review_question_again():
+    deck = progress.deck('repeat-user')
+    item = deck.add('Fractions', '1/2 + 1/2 = ?', '1/2 + 1/2', {'answer': 1, 'answer_den': 1}, 0)
+    state = {'scenario': 'Review', 'review': [item.id, 'Fractions'], 'answer': 1, 'answer_den': 1}
+    response = _repeat(state)
+    assert response['response']['text'] == '1/2 + 1/2 = ?'
+    assert response['session_state'] == dict(state, showed=response['session_state']['showed'])
+    # The question is not graded by the repeat
+    assert item.box == 0
+
+
+def test_repeat_never_answers_a_question():
+    # The review question is not in the deck of the user, it can not be asked again
+    state = {'scenario': 'Review', 'review': [12345, 'Fractions'], 'answer': 1, 'answer_den': 1}
+    response = _repeat(state, user_id='repeat-stranger')
+    assert response['session_state']['review'] == [12345, 'Fractions']
+    assert response['session_state']['answer'] == 1
+
+
+def _english(event):
+    event['meta']['locale'] = 'en-US'
+    return event
+
+
+def test_trigonometry_is_spoken_in_the_language_of_the_request():
+    event = _english(_event(message_id=1, session_id='english-trigonometry'))
+    event['request']['nlu']['intents'] = {'trigonometry': {'slots': {}}}
+    event['state']['session'] = {'scenario': 'StartBody'}
+    response = handler.handler(event, None)
+    assert response['session_state']['scenario'] == 'Trigonometry'
+    assert any(name in response['response']['tts'] for name in ENGLISH['Trigonometry.names'])
+    assert not any(name in response['response']['tts'] for name in RUSSIAN['Trigonometry.names'])
+
+
+def test_shed_response_is_in_the_language_of_the_request():
+    event = decode(_english(_event()))
+    assert shed_response(event)['response']['text'] == ENGLISH['shed.reply']
+
+
+def test_parting_forgets_the_unfinished_round():
+    event = _event(message_id=1, session_id='parting')
+    event['request']['nlu']['intents'] = {'start_reject': {'slots': {}}}
+    event['state']['session'] = {'scenario': 'Fractions', 'answer': 1, 'answer_den': 2}
+    event['state']['application'] = {checkpoint.KEY: '1.2.21i3v9.4.3.8m.0.h9kjk.'}
+    response = handler.handler(event, None)
+    assert response['end_session'] and response['application_state'] == {}
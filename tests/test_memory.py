@@ -0,0 +1,11 @@
+import sys
+import subprocess
+
+import memory
+
+
+def test_steady_state_rss_is_within_the_budget():
+    # A process of its own, the RSS of the test runner is not the one of a worker
+    result = subprocess.run([sys.executable, memory.__file__, '--turns', str(memory.FULL_TURNS), '--budget',
+                             str(memory.BUDGET)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
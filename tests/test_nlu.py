@@ -0,0 +1,62 @@
+import pytest
+
+import nlu
+
+
+@pytest.mark.parametrize('utterance, intent', [
+    ('да', 'YANDEX.CONFIRM'),
+    ('не хочу', 'YANDEX.REJECT'),
+    ('повтори', 'YANDEX.REPEAT'),
+    ('не расслышал', 'say_again'),
+    ('что ты умеешь', 'help'),
+    ('что умеет навык', 'help'),
+    ('давай начнем', 'start_confirm'),
+    ('хватит', 'start_reject'),
+    ('назад', 'back'),
+    ('в самое начало', 'to_start'),
+    ('в начало', 'to_start'),
+    ('расскажи интересный факт', 'interesting_facts'),
+    ('интересные факты', 'interesting_facts'),
+    ('повторить ошибки', 'review'),
+    ('режим на скорость', 'speed_run'),
+    ('марафон', 'marathon'),
+    ('создай класс', 'create_room'),
+    ('операции с дробями', 'fractions'),
+    ('3 операции с дробями', 'fractions'),
+    ('квадратный корень', 'square_root'),
+    ('тригонометрия', 'trigonometry'),
+])
+def test_intents(utterance, intent):
+    assert intent in nlu.understand(utterance)['intents']
+
+
+@pytest.mark.parametrize('utterance', ['абракадабра', 'начнем давай потом', 'что', ''])
+def test_no_intents(utterance):
+    assert nlu.understand(utterance)['intents'] == {}
+
+
+def test_number_slot():
+    intent = nlu.understand('ответ минус 15 градусов')['intents']['answer']
+    assert intent['slots']['Answer']['value'] == -15
+    assert intent['slots']['Answer']['tokens'] == {'start': 1, 'end': 2}
+
+
+def test_fraction_slots():
+    slots = nlu.understand('5 на 3')['intents']['answer']['slots']
+    assert slots['Answer']['value'] == 5 and slots['Denominator']['value'] == 3
+
+
+def test_room_code():
+    intent = nlu.understand('войти в класс 1234')['intents']['join_room']
+    assert intent['slots']['Code']['value'] == 1234
+
+
+def test_entities_of_numbers():
+    understood = nlu.understand('двенадцать или 2.5')
+    assert understood['tokens'] == ['12', 'или', '2.5']
+    assert [entity['value'] for entity in understood['entities']] == [12, 2.5]
+
+
+def test_pattern_tokens():
+    assert nlu.pattern_tokens('что (ты|этот навык)? умеешь $Answer?') == [
+        'что', '(', 'ты', '|', 'этот', 'навык', ')', '?', 'умеешь', '$Answer', '?']
@@ -0,0 +1,50 @@
+import batch
+import golden
+import handler
+import rounds
+import load_shedding
+import rate_limit
+import retry_cache
+from test_retry_cache import _event, _dumps
+
+
+def _globals():
+    return (load_shedding.monitor.thresholds, rate_limit.limiter.limits, retry_cache.retries.enabled, rounds.clock,
+            handler.retries)
+
+
+def test_batch_in_process_restores_the_settings():
+    before = _globals()
+    for response in batch.handle_many([_event(session_id='offline-batch')] * 3, workers=1, seed=1, chunk_size=2):
+        # The caller runs with its own settings between the chunks
+        assert _globals() == before
+        assert 'error' not in response
+    assert _globals() == before
+
+
+def test_golden_in_process_restores_the_settings():
+    retry_cache.retries.put(('offline-golden', 0), {'response': {'text': 'kept'}})
+    before = _globals()
+    assert len(list(golden._run(2, workers=1))) == 2
+    assert _globals() == before
+    # The cache of the caller is not cleared by the played dialogs
+    assert retry_cache.retries.get(('offline-golden', 0)) == {'response': {'text': 'kept'}}
+
+
+def _dialog_events(number):
+    # The events of a golden dialog with the states of its responses
+    events = []
+    state = {}
+    for message_id, (step, turn) in enumerate(zip(golden.script(number), golden.play(number))):
+        events.append(golden._event(step, number, message_id, state))
+        state = turn['session_state']
+    return events
+
+
+def test_seeded_batch_runs_are_identical():
+    events = [event for number in range(5) for event in _dialog_events(number)]
+    first = _dumps(batch.handle_many(events, workers=1, seed=7))
+    second = _dumps(batch.handle_many(events, workers=2, seed=7, chunk_size=3))
+    assert first == second
+    # The timed questions are in the output
+    assert any('"asked_at"' in response for response in first)
@@ -0,0 +1,32 @@
+import progress
+from progress import ProgressStore, ReviewDeck
+
+
+def test_decks_are_bounded_in_memory(monkeypatch):
+    monkeypatch.setattr(progress, 'MAX_DECKS', 3)
+    store = ProgressStore()
+    for user in ('a', 'b', 'c'):
+        store.deck(user).add('Fractions', '1/2 + 1/2 = ?', 'tts', {'answer': 1}, 0)
+    # "a" is used again, "b" is the least recently used
+    store.deck('a')
+    store.deck('d')
+    assert len(store._decks) == 3
+    assert len(store.deck('a')) == 1
+    assert len(store.deck('b')) == 0
+
+
+def test_decks_are_loaded_again_after_eviction(monkeypatch, tmp_path):
+    monkeypatch.setattr(progress, 'MAX_DECKS', 1)
+    store = ProgressStore(str(tmp_path / 'progress.sqlite3'))
+    store.deck('a').add('Fractions', '1/2 + 1/2 = ?', 'tts', {'answer': 1}, 0)
+    store.save('a')
+    store.deck('b')
+    assert 'a' not in store._decks
+    assert len(store.deck('a')) == 1
+
+
+def test_missed_question_is_due_first():
+    deck = ReviewDeck()
+    first = deck.add('Fractions', '1/2 + 1/2 = ?', 'tts', {'answer': 1}, 0)
+    deck.add('SquareRoot', '√16 = ?', 'tts', {'answer': 4}, 10)
+    assert deck.next_due(100).id == first.id
@@ -0,0 +1,24 @@
+import question_bank
+import question_tables
+from question_bank import QuestionBank, build_default, load_tables, source_hash
+
+
+def test_bank_has_the_questions_of_the_tables(tmp_path):
+    path = str(tmp_path / 'questions.bank')
+    build_default(path)
+    assert QuestionBank(path).source == source_hash()
+    trigonometry, facts = load_tables(path)
+    assert list(trigonometry) == list(question_tables.TRIGONOMETRY)
+    assert list(facts) == list(question_tables.FACTS)
+
+
+def test_stale_bank_is_not_read(tmp_path):
+    path = str(tmp_path / 'questions.bank')
+    records = list(question_bank._fact_records([('Устаревший факт', 'link')]))
+    question_bank.build(path, records, 3, source=b'\0' * 20)
+    trigonometry, facts = load_tables(path)
+    assert trigonometry is question_tables.TRIGONOMETRY and facts is question_tables.FACTS
+
+
+def test_missing_bank_falls_back_to_the_tables(tmp_path):
+    assert load_tables(str(tmp_path / 'missing.bank')) == (question_tables.TRIGONOMETRY, question_tables.FACTS)
@@ -0,0 +1,80 @@
+import pytest
+
+import events
+import handler
+from locales import RUSSIAN, ENGLISH
+from rate_limit import RateLimiter, Limits, BucketStore, limiter, limited_response
+from retry_cache import retries
+
+from test_retry_cache import _event
+
+
+def test_burst_then_refill():
+    bucket = RateLimiter(Limits(rate=1, burst=3))
+    assert [bucket.allow('a', now=t) for t in (0, 0, 0, 0, 0.5, 1.0)] == [True, True, True, False, False, True]
+    assert bucket.counters == {'allowed': 4, 'limited': 2}
+
+
+def test_idle_bucket_is_full_again():
+    bucket = RateLimiter(Limits(rate=1, burst=2))
+    assert bucket.allow('a', now=0) and bucket.allow('a', now=0) and not bucket.allow('a', now=0)
+    assert [bucket.allow('a', now=100) for _ in range(3)] == [True, True, False]
+
+
+def test_least_recently_seen_bucket_is_evicted():
+    bucket = RateLimiter(Limits(rate=1, burst=1, max_clients=2))
+    bucket.allow('a', now=0)
+    bucket.allow('b', now=0)
+    # "a" is seen again, "b" is the least recently seen
+    bucket.allow('a', now=0)
+    bucket.allow('c', now=0)
+    assert len(bucket) == 2
+    assert bucket.counters['evicted'] == 1
+    # The bucket of "b" is new, the one of "a" is empty
+    assert bucket.allow('b', now=0)
+    assert not bucket.allow('c', now=0)
+
+
+def test_unidentified_and_unlimited_clients_are_allowed():
+    bucket = RateLimiter(Limits(rate=1, burst=1))
+    assert all(bucket.allow(None, now=0) for _ in range(5))
+    assert bucket.counters['unidentified'] == 5
+    never = RateLimiter(Limits.never())
+    assert all(never.allow('a', now=0) for _ in range(100))
+
+
+def test_shared_store(tmp_path):
+    bucket = RateLimiter(Limits(rate=1, burst=3), store=BucketStore(str(tmp_path / 'buckets.sqlite3')))
+    assert [bucket.allow('a', now=100 + t) for t in (0, 0, 0, 0, 1.0)] == [True, True, True, False, True]
+
+
+def test_limited_response_is_in_the_language_of_the_request():
+    event = _event()
+    assert limited_response(events.decode(event))['response']['text'] == RUSSIAN['limited.reply']
+    event['meta']['locale'] = 'en-US'
+    assert limited_response(events.decode(event))['response']['text'] == ENGLISH['limited.reply']
+
+
+@pytest.fixture
+def one_request():
+    """ The limiter of the handler allows one request per client """
+    limits = limiter.limits
+    limiter.limits = Limits(rate=0, burst=1)
+    limiter.reset()
+    retries.clear()
+    yield
+    limiter.limits = limits
+    limiter.reset()
+
+
+def test_retry_does_not_take_a_token(one_request):
+    event = _event(session_id='limited', application_id='flood')
+    first = handler.handler(event, None)
+    assert first['response']['text'] != RUSSIAN['limited.reply']
+    # Retries of the allowed request get its response
+    assert all(handler.handler(event, None) == first for _ in range(3))
+    assert limiter.counters == {'allowed': 1}
+    # A new request of the client is limited and the client stays in its scenario
+    response = handler.handler(_event(1, session_id='limited', application_id='flood'), None)
+    assert response['response']['text'] == RUSSIAN['limited.reply']
+    assert limiter.counters['limited'] == 1
@@ -0,0 +1,64 @@
+import json
+
+import batch
+import handler
+from retry_cache import RetryCache, retries
+
+
+def _event(message_id=0, session_id='s', application_id='a'):
+    return {
+        'meta': {'locale': 'ru-RU', 'timezone': 'UTC', 'interfaces': {}},
+        'request': {'command': '', 'original_utterance': '', 'nlu': {'tokens': [], 'entities': [], 'intents': {}},
+                    'type': 'SimpleUtterance'},
+        'session': {'message_id': message_id, 'new': message_id == 0, 'session_id': session_id,
+                    'application': {'application_id': application_id}},
+        'state': {'session': {}, 'user': {}, 'application': {}},
+        'version': '1.0'
+    }
+
+
+def _dumps(responses):
+    return [json.dumps(response, ensure_ascii=False, sort_keys=True) for response in responses]
+
+
+def test_retry_gets_the_response_of_the_first_request():
+    cache = RetryCache()
+    assert cache.claim(('s', 1)) is None
+    cache.put(('s', 1), {'response': {'text': 'first'}})
+    assert cache.claim(('s', 1)) == {'response': {'text': 'first'}}
+    assert cache.counters['hits'] == 1 and cache.counters['misses'] == 1
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = RetryCache(enabled=False)
+    assert cache.claim(('s', 1)) is None
+    cache.put(('s', 1), {'response': {'text': 'first'}})
+    assert cache.claim(('s', 1)) is None
+    assert cache.get(('s', 1)) is None
+    assert len(cache) == 0
+
+
+def test_handler_replays_a_retry():
+    retries.clear()
+    event = _event(session_id='retry-replay')
+    first = handler.handler(event, None)
+    assert all(handler.handler(event, None) == first for _ in range(5))
+    assert retries.counters['hits'] == 5
+
+
+def test_seeded_batch_does_not_depend_on_the_workers():
+    # Copies of one event are not retries, every one of them is handled with its own seed
+    events = [_event(session_id='batch-copies')] * 60
+    single = _dumps(batch.handle_many(events, workers=1, seed=1))
+    several = _dumps(batch.handle_many(events, workers=3, seed=1))
+    assert single == several
+    assert len(set(single)) > 1
+
+
+def test_clear_forgets_the_claims():
+    cache = RetryCache()
+    assert cache.claim(('s', 1)) is None
+    cache.clear()
+    # The request is claimed again instead of waiting for the forgotten claim
+    assert cache.claim(('s', 1), timeout=5.0) is None
+    assert cache.counters == {'misses': 1}
@@ -0,0 +1,104 @@
+import time
+import socket
+import threading
+
+import pytest
+
+import router
+from load_shedding import Thresholds, monitor
+from tts import OPENING_SOUND
+
+from test_retry_cache import _event
+
+
+def test_queue_of_a_worker_degrades_the_answers(monkeypatch):
+    monkeypatch.setattr(monitor, 'thresholds', Thresholds(degrade_queue_depth=1))
+    monitor.reset()
+    responses = {}
+
+    def handle(number):
+        responses[number] = router._handle_queued(_event(session_id='queued-' + str(number)))
+
+    # The events arrive while the worker is busy and wait for the handler
+    with router._handler_lock:
+        threads = [threading.Thread(target=handle, args=(number,)) for number in range(3)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while monitor.in_flight < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+    assert monitor.counters['degraded.queue_depth'] == 2
+    # The degraded answers are played without sounds
+    assert sum(OPENING_SOUND not in response['response']['tts'] for response in responses.values()) == 2
+
+
+def _events(sessions, turns):
+    return [router._sample_event('affinity-' + str(session), turn) for session in range(sessions)
+            for turn in range(turns)]
+
+
+def test_turns_of_a_session_reach_one_worker():
+    ring = router.HashRing(['worker-0', 'worker-1', 'worker-2'])
+    owners = {}
+    for event in _events(200, 3):
+        owner = ring.get_node(router.session_key(event))
+        assert owners.setdefault(event['session']['session_id'], owner) == owner
+    # A new worker takes sessions from the others, the rest of the sessions stay where they were
+    ring.add_node('worker-3')
+    moved = {session for session, owner in owners.items() if ring.get_node(session) != owner}
+    assert moved and all(ring.get_node(session) == 'worker-3' for session in moved)
+    assert len(moved) < len(owners) / 2
+
+
+def test_sessions_are_spread_over_the_workers():
+    with router.Router(3) as pool:
+        events = _events(30, 2)
+        responses = [pool.handler(event, None) for event in events]
+        assert pool.routed == len(events) and pool.failovers == 0
+        assert all('response' in response for response in responses)
+        assert {pool.worker_for(event) for event in events} == set(pool.workers)
+        assert router.benchmark(2, sessions=4, turns=2) > 0
+
+
+def _silent_worker(path, hold=0.0):
+    """ Worker reading one event and closing the connection after "hold" seconds without an answer """
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def serve():
+        connection, _ = server.accept()
+        router.recv_frame(connection)
+        time.sleep(hold)
+        connection.close()
+        server.close()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    return thread
+
+
+def test_event_sent_to_a_worker_is_not_handled_again(tmp_path):
+    path = str(tmp_path / 'dying.sock')
+    thread = _silent_worker(path)
+    attached = router.Router.attach({'dying': path})
+    with pytest.raises(ConnectionError):
+        attached.handler(_event(session_id='dying'), None)
+    thread.join()
+    assert attached.failovers == 0
+    # An event that never reached the worker is handled in-process
+    assert 'response' in attached.handler(_event(session_id='dying'), None)
+    assert attached.failovers == 1
+
+
+def test_late_worker_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(router, 'READ_TIMEOUT', 0.05)
+    path = str(tmp_path / 'late.sock')
+    thread = _silent_worker(path, hold=0.5)
+    attached = router.Router.attach({'late': path})
+    with pytest.raises(socket.timeout):
+        attached.handler(_event(session_id='late'), None)
+    thread.join()
+    assert attached.failovers == 0
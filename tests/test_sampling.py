@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from sampling import AliasSampler, Tiered, chi_squared, critical, fits
+from scenarios import distributions
+
+
+@pytest.mark.parametrize('name, sampler', distributions(), ids=[name for name, _ in distributions()])
+def test_distributions_of_the_scenarios_fit_their_weights(name, sampler):
+    assert fits(sampler, rng=random.Random(0))
+
+
+def test_skewed_draws_do_not_fit():
+    # Draws of one distribution tested against other weights
+    uniform = AliasSampler(dict.fromkeys(range(10), 1))
+    skewed = AliasSampler(dict.fromkeys(range(10), 1), {0: 2})
+    skewed.weights = uniform.weights
+    statistic, freedom = chi_squared(skewed, rng=random.Random(0))
+    assert freedom == 9 and statistic > critical(freedom)
+
+
+def test_rare_values_are_drawn():
+    sampler = AliasSampler(dict.fromkeys(range(1, 4), 1000), {0: 1})
+    assert sampler.probability(0) == 1 / 3001
+    rng = random.Random(0)
+    assert 0 in {sampler.sample(rng) for _ in range(100000)}
+
+
+def test_tier_is_chosen_by_the_key():
+    small, large = AliasSampler({1: 1}), AliasSampler({2: 1})
+    tiered = Tiered([(10, small), (None, large)])
+    assert tiered.tier(9) is small and tiered.tier(10) is large
+    assert tiered.sample(100) == 2
+    with pytest.raises(ValueError):
+        Tiered([(10, small)])
@@ -0,0 +1,175 @@
+from fractions import Fraction
+from collections import namedtuple
+
+from numerals import Ratio, Degrees
+from locales import RUSSIAN
+
+"""
+Trigonometry table generated from the exact values of the functions.
+
+The values of sin, cos, tg and ctg at the multiples of 30° and 45° are 0, ±1/2, ±√2/2, ±√3/2, ±1, ±√3, ±1/√3 or
+undefined. They are computed exactly as a rational times a square root, so the questions, their texts and the TTS
+are derived from the values and the answers of a question about the angle come from the inverse index of
+(function, value) to all the angles of the table with this value. The questions are spoken with the "Trigonometry."
+messages of a locale, the tables of the locales have the same questions in the same order:
+    table = build()                                     # the table of the skill, 0° to 360°
+    table = build(locale=ENGLISH)                       # the same table spoken in English
+    table = build(range(0, 721, 30), radians=True)      # a wider range with the angles in radians
+    table.index[('sin', Exact(Fraction(1, 2), 1))]      # frozenset({30, 150})
+The values in VALUES are asked for directly, e.g. "tg45° = ?", the other values are given and the angle is asked for
+once per value, e.g. "sin?° = 1/2".
+"""
+
+FUNCTIONS = ('sin', 'cos', 'tg', 'ctg')
+ANGLES = tuple(sorted(set(range(0, 361, 30)) | set(range(0, 361, 45))))
+# Values the user answers with a number, the other ones are irrational or fractions hard to say
+VALUES = (-1, 0, 1)
+
+# Exact value: rational * √radicand, the radicand is square-free
+Exact = namedtuple('Exact', 'rational radicand')
+# Questions (text, tts, answer) in the order of the angles and the index of (function, value) to the angles
+Table = namedtuple('Table', 'questions index')
+
+# Radicands written under the line, 1/√3 but √2/2 as in the school tables
+_RECIPROCAL = frozenset((3,))
+# sin in the first quadrant
+_SIN = {0: Exact(Fraction(0), 1), 30: Exact(Fraction(1, 2), 1), 45: Exact(Fraction(1, 2), 2),
+        60: Exact(Fraction(1, 2), 3), 90: Exact(Fraction(1), 1)}
+
+
+def _sin(angle):
+    angle %= 360
+    sign = 1
+    if angle >= 180:
+        angle -= 180
+        sign = -1
+    if angle > 90:
+        angle = 180 - angle
+    if angle not in _SIN:
+        raise ValueError('No exact value of sin at %d°, the angles are multiples of 30° or 45°' % angle)
+    value = _SIN[angle]
+    return Exact(sign * value.rational, value.radicand)
+
+
+def _divide(a, b):
+    """
+    :return: the exact value of a / b, None if b is 0.
+    """
+    if b.rational == 0:
+        return None
+    # a·√r / (b·√s) = a / (b·s) · √(r·s)
+    rational = a.rational / (b.rational * b.radicand)
+    radicand = a.radicand * b.radicand
+    for factor in (2, 3):
+        while radicand % (factor * factor) == 0:
+            radicand //= factor * factor
+            rational *= factor
+    return Exact(rational, radicand if rational else 1)
+
+
+def exact(function, angle):
+    """
+    :param angle: angle in degrees, a multiple of 30° or 45°.
+    :return: Exact value of the function at the angle, None if it is undefined.
+    :raises ValueError: if the value at the angle is not one of the exact values.
+    """
+    sin, cos = _sin(angle), _sin(90 - angle)
+    if function == 'sin':
+        return sin
+    if function == 'cos':
+        return cos
+    if function == 'tg':
+        return _divide(sin, cos)
+    if function == 'ctg':
+        return _divide(cos, sin)
+    raise ValueError('Unknown function ' + function)
+
+
+def written(value):
+    """
+    :return: the value as it is written in the questions, e.g. "-√3/2" or "1/√3".
+    """
+    sign = '-' if value.rational < 0 else ''
+    rational = abs(value.rational)
+    if value.radicand == 1:
+        return sign + str(rational)
+    root = '√%d' % value.radicand
+    if value.radicand in _RECIPROCAL and rational == Fraction(1, value.radicand):
+        return sign + '1/' + root
+    return sign + root + ('/%d' % rational.denominator if rational.denominator != 1 else '')
+
+
+def spoken(value, locale=RUSSIAN):
+    """
+    :return: the value in words as the answer of a question about the angle, e.g. "минус корню из трёх делённому на
+        два".
+    """
+    sign = locale['Trigonometry.minus'] if value.rational < 0 else ''
+    rational = abs(value.rational)
+    if value.radicand == 1:
+        return sign + locale.speech(locale['Trigonometry.rational'], Ratio(rational.numerator, rational.denominator))
+    if value.radicand in _RECIPROCAL and rational == Fraction(1, value.radicand):
+        return sign + locale.speech(locale['Trigonometry.reciprocal_root'], value.radicand)
+    if rational.denominator == 1:
+        return sign + locale.speech(locale['Trigonometry.root'], value.radicand)
+    return sign + locale.speech(locale['Trigonometry.root_fraction'], value.radicand, rational.denominator)
+
+
+def _angle(angle, radians, locale):
+    """
+    :return: (text, words) of the angle of a question.
+    """
+    if not radians:
+        return '%d°' % angle, locale.speech(locale['Trigonometry.angle'], Degrees(angle))
+    turns = Fraction(angle, 180)
+    if turns == 0:
+        return '(0)', locale.speech(locale['Trigonometry.angle'], 0)
+    numerator = '' if turns.numerator == 1 else str(turns.numerator)
+    denominator = '' if turns.denominator == 1 else '/%d' % turns.denominator
+    words = locale['Trigonometry.pi'] if turns.numerator == 1 else \
+        locale.speech(locale['Trigonometry.pi_times'], turns.numerator)
+    if turns.denominator != 1:
+        words = locale.speech(locale['Trigonometry.pi_over'], words, turns.denominator)
+    return '(%sπ%s)' % (numerator, denominator), words
+
+
+def build(angles=ANGLES, values=VALUES, radians=False, locale=RUSSIAN):
+    """
+    :param angles: angles of the table in degrees, multiples of 30° or 45°.
+    :param values: values asked for directly.
+    :param radians: if True the angles of the questions about the values are written in radians.
+    :param locale: locales.Locale the questions are spoken in.
+    :return: Table.
+    """
+    names = dict(zip(FUNCTIONS, locale['Trigonometry.names']))
+    index = {}
+    for angle in angles:
+        for function in FUNCTIONS:
+            value = exact(function, angle)
+            if value is not None:
+                index.setdefault((function, value), set()).add(angle)
+    index = {key: frozenset(found) for key, found in index.items()}
+    questions = []
+    asked = set()
+    for angle in angles:
+        for function in FUNCTIONS:
+            value = exact(function, angle)
+            if value is None:
+                continue
+            if value.radicand == 1 and value.rational in values:
+                text, words = _angle(angle, radians, locale)
+                questions.append((function + text + ' = ?',
+                                  locale.speech(locale['Trigonometry.value_question'], names[function], words),
+                                  (int(value.rational),)))
+            elif (function, value) not in asked:
+                asked.add((function, value))
+                questions.append((function + '?° = ' + written(value),
+                                  locale.speech(locale['Trigonometry.angle_question'], names[function],
+                                                spoken(value, locale)),
+                                  tuple(sorted(index[(function, value)]))))
+    return Table(tuple(questions), index)
+
+
+if __name__ == '__main__':
+    for question in build().questions:
+        print(*question, sep='\t')
@@ -0,0 +1,117 @@
+import sys
+import timeit
+from functools import lru_cache
+
+"""
+Builder of the TTS of responses.
+
+The fragments of a TTS are collected in a plain list and joined once, when the response is built:
+    fragments = [feedback, question.tts, TASK_SOUND, pause(500), question.example]
+    build(fragments)
+Sounds are Sound strings kept in module constants, so every response shares the same objects. Under overload
+they are dropped from the TTS. A TTS longer than TTS_LIMIT is rejected by Alice, build raises TTSError instead.
+
+A builder object with chained methods was measured at more than twice the cost of the concatenation it replaces,
+a call per fragment costs more than joining short strings, so the fragments are plain strings and lists.
+"""
+
+# The longest TTS Alice accepts
+TTS_LIMIT = 1024
+SOUNDS_PATH = 'dialogs-upload/75986b16-ef4a-48ae-95ce-e95c020ae7a3/'
+
+
+class TTSError(ValueError):
+    """ The TTS is longer than Alice accepts """
+
+
+class Sound(str):
+    """ Speaker tag of a sound """
+    __slots__ = ()
+
+
+def speaker(name):
+    """
+    :param name: name of the sound uploaded to the skill.
+    :return: Sound playing it.
+    """
+    return Sound('<speaker audio=\"' + SOUNDS_PATH + name + '.opus\">')
+
+
+# Every response starts and ends with these sounds
+OPENING_SOUND = speaker('661bc281-2f05-4593-9cad-6a6f9caa3e1c')
+CLOSING_SOUND = speaker('bdc67ca3-0972-4599-bc26-dedb90f25c45')
+# Played after the question of a task
+TASK_SOUND = speaker('44d33529-856c-42e8-9a0f-f3d60311ef88')
+APPLAUSE_SOUNDS = (speaker('87071461-1456-42f7-8cbd-5a7f2b4e4bd4'),
+                   speaker('6d160340-afe2-4273-94d4-40631584f139'),
+                   speaker('b2eef422-bd6d-485a-a05c-baddeb7e726d'))
+SAD_SOUNDS = (speaker('79cded5f-1598-4d6e-bbf3-61e9999b092d'),
+              speaker('c04240a1-8ef6-445a-8f1c-32a042615683'))
+
+
+@lru_cache(maxsize=None)
+def pause(milliseconds):
+    """
+    :return: pause fragment, it is spaced so it does not stick to the neighbouring words.
+    """
+    return ' sil <[%d]> ' % milliseconds
+
+
+def build(fragments, sounds=True, limit=TTS_LIMIT):
+    """
+    :param fragments: list of the fragments of the TTS.
+    :param sounds: if False the sounds are left out.
+    :return: the TTS.
+    :raises TTSError: if the TTS is longer than the limit.
+    """
+    if sounds:
+        tts = ''.join(fragments)
+    else:
+        tts = ''.join([fragment for fragment in fragments if type(fragment) is not Sound])
+    if len(tts) > limit:
+        raise TTSError('TTS is %d characters long, the limit is %d' % (len(tts), limit))
+    return tts
+
+
+def _concatenated(feedback, question, example, options):
+    """ TTS of a quiz reply and of the task choice the way they were built before the builder """
+    tts = feedback
+    tts += question + TASK_SOUND
+    tts += example
+    quiz = OPENING_SOUND + tts + CLOSING_SOUND
+    tts = feedback + ''.join(options)
+    return quiz, OPENING_SOUND + tts + CLOSING_SOUND
+
+
+def _built(feedback, question, example, options):
+    quiz = build([OPENING_SOUND, feedback, question, TASK_SOUND, example, CLOSING_SOUND])
+    separator = pause(500)
+    fragments = [OPENING_SOUND, feedback, separator]
+    for option in options:
+        fragments.append(option)
+        fragments.append(separator)
+    fragments.append(CLOSING_SOUND)
+    return quiz, build(fragments)
+
+
+def benchmark(number=20000, repeat=20):
+    """
+    Compares the builder with the concatenation on the TTS of the busiest scenarios, a quiz reply and the task
+    choice. The two are timed alternately and the best time of each is taken.
+    :return: (microseconds per pair of responses with the concatenation, with the builder).
+    """
+    args = ('Верно.\n', 'сколько будет двести тридцать пять плюс сто сорок шесть',
+            'двести тридцать пять плюс сто сорок шесть равн+оо',
+            ['сложение, вычитание sil <[500]> ', 'умножение, деление sil <[500]> ',
+             'операции с дробями sil <[500]> ', 'возведение в степень sil <[500]> '])
+    options = [option.replace(' sil <[500]> ', '') for option in args[3]]
+    concatenated = built = float('inf')
+    for _ in range(repeat):
+        concatenated = min(concatenated, timeit.timeit(lambda: _concatenated(*args), number=number))
+        built = min(built, timeit.timeit(lambda: _built(args[0], args[1], args[2], options), number=number))
+    return concatenated / number * 1e6, built / number * 1e6
+
+
+if __name__ == '__main__':
+    concatenated, built = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
+    print('concatenation: %.2f us, builder: %.2f us' % (concatenated, built))